@@ -35,6 +35,9 @@ class Config:
     # Scheduler configuration
     SCHEDULER_TIMEZONE = "UTC"
 
+    # Concurrent fleet arrival workers per tick (needs PostgreSQL or MySQL 8)
+    ARRIVAL_WORKERS = int(os.getenv('ARRIVAL_WORKERS', '1'))
+
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -199,25 +202,19 @@ def get_all_ship_speeds():
     """Get all ship speeds with multiplier applied"""
     return {ship_type: speed * SPEED_MULTIPLIER for ship_type, speed in SHIP_SPEEDS.items()}
 
+# Ship types from slowest to fastest, so a fleet's speed is its first ship type present
+SHIP_TYPES_BY_SPEED = tuple(sorted(SHIP_SPEEDS, key=SHIP_SPEEDS.get))
+
 def calculate_fleet_speed(fleet):
     """Calculate fleet speed (limited by slowest ship)"""
     if not fleet:
         return 0
 
-    ship_types = ['small_cargo', 'large_cargo', 'light_fighter', 'heavy_fighter',
-                 'cruiser', 'battleship', 'colony_ship', 'recycler', 'espionage_probe',
-                 'bomber', 'destroyer', 'deathstar', 'battlecruiser']
-
-    slowest_speed = float('inf')
-
-    for ship_type in ship_types:
-        if hasattr(fleet, ship_type):
-            ship_count = getattr(fleet, ship_type, 0)
-            if ship_count > 0:
-                ship_speed = get_ship_speed(ship_type)
-                slowest_speed = min(slowest_speed, ship_speed)
-
-    return slowest_speed if slowest_speed != float('inf') else get_ship_speed('small_cargo')
+    slowest_ship = next(
+        (ship_type for ship_type in SHIP_TYPES_BY_SPEED if getattr(fleet, ship_type, 0) > 0),
+        'small_cargo'
+    )
+    return get_ship_speed(slowest_ship)
 
 def calculate_fuel_consumption(fleet, distance):
     """Calculate total fuel consumption for a fleet traveling a distance"""
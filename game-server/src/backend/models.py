@@ -1,6 +1,91 @@
+import re
+from collections import namedtuple
 from datetime import datetime
+from functools import lru_cache
 from .database import db
 
+# Planet coordinates packed into one 64-bit key: 21 bits per axis, offset so the
+# small negative coordinates exploration can produce still pack
+COORD_BITS = 21
+COORD_OFFSET = 1 << (COORD_BITS - 1)
+
+
+def pack_coordinates(x, y, z):
+    """Pack (x, y, z) into the integer stored in Planet.coord_packed"""
+    return (((x + COORD_OFFSET) << (2 * COORD_BITS)) |
+            ((y + COORD_OFFSET) << COORD_BITS) |
+            (z + COORD_OFFSET))
+
+
+# Mission target coordinates as written in fleet statuses and target_coordinates, "x:y:z"
+COORDINATES_PATTERN = re.compile(r'(-?\d+):(-?\d+):(-?\d+)')
+
+# A bare point in space, for targets that are not (yet) a Planet row. Reads
+# like a planet wherever only .x/.y/.z are used, without building an ORM object
+Coordinates = namedtuple('Coordinates', 'x y z')
+
+
+@lru_cache(maxsize=4096)
+def parse_coordinates(raw_coordinates):
+    """Parse "x:y:z" into Coordinates(x, y, z), or None if malformed.
+
+    Cached per string: every tick re-reads the same few in-flight targets.
+    """
+    match = COORDINATES_PATTERN.fullmatch(raw_coordinates)
+    return Coordinates._make(map(int, match.groups())) if match else None
+
+
+# A fleet status split into its kind and, for coordinate missions, the target
+FleetStatus = namedtuple('FleetStatus', 'kind coordinates')
+
+
+@lru_cache(maxsize=8192)
+def parse_fleet_status(status):
+    """Parse a fleet status such as "exploring:1:2:3" into a FleetStatus.
+
+    kind is the part before the first ':' (the same value as Fleet.status_kind),
+    coordinates the parsed target, or None for plain or malformed statuses.
+    Cached per string like parse_coordinates.
+    """
+    kind, separator, raw_coordinates = status.partition(':')
+    if not separator:
+        return FleetStatus(kind, None)
+    return FleetStatus(kind, parse_coordinates(raw_coordinates))
+
+
+# Space is bucketed into cubic sectors of 128 units per side so neighbourhood
+# queries read a handful of sectors instead of the whole galaxy. The coordinate
+# offset is a multiple of the sector size, so sectors line up with real
+# coordinates and the shifted values are never negative
+SECTOR_BITS = 7
+SECTOR_SIZE = 1 << SECTOR_BITS
+
+
+def sector_of(x, y, z):
+    """Sector key stored in Planet.sector_id for the sector containing (x, y, z)"""
+    return pack_coordinates(x >> SECTOR_BITS, y >> SECTOR_BITS, z >> SECTOR_BITS)
+
+
+def sectors_within(x, y, z, radius):
+    """Sector keys of every sector overlapping the cube of half-width radius around (x, y, z)"""
+    return [
+        pack_coordinates(sx, sy, sz)
+        for sx in range((x - radius) >> SECTOR_BITS, ((x + radius) >> SECTOR_BITS) + 1)
+        for sy in range((y - radius) >> SECTOR_BITS, ((y + radius) >> SECTOR_BITS) + 1)
+        for sz in range((z - radius) >> SECTOR_BITS, ((z + radius) >> SECTOR_BITS) + 1)
+    ]
+
+
+# Fleet.status_kind values of fleets that are on their way somewhere
+IN_FLIGHT_STATUS_KINDS = ('traveling', 'returning', 'colonizing', 'exploring')
+
+# Fleet.status_kind values of coordinate-based missions
+COORDINATE_STATUS_KINDS = ('colonizing', 'exploring')
+
+# Coordinate-based missions carry their target in the status, e.g. "colonizing:x:y:z"
+COORDINATE_STATUS_PREFIXES = ('colonizing:', 'exploring:')
+
+
 class User(db.Model):
     __tablename__ = 'users'
 
@@ -12,7 +97,7 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_login = db.Column(db.DateTime)
 
-    # Exploration data
+    # Exploration data (legacy JSON blob; new explorations go to ExploredSystem)
     explored_systems = db.Column(db.Text)  # JSON string of explored coordinates
 
     # Relationships
@@ -25,6 +110,12 @@ class User(db.Model):
 
 class Planet(db.Model):
     __tablename__ = 'planets'
+    __table_args__ = (
+        # Coordinate lookups (colonization targets, exploration, free-slot checks)
+        db.Index('ix_planet_xyz', 'x', 'y', 'z'),
+        # Range queries: sector_id IN (sectors_within(...)), refined on x/y/z from the index
+        db.Index('ix_planet_sector_xyz', 'sector_id', 'x', 'y', 'z'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -33,6 +124,30 @@ class Planet(db.Model):
     z = db.Column(db.Integer, nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
 
+    # pack_coordinates(x, y, z), maintained by the database for single-column lookups
+    coord_packed = db.Column(
+        db.BigInteger,
+        db.Computed(
+            f'((CAST(x AS BIGINT) + {COORD_OFFSET}) << {2 * COORD_BITS}) | '
+            f'((CAST(y AS BIGINT) + {COORD_OFFSET}) << {COORD_BITS}) | '
+            f'(CAST(z AS BIGINT) + {COORD_OFFSET})',
+            persisted=True
+        ),
+        index=True
+    )
+
+    # sector_of(x, y, z), maintained by the database like coord_packed; the shift
+    # runs on offset coordinates, so the offset is corrected before packing
+    sector_id = db.Column(
+        db.BigInteger,
+        db.Computed(
+            f'((((CAST(x AS BIGINT) + {COORD_OFFSET}) >> {SECTOR_BITS}) + {COORD_OFFSET - (COORD_OFFSET >> SECTOR_BITS)}) << {2 * COORD_BITS}) | '
+            f'((((CAST(y AS BIGINT) + {COORD_OFFSET}) >> {SECTOR_BITS}) + {COORD_OFFSET - (COORD_OFFSET >> SECTOR_BITS)}) << {COORD_BITS}) | '
+            f'(((CAST(z AS BIGINT) + {COORD_OFFSET}) >> {SECTOR_BITS}) + {COORD_OFFSET - (COORD_OFFSET >> SECTOR_BITS)})',
+            persisted=True
+        )
+    )
+
     # Resources
     metal = db.Column(db.BigInteger, default=1000)
     crystal = db.Column(db.BigInteger, default=500)
@@ -78,6 +193,14 @@ class Planet(db.Model):
 
 class Fleet(db.Model):
     __tablename__ = 'fleets'
+    __table_args__ = (
+        # Stationed-fleet lookup used when adding newly built ships
+        db.Index('ix_fleet_user_planet_status', 'user_id', 'start_planet_id', 'status'),
+        # Arrival sweep: status IN (...) AND arrival_time <= now
+        db.Index('ix_fleet_due', 'status', 'arrival_time'),
+        # Arrival sweep over every in-flight kind, coordinate missions included
+        db.Index('ix_fleet_status_kind_due', 'status_kind', 'arrival_time'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -98,14 +221,28 @@ class Fleet(db.Model):
     # Fleet status
     status = db.Column(db.String(20), default='stationed')
     departure_time = db.Column(db.DateTime, nullable=False)
-    arrival_time = db.Column(db.DateTime, nullable=False)
+    arrival_time = db.Column(db.DateTime)  # None while stationed
     eta = db.Column(db.Integer, default=0)
 
+    # status without the coordinates of "colonizing:x:y:z" / "exploring:x:y:z",
+    # maintained by the database so arrival queries match it by equality
+    # instead of LIKE 'prefix%'
+    status_kind = db.Column(
+        db.String(20),
+        db.Computed(
+            "CASE WHEN substr(status, 1, 11) = 'colonizing:' THEN 'colonizing' "
+            "WHEN substr(status, 1, 10) = 'exploring:' THEN 'exploring' "
+            "ELSE status END",
+            persisted=True
+        )
+    )
+
     # Exploration data
     explored_coordinates = db.Column(db.Text)  # JSON string of explored coords
 
     # Coordinate-based targeting for colonization
     target_coordinates = db.Column(db.String(50))  # Format: "x:y:z"
+    target_coord_packed = db.Column(db.BigInteger)  # pack_coordinates() of target_coordinates
 
     # Combat experience and statistics
     combat_experience = db.Column(db.Integer, default=0)
@@ -113,6 +250,9 @@ class Fleet(db.Model):
     combat_victories = db.Column(db.Integer, default=0)
     combat_defeats = db.Column(db.Integer, default=0)
 
+    # Relationships
+    target_planet = db.relationship('Planet', foreign_keys=[target_planet_id])
+
     def __repr__(self):
         return f'<Fleet {self.mission} from {self.start_planet_id} to {self.target_planet_id}>'
 
@@ -152,7 +292,7 @@ class TickLog(db.Model):
     __tablename__ = 'tick_logs'
 
     id = db.Column(db.Integer, primary_key=True)
-    tick_number = db.Column(db.Integer, nullable=False)
+    tick_number = db.Column(db.Integer, nullable=False, default=0)  # 0 for events logged outside a tick
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
 
     # Resource changes
@@ -163,7 +303,9 @@ class TickLog(db.Model):
 
     # Fleet events
     fleet_id = db.Column(db.Integer, db.ForeignKey('fleets.id'))
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'))  # Player the event belongs to
     event_type = db.Column(db.String(50))
+    event_data = db.Column(db.JSON)  # Structured event details, e.g. {'planet_name': ...}
     event_description = db.Column(db.Text)
 
     def __repr__(self):
@@ -268,3 +410,23 @@ class DebrisField(db.Model):
 
     def __repr__(self):
         return f'<DebrisField planet:{self.planet_id} metal:{self.metal} crystal:{self.crystal}>'
+
+
+class ExploredSystem(db.Model):
+    __tablename__ = 'explored_systems'
+    __table_args__ = (
+        # One row per user and system; also serves the "already explored?" lookup
+        db.UniqueConstraint('user_id', 'x', 'y', 'z', name='uq_explored_system_user_xyz'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    x = db.Column(db.Integer, nullable=False)
+    y = db.Column(db.Integer, nullable=False)
+    z = db.Column(db.Integer, nullable=False)
+    fleet_id = db.Column(db.Integer, db.ForeignKey('fleets.id'), nullable=True)
+    planets_discovered = db.Column(db.Integer, default=0)
+    explored_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ExploredSystem user:{self.user_id} ({self.x}:{self.y}:{self.z})>'
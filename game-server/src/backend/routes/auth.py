@@ -8,10 +8,11 @@ import random
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 def validate_email(email):
     """Simple email validation using regex"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return EMAIL_PATTERN.match(email) is not None
 
 def generate_starting_planet_coordinates():
     """Generate random unoccupied coordinates for a new user's starting planet"""
@@ -13,10 +13,10 @@ All endpoints require JWT authentication and operate on the user's own fleets.
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.database import db
-from backend.models import User, Planet, Fleet, Research
+from backend.models import User, Planet, Fleet, Research, Coordinates, COORDINATE_STATUS_PREFIXES, pack_coordinates
 from backend.services.fleet_arrival import FleetArrivalService, COLONIZATION_ERRORS, MISSION_ERRORS
+from backend.services.fleet_travel import FleetTravelService
 from datetime import datetime, timedelta
-import math
 
 fleet_mgmt_bp = Blueprint('fleet_mgmt', __name__, url_prefix='/api/fleet')
 
@@ -31,13 +31,14 @@ def get_user_fleets():
     fleets = Fleet.query.filter_by(user_id=user_id).all()
     print(f"DEBUG: Found {len(fleets)} fleets for user")
 
-    # Import here to avoid circular imports
-    from backend.services.fleet_travel import FleetTravelService
-
     # Get planet information for display
     planets = Planet.query.filter_by(user_id=user_id).all()
     planet_dict = {p.id: p for p in planets}
 
+    # Travel info for all fleets at once: the user's own planets are reused and
+    # any other targets come in one query, instead of two lookups per fleet
+    travel_infos = FleetTravelService.batch_calculate_travel_info(fleets, planet_dict)
+
     print("DEBUG: Fleet GET endpoint successful")
     return jsonify([{
         'id': fleet.id,
@@ -59,10 +60,10 @@ def get_user_fleets():
         'arrival_time': fleet.arrival_time.isoformat() if fleet.arrival_time else None,
         'eta': fleet.eta,
         # Enhanced travel information
-        'travel_info': FleetTravelService.calculate_travel_info(fleet),
+        'travel_info': travel_info,
         'start_planet': get_planet_info(fleet.start_planet_id, planet_dict),
         'target_planet': get_planet_info(fleet.target_planet_id, planet_dict) if fleet.target_planet_id and fleet.target_planet_id > 0 else None
-    } for fleet in fleets])
+    } for fleet, travel_info in zip(fleets, travel_infos)])
 
 @fleet_mgmt_bp.route('', methods=['POST'])
 @jwt_required()
@@ -169,14 +170,8 @@ def send_fleet():
 
         target_x, target_y, target_z = data['target_x'], data['target_y'], data['target_z']
 
-        # Create temporary planet for distance calculation
-        target_planet = Planet(
-            name='Exploration Target',
-            x=target_x,
-            y=target_y,
-            z=target_z,
-            user_id=None
-        )
+        # Bare target point for the distance calculation; no ORM object needed
+        target_planet = Coordinates(target_x, target_y, target_z)
 
         fleet.mission = 'explore'
         fleet.target_planet_id = 0  # Temporary
@@ -311,9 +306,7 @@ def send_fleet():
 
         # Validate fuel requirements
         start_planet = Planet.query.get(fleet.start_planet_id)
-        distance = calculate_distance(start_planet, Planet(
-            name='Target', x=target_x, y=target_y, z=target_z, user_id=None
-        ))
+        distance = calculate_distance(start_planet, Coordinates(target_x, target_y, target_z))
 
         fuel_validation = FleetArrivalService.validate_colonization_fuel(fleet, distance)
         if not fuel_validation['success']:
@@ -326,17 +319,12 @@ def send_fleet():
         # Deduct fuel from origin planet
         start_planet.deuterium -= fuel_validation['fuel_required']
 
-        # Create temporary planet for distance calculation
-        target_planet = Planet(
-            name='Empty Space',
-            x=target_x,
-            y=target_y,
-            z=target_z,
-            user_id=None  # Unowned
-        )
+        # Bare target point for the distance calculation; no ORM object needed
+        target_planet = Coordinates(target_x, target_y, target_z)
 
         fleet.mission = 'colonize'
         fleet.target_coordinates = f"{target_x}:{target_y}:{target_z}"  # Store coordinates for arrival processing
+        fleet.target_coord_packed = pack_coordinates(target_x, target_y, target_z)
         fleet.status = f'colonizing:{target_x}:{target_y}:{target_z}'
 
     else:
@@ -357,7 +345,6 @@ def send_fleet():
     distance = calculate_distance(start_planet, target_planet)
 
     # Use FleetTravelService for consistent speed calculation (now 30x faster)
-    from backend.services.fleet_travel import FleetTravelService
     fleet_speed = FleetTravelService.calculate_fleet_speed(fleet)
     travel_time_hours = distance / fleet_speed if fleet_speed > 0 else 0
 
@@ -371,6 +358,7 @@ def send_fleet():
     fleet.eta = int(travel_time_seconds)
 
     db.session.commit()
+    FleetArrivalService.schedule_arrival(fleet)
 
     return jsonify({
         'message': 'Fleet sent successfully',
@@ -398,7 +386,7 @@ def recall_fleet(fleet_id):
         print("DEBUG: Fleet not found")
         return jsonify({'error': 'Fleet not found'}), 404
 
-    if fleet.status not in ['traveling', 'returning'] and not fleet.status.startswith('exploring:') and not fleet.status.startswith('colonizing:'):
+    if fleet.status not in ('traveling', 'returning') and not fleet.status.startswith(COORDINATE_STATUS_PREFIXES):
         return jsonify({'error': 'Fleet cannot be recalled'}), 400
 
     # Calculate return time (simplified - same speed back)
@@ -417,6 +405,7 @@ def recall_fleet(fleet_id):
     fleet.eta = int(return_time)
 
     db.session.commit()
+    FleetArrivalService.schedule_arrival(fleet)
 
     return jsonify({
         'message': 'Fleet recalled successfully',
@@ -483,12 +472,4 @@ def get_planet_info(planet_id, planet_dict):
 
 def calculate_distance(planet1, planet2):
     """Calculate distance between two planets using 3D coordinates"""
-    dx = planet1.x - planet2.x
-    dy = planet1.y - planet2.y
-    dz = planet1.z - planet2.z
-
-    # Euclidean distance in 3D space
-    distance = math.sqrt(dx**2 + dy**2 + dz**2)
-
-    # Minimum distance of 1 to avoid division by zero
-    return max(distance, 1)
+    return FleetTravelService.calculate_distance(planet1, planet2)
@@ -97,8 +97,7 @@ def get_nearby_systems(center_x, center_y, center_z):
     try:
         # For now, return systems without auth for testing
         # TODO: Add JWT auth back when frontend is ready
-        from backend.models import User
-        import json
+        from backend.models import User, ExploredSystem
 
         # For testing, use a dummy user or skip user-specific logic
         user = None  # TODO: Add proper user handling
@@ -113,7 +112,7 @@ def get_nearby_systems(center_x, center_y, center_z):
         print("DEBUG: Grouping planets by system coordinates...")
         systems = {}
         for planet in planets:
-            key = f"{planet.x}:{planet.y}:{planet.z}"
+            key = (planet.x, planet.y, planet.z)
             if key not in systems:
                 systems[key] = {
                     'x': planet.x,
@@ -131,13 +130,14 @@ def get_nearby_systems(center_x, center_y, center_z):
 
         # Load user's explored systems
         explored_systems = set()
-        if user and user.explored_systems:
-            try:
-                explored_data = json.loads(user.explored_systems)
-                explored_systems = {s['coordinates'] for s in explored_data}
-                print(f"DEBUG: Loaded {len(explored_systems)} explored systems from user data")
-            except:
-                print("DEBUG: Failed to parse user explored systems data")
+        if user:
+            # (x, y, z) tuples, matching the systems keys above for O(1) lookups
+            explored_systems = {
+                tuple(row) for row in db.session.query(
+                    ExploredSystem.x, ExploredSystem.y, ExploredSystem.z
+                ).filter_by(user_id=user.id)
+            }
+            print(f"DEBUG: Loaded {len(explored_systems)} explored systems from user data")
         else:
             print("DEBUG: No user data for explored systems")
 
@@ -154,7 +154,7 @@ def get_nearby_systems(center_x, center_y, center_z):
             x = center_x + (i - 2) * 20
             y = center_y + (i - 2) * 15
             z = center_z + (i - 2) * 10
-            key = f"{x}:{y}:{z}"
+            key = (x, y, z)
             if key not in systems:
                 systems[key] = {
                     'x': x,
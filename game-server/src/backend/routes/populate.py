@@ -1,17 +1,27 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, current_app
 from backend.database import db
-from backend.models import User, Planet, Fleet, Alliance, TickLog
+from backend.models import User, Planet, Fleet, Alliance, TickLog, ExploredSystem, PlanetTrait, Research, CombatReport, DebrisField, ChatMessage
 from faker import Faker
 import random
 from datetime import datetime, timedelta
 import bcrypt
 import math
+import threading
+import uuid
+from collections import OrderedDict
 
 populate_bp = Blueprint('populate', __name__)
 
 # Initialize Faker
 fake = Faker()
 
+# Tables populate fills, children first
+POPULATED_MODELS = (TickLog, Fleet, Planet, Alliance, User)
+
+# Tables referencing the populated ones; their rows would point at deleted users,
+# planets or fleets, so they are cleared first
+DEPENDENT_MODELS = (ExploredSystem, PlanetTrait, Research, CombatReport, DebrisField, ChatMessage)
+
 # Universe Configuration
 UNIVERSE_CONFIG = {
     'min_coord': -10000,
@@ -24,13 +34,18 @@ UNIVERSE_CONFIG = {
 
 def calculate_distance(x1, y1, z1, x2, y2, z2):
     """Calculate 3D distance between two points"""
-    return math.sqrt((x2 - x1)**2 + (y2 - y1)**2 + (z2 - z1)**2)
-
-def is_valid_position(x, y, z, existing_planets, min_distance=25):
-    """Check if a position is valid (not too close to existing planets)"""
-    for planet in existing_planets:
-        distance = calculate_distance(x, y, z, planet.x, planet.y, planet.z)
-        if distance < min_distance:
+    return math.sqrt(calculate_distance_sq(x1, y1, z1, x2, y2, z2))
+
+def calculate_distance_sq(x1, y1, z1, x2, y2, z2):
+    """Calculate squared 3D distance between two points, for comparing against a squared threshold"""
+    dx, dy, dz = x2 - x1, y2 - y1, z2 - z1
+    return dx * dx + dy * dy + dz * dz
+
+def is_valid_position(x, y, z, existing_positions, min_distance=25):
+    """Check if a position is valid (not too close to existing planet positions)"""
+    min_distance_sq = min_distance * min_distance
+    for px, py, pz in existing_positions:
+        if calculate_distance_sq(x, y, z, px, py, pz) < min_distance_sq:
             return False
     return True
 
@@ -38,6 +53,7 @@ def generate_cluster_centers(num_clusters, min_distance):
     """Generate centers for galaxy clusters"""
     centers = []
     max_attempts = 1000
+    min_distance_sq = min_distance * min_distance
 
     for _ in range(num_clusters):
         for attempt in range(max_attempts):
@@ -48,7 +64,7 @@ def generate_cluster_centers(num_clusters, min_distance):
             # Check distance from other cluster centers
             valid = True
             for cx, cy, cz in centers:
-                if calculate_distance(x, y, z, cx, cy, cz) < min_distance:
+                if calculate_distance_sq(x, y, z, cx, cy, cz) < min_distance_sq:
                     valid = False
                     break
 
@@ -64,326 +80,463 @@ def generate_cluster_centers(num_clusters, min_distance):
 
     return centers
 
-def generate_planet_position(existing_planets, cluster_center=None, is_core_planet=False):
+def generate_planet_position(existing_positions, cluster_center=None, is_core_planet=False):
     """Generate a valid planet position"""
     max_attempts = 100
+    min_coord = UNIVERSE_CONFIG['min_coord']
+    max_coord = UNIVERSE_CONFIG['max_coord']
 
-    for attempt in range(max_attempts):
-        if cluster_center and not is_core_planet:
-            # Generate position within cluster
-            cx, cy, cz = cluster_center
-            radius = UNIVERSE_CONFIG['cluster_radius']
-            x = cx + random.randint(-radius, radius)
-            y = cy + random.randint(-radius, radius)
-            z = cz + random.randint(-radius, radius)
-        else:
-            # Generate random position across universe
-            x = random.randint(UNIVERSE_CONFIG['min_coord'], UNIVERSE_CONFIG['max_coord'])
-            y = random.randint(UNIVERSE_CONFIG['min_coord'], UNIVERSE_CONFIG['max_coord'])
-            z = random.randint(UNIVERSE_CONFIG['min_coord'], UNIVERSE_CONFIG['max_coord'])
+    if cluster_center and not is_core_planet:
+        # Clip the cluster box to the universe bounds once, so candidates are
+        # always drawn in range and never need clamping per attempt
+        radius = UNIVERSE_CONFIG['cluster_radius']
+        bounds = [(max(min_coord, c - radius), min(max_coord, c + radius)) for c in cluster_center]
+    else:
+        # Generate random position across universe
+        bounds = [(min_coord, max_coord)] * 3
+
+    (x_lo, x_hi), (y_lo, y_hi), (z_lo, z_hi) = bounds
 
-        # Ensure coordinates are within bounds
-        x = max(UNIVERSE_CONFIG['min_coord'], min(UNIVERSE_CONFIG['max_coord'], x))
-        y = max(UNIVERSE_CONFIG['min_coord'], min(UNIVERSE_CONFIG['max_coord'], y))
-        z = max(UNIVERSE_CONFIG['min_coord'], min(UNIVERSE_CONFIG['max_coord'], z))
+    for attempt in range(max_attempts):
+        x = random.randint(x_lo, x_hi)
+        y = random.randint(y_lo, y_hi)
+        z = random.randint(z_lo, z_hi)
 
-        if is_valid_position(x, y, z, existing_planets, UNIVERSE_CONFIG['min_distance']):
+        if is_valid_position(x, y, z, existing_positions, UNIVERSE_CONFIG['min_distance']):
             return x, y, z
 
     # If we can't find a valid position, place it with minimal distance check
-    x = random.randint(UNIVERSE_CONFIG['min_coord'], UNIVERSE_CONFIG['max_coord'])
-    y = random.randint(UNIVERSE_CONFIG['min_coord'], UNIVERSE_CONFIG['max_coord'])
-    z = random.randint(UNIVERSE_CONFIG['min_coord'], UNIVERSE_CONFIG['max_coord'])
+    x = random.randint(min_coord, max_coord)
+    y = random.randint(min_coord, max_coord)
+    z = random.randint(min_coord, max_coord)
     return x, y, z
 
-@populate_bp.route('/populate', methods=['POST'])
-def populate_database():
-    """Populate the database with realistic test data"""
-
-    from flask import request
-
-    # Check if deterministic mode is requested
-    deterministic = request.args.get('deterministic', 'false').lower() == 'true'
-    minimal = request.args.get('minimal', 'false').lower() == 'true'
-
-    try:
-        # Clear existing data in reverse dependency order to avoid foreign key issues
-        print("DEBUG: Clearing existing data...")
-        db.session.query(TickLog).delete()
-        db.session.query(Fleet).delete()
-        db.session.query(Planet).delete()
-        db.session.query(Alliance).delete()
-        db.session.query(User).delete()
-        db.session.commit()
-        print("DEBUG: Data cleared successfully")
-
-        # Make generation deterministic for testing
-        import os
-        if deterministic or os.getenv('FLASK_ENV') == 'testing':
-            random.seed(42)  # Fixed seed for deterministic results
-            fake.seed_instance(42)  # Fixed seed for Faker
-            print("DEBUG: Using deterministic mode")
-
-        # Generate users (including test user)
-        users = []
-
-        # Create the specific test user that E2E tests expect
-        test_password_hash = bcrypt.hashpw('testpassword123'.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        test_user = User(
-            username='e2etestuser',
-            email='e2etestuser@example.com',
-            password_hash=test_password_hash,
-            created_at=fake.date_time_this_year(),
-            last_login=fake.date_time_this_month()
-        )
-        users.append(test_user)
-        db.session.add(test_user)
-
-        # Generate remaining fake users
-        if not minimal:
-            usernames = set()
-            emails = set()
-            for _ in range(199):  # Total 200 users
+def run_populate(deterministic=False, minimal=False, progress=None):
+    """Clear the game tables and fill them with generated test data.
+
+    Returns a dict with the number of rows created per table. If a
+    ``progress`` dict is given, it is updated with the counts as each
+    phase finishes so a background caller can report on a running job.
+    """
+    if progress is None:
+        progress = {}
+
+    # Clear existing data in reverse dependency order to avoid foreign key issues
+    print("DEBUG: Clearing existing data...")
+    cleared_models = DEPENDENT_MODELS + POPULATED_MODELS
+    if db.engine.dialect.name == 'postgresql':
+        # One statement empties the tables and resets their id sequences. Every
+        # referencing table is named, so no CASCADE reaches beyond this list
+        table_names = ', '.join(model.__tablename__ for model in cleared_models)
+        db.session.execute(db.text(f'TRUNCATE TABLE {table_names} RESTART IDENTITY'))
+    else:
+        # SQLite has no TRUNCATE; fall back to per-table deletes in one transaction
+        for model in cleared_models:
+            db.session.query(model).delete()
+    db.session.commit()
+    print("DEBUG: Data cleared successfully")
+
+    # Make generation deterministic for testing
+    import os
+    if deterministic or os.getenv('FLASK_ENV') == 'testing':
+        random.seed(42)  # Fixed seed for deterministic results
+        fake.seed_instance(42)  # Fixed seed for Faker
+        print("DEBUG: Using deterministic mode")
+
+    # Generate users (including test user)
+    users = []
+
+    # Create the specific test user that E2E tests expect
+    test_password_hash = bcrypt.hashpw('testpassword123'.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    test_user = User(
+        username='e2etestuser',
+        email='e2etestuser@example.com',
+        password_hash=test_password_hash,
+        created_at=fake.date_time_this_year(),
+        last_login=fake.date_time_this_month()
+    )
+    users.append(test_user)
+    db.session.add(test_user)
+
+    # Generate remaining fake users
+    if not minimal:
+        # One salt for the whole run: the fake passwords are discarded right
+        # after hashing, so a per-user salt and full work factor buy nothing
+        fake_password_salt = bcrypt.gensalt(rounds=4)
+        usernames = set()
+        emails = set()
+        for _ in range(199):  # Total 200 users
+            username = fake.user_name()
+            while username in usernames:
                 username = fake.user_name()
-                while username in usernames:
-                    username = fake.user_name()
-                usernames.add(username)
+            usernames.add(username)
 
+            email = fake.email()
+            while email in emails:
                 email = fake.email()
-                while email in emails:
-                    email = fake.email()
-                emails.add(email)
-
-                # Generate a proper bcrypt hash for the fake password
-                fake_password = fake.password()
-                hashed_password = bcrypt.hashpw(fake_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-
-                user = User(
-                    username=username,
-                    email=email,
-                    password_hash=hashed_password,
-                    created_at=fake.date_time_this_year(),
-                    last_login=fake.date_time_this_month() if random.choice([True, False]) else None
+            emails.add(email)
+
+            # Generate a proper bcrypt hash for the fake password
+            fake_password = fake.password()
+            hashed_password = bcrypt.hashpw(fake_password.encode('utf-8'), fake_password_salt).decode('utf-8')
+
+            user = User(
+                username=username,
+                email=email,
+                password_hash=hashed_password,
+                created_at=fake.date_time_this_year(),
+                last_login=fake.date_time_this_month() if random.choice([True, False]) else None
+            )
+            users.append(user)
+            db.session.add(user)
+
+    db.session.commit()
+    progress['users'] = len(users)
+
+    # Generate planets with improved spacing and clustering
+    planets = []
+    positions = []  # (x, y, z) of every generated planet, used for spacing checks
+    planet_names = [
+        "Alpha", "Beta", "Gamma", "Delta", "Epsilon", "Zeta", "Eta", "Theta",
+        "Iota", "Kappa", "Lambda", "Mu", "Nu", "Xi", "Omicron", "Pi", "Rho",
+        "Sigma", "Tau", "Upsilon", "Phi", "Chi", "Psi", "Omega"
+    ]
+
+    print("DEBUG: Generating galaxy clusters...")
+    cluster_centers = generate_cluster_centers(
+        UNIVERSE_CONFIG['num_clusters'],
+        UNIVERSE_CONFIG['cluster_spacing']
+    )
+    print(f"DEBUG: Generated {len(cluster_centers)} galaxy clusters")
+
+    # Assign users to clusters - ensure e2etestuser gets a dedicated cluster
+    user_clusters = {}
+    test_user_cluster = cluster_centers[0]  # Reserve first cluster for test user
+
+    for i, user in enumerate(users):
+        if user.username == 'e2etestuser':
+            user_clusters[user.id] = test_user_cluster
+            print(f"DEBUG: Assigned e2etestuser to cluster at {test_user_cluster}")
+        else:
+            # Start from cluster 1 for other users
+            cluster_idx = (i % (len(cluster_centers) - 1)) + 1
+            user_clusters[user.id] = cluster_centers[cluster_idx]
+
+    print("DEBUG: Generating planets with proper spacing...")
+
+    for user in users:
+        num_planets = 1 if minimal else random.randint(1, 5)
+        cluster_center = user_clusters.get(user.id)
+
+        # Special handling for e2etestuser to ensure proper spacing
+        if user.username == 'e2etestuser':
+            print(f"DEBUG: Generating {num_planets} planets for e2etestuser with spacing")
+            for i in range(num_planets):
+                x, y, z = generate_planet_position(
+                    positions,
+                    cluster_center,
+                    is_core_planet=(i == 0)  # First planet is core planet
                 )
-                users.append(user)
-                db.session.add(user)
-
-        db.session.commit()
-
-        # Generate planets with improved spacing and clustering
-        planets = []
-        planet_names = [
-            "Alpha", "Beta", "Gamma", "Delta", "Epsilon", "Zeta", "Eta", "Theta",
-            "Iota", "Kappa", "Lambda", "Mu", "Nu", "Xi", "Omicron", "Pi", "Rho",
-            "Sigma", "Tau", "Upsilon", "Phi", "Chi", "Psi", "Omega"
-        ]
-
-        print("DEBUG: Generating galaxy clusters...")
-        cluster_centers = generate_cluster_centers(
-            UNIVERSE_CONFIG['num_clusters'],
-            UNIVERSE_CONFIG['cluster_spacing']
-        )
-        print(f"DEBUG: Generated {len(cluster_centers)} galaxy clusters")
-
-        # Assign users to clusters - ensure e2etestuser gets a dedicated cluster
-        user_clusters = {}
-        test_user_cluster = cluster_centers[0]  # Reserve first cluster for test user
-
-        for i, user in enumerate(users):
-            if user.username == 'e2etestuser':
-                user_clusters[user.id] = test_user_cluster
-                print(f"DEBUG: Assigned e2etestuser to cluster at {test_user_cluster}")
-            else:
-                # Start from cluster 1 for other users
-                cluster_idx = (i % (len(cluster_centers) - 1)) + 1
-                user_clusters[user.id] = cluster_centers[cluster_idx]
-
-        print("DEBUG: Generating planets with proper spacing...")
-
-        for user in users:
-            num_planets = 1 if minimal else random.randint(1, 5)
-            cluster_center = user_clusters.get(user.id)
-
-            # Special handling for e2etestuser to ensure proper spacing
-            if user.username == 'e2etestuser':
-                print(f"DEBUG: Generating {num_planets} planets for e2etestuser with spacing")
-                # Generate positions for all e2etestuser planets first to ensure proper spacing
-                test_user_positions = []
-                for i in range(num_planets):
-                    x, y, z = generate_planet_position(
-                        planets + test_user_positions,  # Include already generated positions
-                        cluster_center,
-                        is_core_planet=(i == 0)  # First planet is core planet
-                    )
-                    test_user_positions.append(type('MockPlanet', (), {'x': x, 'y': y, 'z': z})())
-
-                # Now create the actual planets with the pre-calculated positions
-                for i, mock_planet in enumerate(test_user_positions):
-                    x, y, z = mock_planet.x, mock_planet.y, mock_planet.z
-                    name = f"{planet_names[i % len(planet_names)]} {user.username}"
-
-                    planet = Planet(
-                        name=name,
-                        x=x,
-                        y=y,
-                        z=z,
-                        user_id=user.id,
-                        metal=2000000,  # Fixed abundant resources for E2E testing
-                        crystal=1500000,
-                        deuterium=1000000,
-                        metal_mine=random.randint(1, 20),
-                        crystal_mine=random.randint(1, 15),
-                        deuterium_synthesizer=random.randint(0, 10),
-                        solar_plant=random.randint(1, 25),
-                        fusion_reactor=random.randint(0, 5),
-                        # Add ships for testing
-                        small_cargo=50,
-                        large_cargo=25,
-                        light_fighter=30,
-                        heavy_fighter=15,
-                        cruiser=10,
-                        battleship=5,
-                        colony_ship=2,
-                        created_at=fake.date_time_this_year()
-                    )
-                    planets.append(planet)
-                    db.session.add(planet)
-                    print(f"DEBUG: Created e2etestuser planet '{name}' at ({x}, {y}, {z})")
-            else:
-                # Standard planet generation for other users
-                for i in range(num_planets):
-                    # Use improved positioning with spacing
-                    x, y, z = generate_planet_position(
-                        planets,
-                        cluster_center,
-                        is_core_planet=(i == 0)  # First planet is core planet
-                    )
-
-                    name = f"{planet_names[i % len(planet_names)]} {user.username}"
-
-                    planet = Planet(
-                        name=name,
-                        x=x,
-                        y=y,
-                        z=z,
-                        user_id=user.id,
-                        metal=random.randint(1000, 1000000),
-                        crystal=random.randint(500, 500000),
-                        deuterium=random.randint(0, 200000),
-                        metal_mine=random.randint(1, 20),
-                        crystal_mine=random.randint(1, 15),
-                        deuterium_synthesizer=random.randint(0, 10),
-                        solar_plant=random.randint(1, 25),
-                        fusion_reactor=random.randint(0, 5),
-                        created_at=fake.date_time_this_year()
-                    )
-                    planets.append(planet)
-                    db.session.add(planet)
-
-        print(f"DEBUG: Generated {len(planets)} planets across {len(cluster_centers)} clusters")
-        print(f"DEBUG: Universe bounds: {UNIVERSE_CONFIG['min_coord']} to {UNIVERSE_CONFIG['max_coord']}")
-        print(f"DEBUG: Minimum planet spacing: {UNIVERSE_CONFIG['min_distance']} units")
-
-        db.session.commit()
-
-        # Generate alliances
-        alliances = []
-        alliance_names = set()
-        num_alliances = 1 if minimal else 20
-        for _ in range(num_alliances):
+                positions.append((x, y, z))
+                name = f"{planet_names[i % len(planet_names)]} {user.username}"
+
+                planet = Planet(
+                    name=name,
+                    x=x,
+                    y=y,
+                    z=z,
+                    user_id=user.id,
+                    metal=2000000,  # Fixed abundant resources for E2E testing
+                    crystal=1500000,
+                    deuterium=1000000,
+                    metal_mine=random.randint(1, 20),
+                    crystal_mine=random.randint(1, 15),
+                    deuterium_synthesizer=random.randint(0, 10),
+                    solar_plant=random.randint(1, 25),
+                    fusion_reactor=random.randint(0, 5),
+                    # Add ships for testing
+                    small_cargo=50,
+                    large_cargo=25,
+                    light_fighter=30,
+                    heavy_fighter=15,
+                    cruiser=10,
+                    battleship=5,
+                    colony_ship=2,
+                    created_at=fake.date_time_this_year()
+                )
+                planets.append(planet)
+                db.session.add(planet)
+                print(f"DEBUG: Created e2etestuser planet '{name}' at ({x}, {y}, {z})")
+        else:
+            # Standard planet generation for other users
+            for i in range(num_planets):
+                # Use improved positioning with spacing
+                x, y, z = generate_planet_position(
+                    positions,
+                    cluster_center,
+                    is_core_planet=(i == 0)  # First planet is core planet
+                )
+                positions.append((x, y, z))
+
+                name = f"{planet_names[i % len(planet_names)]} {user.username}"
+
+                planet = Planet(
+                    name=name,
+                    x=x,
+                    y=y,
+                    z=z,
+                    user_id=user.id,
+                    metal=random.randint(1000, 1000000),
+                    crystal=random.randint(500, 500000),
+                    deuterium=random.randint(0, 200000),
+                    metal_mine=random.randint(1, 20),
+                    crystal_mine=random.randint(1, 15),
+                    deuterium_synthesizer=random.randint(0, 10),
+                    solar_plant=random.randint(1, 25),
+                    fusion_reactor=random.randint(0, 5),
+                    created_at=fake.date_time_this_year()
+                )
+                planets.append(planet)
+                db.session.add(planet)
+
+    print(f"DEBUG: Generated {len(planets)} planets across {len(cluster_centers)} clusters")
+    print(f"DEBUG: Universe bounds: {UNIVERSE_CONFIG['min_coord']} to {UNIVERSE_CONFIG['max_coord']}")
+    print(f"DEBUG: Minimum planet spacing: {UNIVERSE_CONFIG['min_distance']} units")
+
+    db.session.commit()
+    progress['planets'] = len(planets)
+
+    # Generate alliances
+    alliances = []
+    alliance_names = set()
+    num_alliances = 1 if minimal else 20
+    for _ in range(num_alliances):
+        name = fake.company()
+        while name in alliance_names:
             name = fake.company()
-            while name in alliance_names:
-                name = fake.company()
-            alliance_names.add(name)
-
-            leader = random.choice(users)
-            alliance = Alliance(
-                name=name,
-                description=fake.text(max_nb_chars=200),
-                leader_id=leader.id,
-                created_at=fake.date_time_this_year()
-            )
-            alliances.append(alliance)
-            db.session.add(alliance)
-
-            # Assign members
-            num_members = random.randint(2, 10)
-            potential_members = [u for u in users if u.id != leader.id]
-            members = random.sample(potential_members, min(num_members, len(potential_members)))
-            for member in members:
-                member.alliance_id = alliance.id
-
-        db.session.commit()
-
-        # Generate fleets
-        missions = ['attack', 'transport', 'deploy', 'espionage', 'recycle']
-        ship_types = ['small_cargo', 'large_cargo', 'light_fighter', 'heavy_fighter',
-                      'cruiser', 'battleship']
-
-        num_fleets = 1 if minimal else 500
-        for _ in range(num_fleets):
-            user = random.choice(users)
-            user_planets = [p for p in planets if p.user_id == user.id]
-            if not user_planets:
-                continue
-
-            start_planet = random.choice(user_planets)
-            target_planet = random.choice(planets)
-
-            mission = random.choice(missions)
-            status = random.choice(['stationed', 'traveling', 'returning'])
-
-            departure_time = fake.date_time_this_month()
-            eta = random.randint(60, 3600)
-            arrival_time = departure_time + timedelta(seconds=eta)
-
-            fleet = Fleet(
-                user_id=user.id,
-                mission=mission,
-                start_planet_id=start_planet.id,
-                target_planet_id=target_planet.id,
-                status=status,
-                departure_time=departure_time,
-                arrival_time=arrival_time,
-                eta=eta
-            )
-
-            # Add ships
-            for ship_type in ship_types:
-                setattr(fleet, ship_type, random.randint(0, 1000))
+        alliance_names.add(name)
+
+        leader = random.choice(users)
+        alliance = Alliance(
+            name=name,
+            description=fake.text(max_nb_chars=200),
+            leader_id=leader.id,
+            created_at=fake.date_time_this_year()
+        )
+        alliances.append(alliance)
+        db.session.add(alliance)
+
+        # Assign members: sample one extra user and drop the leader if drawn,
+        # rather than copying the whole user list without the leader
+        num_members = min(random.randint(2, 10), len(users) - 1)
+        members = [u for u in random.sample(users, num_members + 1) if u is not leader][:num_members]
+        for member in members:
+            member.alliance_id = alliance.id
+
+    db.session.commit()
+    progress['alliances'] = len(alliances)
+
+    # Generate fleets
+    missions = ['attack', 'transport', 'deploy', 'espionage', 'recycle']
+    ship_types = ['small_cargo', 'large_cargo', 'light_fighter', 'heavy_fighter',
+                  'cruiser', 'battleship']
+
+    num_fleets = 1 if minimal else 500
+
+    # Draw every random fleet attribute up front in a few batched calls
+    # instead of ~10 RNG calls per fleet inside the loop
+    fleet_users = random.choices(users, k=num_fleets)
+    fleet_targets = random.choices(planets, k=num_fleets)
+    fleet_missions = random.choices(missions, k=num_fleets)
+    fleet_statuses = random.choices(['stationed', 'traveling', 'returning'], k=num_fleets)
+    fleet_etas = random.choices(range(60, 3601), k=num_fleets)
+    ship_counts = random.choices(range(0, 1001), k=num_fleets * len(ship_types))
+    fleet_ships = [ship_counts[i:i + len(ship_types)]
+                   for i in range(0, len(ship_counts), len(ship_types))]
+
+    for i in range(num_fleets):
+        user = fleet_users[i]
+        user_planets = [p for p in planets if p.user_id == user.id]
+        if not user_planets:
+            continue
+
+        start_planet = random.choice(user_planets)
+        target_planet = fleet_targets[i]
+
+        departure_time = fake.date_time_this_month()
+        eta = fleet_etas[i]
+        arrival_time = departure_time + timedelta(seconds=eta)
+
+        fleet = Fleet(
+            user_id=user.id,
+            mission=fleet_missions[i],
+            start_planet_id=start_planet.id,
+            target_planet_id=target_planet.id,
+            status=fleet_statuses[i],
+            departure_time=departure_time,
+            arrival_time=arrival_time,
+            eta=eta
+        )
 
-            db.session.add(fleet)
+        # Add ships
+        for ship_type, count in zip(ship_types, fleet_ships[i]):
+            setattr(fleet, ship_type, count)
+
+        db.session.add(fleet)
+
+    db.session.commit()
+    progress['fleets'] = num_fleets
+
+    # Generate tick logs
+    num_tick_logs = 1 if minimal else 1000
+    tick_planets = random.choices(planets, k=num_tick_logs)
+    tick_numbers = [random.randint(1, 10000) for _ in range(num_tick_logs)]
+    metal_changes = [random.randint(-1000, 5000) for _ in range(num_tick_logs)]
+    crystal_changes = [random.randint(-500, 2500) for _ in range(num_tick_logs)]
+    deuterium_changes = [random.randint(-200, 1000) for _ in range(num_tick_logs)]
+
+    # Tick logs have no relationships to wire up, so insert them as plain
+    # mappings rather than building and tracking 1000 ORM instances
+    tick_logs = [
+        {
+            'tick_number': tick_numbers[i],
+            'timestamp': fake.date_time_this_year(),
+            'planet_id': tick_planets[i].id,
+            'metal_change': metal_changes[i],
+            'crystal_change': crystal_changes[i],
+            'deuterium_change': deuterium_changes[i]
+        }
+        for i in range(num_tick_logs)
+    ]
+    db.session.bulk_insert_mappings(TickLog, tick_logs)
+
+    db.session.commit()
+    progress['tick_logs'] = num_tick_logs
+
+    return {
+        'users': len(users),
+        'planets': len(planets),
+        'fleets': num_fleets,
+        'alliances': len(alliances),
+        'tick_logs': num_tick_logs
+    }
+
+# Background populate tasks by id, oldest first; each holds status, progress
+# counters and result. Finished tasks are kept for POPULATE_TASK_TTL, and only
+# the newest MAX_POPULATE_TASKS of them
+_populate_tasks = OrderedDict()
+_populate_tasks_lock = threading.Lock()
+MAX_POPULATE_TASKS = 20
+POPULATE_TASK_TTL = timedelta(hours=1)
+
+# Held by the populate that is running, inline or in the background. Two runs
+# would interleave their deletes and inserts, and both reseed the shared RNG
+_populate_running = threading.Lock()
+_running_task_id = None
+
+def _prune_populate_tasks(now):
+    """Drop finished tasks past their TTL, then the oldest finished ones over the limit"""
+    finished = [task_id for task_id, task in _populate_tasks.items() if task['status'] != 'running']
+    expired = [task_id for task_id in finished if now - _populate_tasks[task_id]['finished_at'] > POPULATE_TASK_TTL]
+    kept = [task_id for task_id in finished if task_id not in expired]
+    for task_id in expired + kept[:max(0, len(kept) - MAX_POPULATE_TASKS)]:
+        del _populate_tasks[task_id]
+
+def start_populate_task(app, deterministic=False, minimal=False):
+    """Run run_populate on a daemon thread and return the task id to poll.
+
+    Returns None if another populate is still running.
+    """
+    global _running_task_id
+    if not _populate_running.acquire(blocking=False):
+        return None
+
+    task_id = uuid.uuid4().hex
+    task = {'status': 'running', 'progress': {}, 'result': None, 'error': None, 'finished_at': None}
+    with _populate_tasks_lock:
+        _prune_populate_tasks(datetime.utcnow())
+        _populate_tasks[task_id] = task
+        _running_task_id = task_id
+
+    def run_task():
+        global _running_task_id
+        with app.app_context():
+            try:
+                result = run_populate(deterministic, minimal, progress=task['progress'])
+                status, error = 'completed', None
+            except Exception as e:
+                db.session.rollback()
+                result, status, error = None, 'failed', str(e)
+            finally:
+                db.session.remove()
+            with _populate_tasks_lock:
+                task.update(status=status, result=result, error=error, finished_at=datetime.utcnow())
+                _running_task_id = None
+            _populate_running.release()
+
+    threading.Thread(target=run_task, name=f'populate-{task_id}', daemon=True).start()
+    return task_id
+
+def _already_running_response():
+    """409 response naming the background task that holds the populate lock, if any"""
+    with _populate_tasks_lock:
+        task_id = _running_task_id
+    body = {'error': 'A database population is already running'}
+    if task_id is not None:
+        body.update(task_id=task_id, status_url=f'/populate/status/{task_id}')
+    return jsonify(body), 409
 
-        db.session.commit()
+@populate_bp.route('/populate', methods=['POST'])
+def populate_database():
+    """Populate the database with realistic test data
 
-        # Generate tick logs
-        num_tick_logs = 1 if minimal else 1000
-        for _ in range(num_tick_logs):
-            planet = random.choice(planets)
-            tick_number = random.randint(1, 10000)
-            timestamp = fake.date_time_this_year()
+    Runs inline by default. With ``?background=true`` the job is started on a
+    worker thread and the request returns 202 with a task id that can be
+    polled on ``/populate/status/<task_id>``. While a population is running,
+    another one is refused with 409 and the running task's id.
+    """
 
-            tick_log = TickLog(
-                tick_number=tick_number,
-                timestamp=timestamp,
-                planet_id=planet.id,
-                metal_change=random.randint(-1000, 5000),
-                crystal_change=random.randint(-500, 2500),
-                deuterium_change=random.randint(-200, 1000)
-            )
-            db.session.add(tick_log)
+    from flask import request
 
-        db.session.commit()
+    # Check if deterministic mode is requested
+    deterministic = request.args.get('deterministic', 'false').lower() == 'true'
+    minimal = request.args.get('minimal', 'false').lower() == 'true'
+    background = request.args.get('background', 'false').lower() == 'true'
 
+    if background:
+        task_id = start_populate_task(current_app._get_current_object(), deterministic, minimal)
+        if task_id is None:
+            return _already_running_response()
         return jsonify({
-            'message': 'Database populated successfully',
-            'users': len(users),
-            'planets': len(planets),
-            'fleets': num_fleets,
-            'alliances': len(alliances),
-            'tick_logs': num_tick_logs
-        }), 200
+            'message': 'Database population started',
+            'task_id': task_id,
+            'status_url': f'/populate/status/{task_id}'
+        }), 202
+
+    if not _populate_running.acquire(blocking=False):
+        return _already_running_response()
+    try:
+        counts = run_populate(deterministic, minimal)
+        return jsonify({'message': 'Database populated successfully', **counts}), 200
 
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
+    finally:
+        _populate_running.release()
+
+@populate_bp.route('/populate/status/<task_id>', methods=['GET'])
+def get_populate_status(task_id):
+    """Get the state and progress counters of a background populate task"""
+    with _populate_tasks_lock:
+        _prune_populate_tasks(datetime.utcnow())
+        task = _populate_tasks.get(task_id)
+        if task is None:
+            return jsonify({'error': 'Populate task not found'}), 404
+        finished_at = task['finished_at'].isoformat() if task['finished_at'] else None
+        return jsonify({
+            'task_id': task_id,
+            **task,
+            'progress': dict(task['progress']),
+            'finished_at': finished_at
+        }), 200
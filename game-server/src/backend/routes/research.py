@@ -15,6 +15,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.database import db
 from backend.models import User, Research, Planet
 from datetime import datetime
+from functools import lru_cache
 
 research_bp = Blueprint('research', __name__, url_prefix='/api/research')
 
@@ -115,8 +116,12 @@ def get_research_points():
         'last_updated': datetime.utcnow().isoformat()
     })
 
+@lru_cache(maxsize=256)
 def calculate_research_cost(research_type, target_level):
-    """Calculate research cost for a specific technology and level"""
+    """Calculate research cost for a specific technology and level
+
+    Results are memoized: the cost only depends on the two scalar arguments.
+    """
     if target_level <= 0:
         return 0
 
@@ -135,73 +140,83 @@ def calculate_research_cost(research_type, target_level):
     return cost
 
 def calculate_research_points(user_id):
-    """Calculate total research points from all user's planets"""
-    user_planets = Planet.query.filter_by(user_id=user_id).all()
-
-    total_points = 0
-    for planet in user_planets:
-        # Research points based on research lab level
-        if planet.research_lab and planet.research_lab > 0:
-            # Base points per lab level
-            base_points = planet.research_lab * 10
-
-            # Apply energy efficiency
-            energy_production = planet.solar_plant * 20 + planet.fusion_reactor * 50
-            energy_consumption = (planet.metal_mine * 10 +
-                                planet.crystal_mine * 10 +
-                                planet.deuterium_synthesizer * 20 +
-                                planet.research_lab * 15)  # Research labs consume energy
-
-            energy_ratio = min(1.0, energy_production / energy_consumption) if energy_consumption > 0 else 1.0
-
-            # Calculate points for this tick (5 seconds = 1/72 hour)
-            tick_points = max(1, int(base_points * energy_ratio / 72)) if planet.research_lab > 0 else 0
-
-            total_points += tick_points
+    """Calculate total research points from all user's planets
+
+    The per-planet formula is evaluated inside a single SUM query so no
+    planet rows are loaded. Integer floor division keeps the result equal to
+    ``max(1, int(research_lab * 10 * energy_ratio / 72))`` per planet.
+    """
+    # Base points per lab level
+    base_points = Planet.research_lab * 10
+
+    # Apply energy efficiency
+    energy_production = Planet.solar_plant * 20 + Planet.fusion_reactor * 50
+    energy_consumption = (Planet.metal_mine * 10 +
+                          Planet.crystal_mine * 10 +
+                          Planet.deuterium_synthesizer * 20 +
+                          Planet.research_lab * 15)  # Research labs consume energy
+
+    # Calculate points for this tick (5 seconds = 1/72 hour); energy_ratio is
+    # capped at 1.0, so only underpowered planets are scaled down
+    tick_points = db.case(
+        (db.and_(energy_consumption > 0, energy_production < energy_consumption),
+         base_points * energy_production // (energy_consumption * 72)),
+        else_=base_points // 72
+    )
+
+    total_points = db.session.query(
+        db.func.coalesce(db.func.sum(db.case((tick_points < 1, 1), else_=tick_points)), 0)
+    ).filter(
+        Planet.user_id == user_id,
+        Planet.research_lab > 0
+    ).scalar()
+
+    return int(total_points)
+
+# Static research descriptions, built once at import time
+RESEARCH_INFO = {
+    'colonization_tech': {
+        'name': 'Colonization Technology',
+        'description': 'Allows colonization of planets with higher difficulty ratings',
+        'benefits': [
+            'Unlocks colonization of planets with difficulty up to your research level',
+            'Reduces colonization failure chance',
+            'Enables faster colony establishment'
+        ],
+        'max_level': 10
+    },
+    'astrophysics': {
+        'name': 'Astrophysics',
+        'description': 'Advances understanding of space travel and colonization',
+        'benefits': [
+            '+2 colony limit per level',
+            'Reduces fleet travel time',
+            'Improves exploration efficiency'
+        ],
+        'max_level': 15
+    },
+    'interstellar_communication': {
+        'name': 'Interstellar Communication',
+        'description': 'Enhances communication across vast distances',
+        'benefits': [
+            'Enables alliance communications',
+            'Improves fleet coordination',
+            'Reduces communication delays'
+        ],
+        'max_level': 12
+    }
+}
 
-    return total_points
+UNKNOWN_RESEARCH_INFO = {
+    'name': 'Unknown Research',
+    'description': 'Research information not available',
+    'benefits': [],
+    'max_level': 10
+}
 
 def get_research_info(research_type):
     """Get information about a research technology"""
-    research_info = {
-        'colonization_tech': {
-            'name': 'Colonization Technology',
-            'description': 'Allows colonization of planets with higher difficulty ratings',
-            'benefits': [
-                'Unlocks colonization of planets with difficulty up to your research level',
-                'Reduces colonization failure chance',
-                'Enables faster colony establishment'
-            ],
-            'max_level': 10
-        },
-        'astrophysics': {
-            'name': 'Astrophysics',
-            'description': 'Advances understanding of space travel and colonization',
-            'benefits': [
-                '+2 colony limit per level',
-                'Reduces fleet travel time',
-                'Improves exploration efficiency'
-            ],
-            'max_level': 15
-        },
-        'interstellar_communication': {
-            'name': 'Interstellar Communication',
-            'description': 'Enhances communication across vast distances',
-            'benefits': [
-                'Enables alliance communications',
-                'Improves fleet coordination',
-                'Reduces communication delays'
-            ],
-            'max_level': 12
-        }
-    }
-
-    return research_info.get(research_type, {
-        'name': 'Unknown Research',
-        'description': 'Research information not available',
-        'benefits': [],
-        'max_level': 10
-    })
+    return RESEARCH_INFO.get(research_type, UNKNOWN_RESEARCH_INFO)
 
 @research_bp.route('/info/<research_type>', methods=['GET'])
 @jwt_required()
@@ -10,7 +10,11 @@ This module handles ship construction and shipyard operations including:
 All construction endpoints require JWT authentication and operate on user's planets.
 """
 
-from flask import Blueprint, request, jsonify
+import hashlib
+import json
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.database import db
 from backend.models import User, Planet, Fleet
@@ -86,6 +90,28 @@ SHIP_COSTS = {
     }
 }
 
+# SHIP_COSTS never changes at runtime, so serialize it and derive its ETag once
+SHIP_COSTS_JSON = json.dumps(SHIP_COSTS, sort_keys=True)
+SHIP_COSTS_ETAG = hashlib.md5(SHIP_COSTS_JSON.encode('utf-8')).hexdigest()
+
+# (metal, crystal, deuterium) per ship, precomputed so a build is a plain tuple multiply
+SHIP_COST_TUPLES = {
+    ship_type: (costs['metal'], costs['crystal'], costs['deuterium'])
+    for ship_type, costs in SHIP_COSTS.items()
+}
+
+# Whitelist of ship types the Fleet model can carry, mapped to their columns;
+# build_ship only ever writes to columns looked up here
+FLEET_SHIP_COLUMNS = {
+    ship_type: getattr(Fleet, ship_type)
+    for ship_type in SHIP_COSTS
+    if hasattr(Fleet, ship_type)
+}
+FLEET_SHIP_FIELDS = tuple(FLEET_SHIP_COLUMNS)
+
+# Fleet fields echoed back by build_ship, in the order the UPDATE returns them
+FLEET_INFO_FIELDS = ('id',) + FLEET_SHIP_FIELDS
+
 @shipyard_bp.route('/build', methods=['POST'])
 @jwt_required()
 def build_ship():
@@ -95,13 +121,9 @@ def build_ship():
     if not data or 'planet_id' not in data or 'ship_type' not in data or 'quantity' not in data:
         return jsonify({'error': 'Missing required fields'}), 400
 
-    # Verify planet ownership
-    planet = Planet.query.filter_by(id=data['planet_id'], user_id=user_id).first()
-    if not planet:
-        return jsonify({'error': 'Planet not found or not owned by user'}), 404
-
     ship_type = data['ship_type']
     quantity = data['quantity']
+    planet_id = data['planet_id']
 
     if ship_type not in SHIP_COSTS:
         return jsonify({'error': 'Invalid ship type'}), 400
@@ -109,69 +131,87 @@ def build_ship():
     if quantity <= 0:
         return jsonify({'error': 'Quantity must be positive'}), 400
 
+    if ship_type not in FLEET_SHIP_COLUMNS:
+        return jsonify({'error': f'Fleet model does not support ship type: {ship_type}'}), 400
+
     # Calculate total cost
-    costs = SHIP_COSTS[ship_type]
-    total_cost_metal = costs['metal'] * quantity
-    total_cost_crystal = costs['crystal'] * quantity
-    total_cost_deuterium = costs['deuterium'] * quantity
-
-    # Check if planet has enough resources
-    if (planet.metal < total_cost_metal or
-        planet.crystal < total_cost_crystal or
-        planet.deuterium < total_cost_deuterium):
-        return jsonify({'error': 'Insufficient resources'}), 400
+    total_cost_metal, total_cost_crystal, total_cost_deuterium = (
+        cost * quantity for cost in SHIP_COST_TUPLES[ship_type]
+    )
+
+    # Verify ownership, check and deduct resources in a single conditional UPDATE
+    planet_resources = db.session.execute(
+        db.update(Planet)
+        .where(
+            Planet.id == planet_id,
+            Planet.user_id == user_id,
+            Planet.metal >= total_cost_metal,
+            Planet.crystal >= total_cost_crystal,
+            Planet.deuterium >= total_cost_deuterium
+        )
+        .values(
+            metal=Planet.metal - total_cost_metal,
+            crystal=Planet.crystal - total_cost_crystal,
+            deuterium=Planet.deuterium - total_cost_deuterium
+        )
+        .returning(Planet.metal, Planet.crystal, Planet.deuterium)
+    ).first()
 
-    # Deduct resources
-    planet.metal -= total_cost_metal
-    planet.crystal -= total_cost_crystal
-    planet.deuterium -= total_cost_deuterium
+    if planet_resources is None:
+        # Nothing was updated: tell apart a foreign planet from a poor one. The
+        # primary-key get is served from the identity map when already loaded
+        planet = db.session.get(Planet, planet_id)
+        if planet is None or str(planet.user_id) != str(user_id):
+            return jsonify({'error': 'Planet not found or not owned by user'}), 404
+        return jsonify({'error': 'Insufficient resources'}), 400
 
     # Create or update fleet with the new ships
-    # For demo simplicity, we'll add ships to an existing fleet or create a new one
-    fleet = Fleet.query.filter_by(
-        user_id=user_id,
-        start_planet_id=data['planet_id'],
-        status='stationed'
+    # For demo simplicity, we'll add ships to an existing fleet or create a new one.
+    # The UPDATE above holds the planet's row lock until the commit below, so a
+    # concurrent build on this planet waits for it and then finds the fleet this
+    # one inserts instead of inserting a second. A unique index cannot do this:
+    # fleets returning home are stationed at the planet alongside this one
+    ship_column = FLEET_SHIP_COLUMNS[ship_type]
+    stationed_fleet_id = db.select(Fleet.id).where(
+        Fleet.user_id == user_id,
+        Fleet.start_planet_id == planet_id,
+        Fleet.status == 'stationed'
+    ).order_by(Fleet.id).limit(1).scalar_subquery()
+
+    fleet_row = db.session.execute(
+        db.update(Fleet)
+        .where(Fleet.id == stationed_fleet_id)
+        .values({ship_column: db.func.coalesce(ship_column, 0) + quantity})
+        .returning(Fleet.id, *FLEET_SHIP_COLUMNS.values())
     ).first()
 
-    if not fleet:
-        # Create new fleet
+    if fleet_row is None:
+        # Create new fleet; it is already home, so departure and arrival are now
+        now = datetime.utcnow()
         fleet = Fleet(
             user_id=user_id,
             mission='stationed',
-            start_planet_id=data['planet_id'],
-            target_planet_id=data['planet_id'],
-            departure_time=db.func.now(),
-            arrival_time=db.func.now()
+            start_planet_id=planet_id,
+            target_planet_id=planet_id,
+            departure_time=now,
+            arrival_time=now
         )
+        setattr(fleet, ship_type, quantity)
         db.session.add(fleet)
         db.session.flush()
-
-    # Add ships to fleet dynamically
-    if hasattr(fleet, ship_type):
-        current_count = getattr(fleet, ship_type) or 0
-        setattr(fleet, ship_type, current_count + quantity)
-    else:
-        return jsonify({'error': f'Fleet model does not support ship type: {ship_type}'}), 400
+        fleet_row = tuple(getattr(fleet, field) for field in FLEET_INFO_FIELDS)
 
     db.session.commit()
 
-    # Build response with updated fleet info
-    fleet_info = {'id': fleet.id}
-    # Include all ship counts in response
-    ship_fields = ['small_cargo', 'large_cargo', 'light_fighter', 'heavy_fighter',
-                   'cruiser', 'battleship', 'colony_ship', 'recycler', 'espionage_probe',
-                   'bomber', 'destroyer', 'deathstar', 'battlecruiser']
-    for field in ship_fields:
-        if hasattr(fleet, field):
-            fleet_info[field] = getattr(fleet, field) or 0
+    # Build response with updated fleet info, including all ship counts
+    fleet_info = {field: value or 0 for field, value in zip(FLEET_INFO_FIELDS, fleet_row)}
 
     return jsonify({
         'message': f'Successfully built {quantity} {ship_type}(s)',
         'planet_resources': {
-            'metal': planet.metal,
-            'crystal': planet.crystal,
-            'deuterium': planet.deuterium
+            'metal': planet_resources.metal,
+            'crystal': planet_resources.crystal,
+            'deuterium': planet_resources.deuterium
         },
         'fleet': fleet_info
     }), 200
@@ -179,4 +219,9 @@ def build_ship():
 @shipyard_bp.route('/costs', methods=['GET'])
 def get_ship_costs():
     """Get costs for all ship types"""
-    return jsonify(SHIP_COSTS), 200
+    response = current_app.response_class(SHIP_COSTS_JSON, mimetype='application/json')
+    response.set_etag(SHIP_COSTS_ETAG)
+    response.cache_control.public = True
+    response.cache_control.max_age = 86400
+    # Answers 304 Not Modified when the client already holds this ETag
+    return response.make_conditional(request)
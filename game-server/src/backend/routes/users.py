@@ -1,4 +1,6 @@
-from flask import Blueprint, request, jsonify
+import json
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from backend.database import db
 from backend.models import User
 
@@ -6,13 +8,24 @@ users_bp = Blueprint('users', __name__)
 
 @users_bp.route('/users', methods=['GET'])
 def get_users():
-    users = User.query.all()
-    return jsonify([{
-        'id': user.id,
-        'username': user.username,
-        'email': user.email,
-        'created_at': user.created_at.isoformat() if user.created_at else None
-    } for user in users])
+    # Select only the listed columns; no User instances are built or tracked
+    users = db.session.query(User.id, User.username, User.email, User.created_at).yield_per(500)
+
+    # Stream the JSON array row by row instead of building the whole list first
+    def generate():
+        yield '['
+        for index, user in enumerate(users):
+            if index:
+                yield ','
+            yield json.dumps({
+                'id': user.id,
+                'username': user.username,
+                'email': user.email,
+                'created_at': user.created_at.isoformat() if user.created_at else None
+            })
+        yield ']'
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 @users_bp.route('/users/<int:user_id>', methods=['GET'])
 def get_user(user_id):
@@ -38,10 +51,15 @@ def create_user():
     if '@' not in data['email'] or '.' not in data['email']:
         return jsonify({'error': 'Invalid email format'}), 400
 
-    if User.query.filter_by(username=data['username']).first():
+    # One query for both uniqueness checks; at most two rows can match
+    existing = db.session.query(User.username, User.email).filter(
+        db.or_(User.username == data['username'], User.email == data['email'])
+    ).all()
+
+    if any(row.username == data['username'] for row in existing):
         return jsonify({'error': 'Username already exists'}), 409
 
-    if User.query.filter_by(email=data['email']).first():
+    if existing:
         return jsonify({'error': 'Email already exists'}), 409
 
     user = User(
@@ -12,11 +12,19 @@ This service handles all combat calculations including:
 """
 
 import json
+import logging
 import math
 from datetime import datetime
 from backend.database import db
 from backend.models import Fleet, Planet, CombatReport, DebrisField, User, TickLog
 
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Shared compact encoder for combat report payloads; json.dumps would build a
+# fresh encoder on every call once non-default options are passed
+_report_encoder = json.JSONEncoder(separators=(',', ':'))
+
 
 class CombatEngine:
     """Core combat calculation engine"""
@@ -53,6 +61,19 @@ class CombatEngine:
         }
     }
 
+    # (hull, shield, weapon) per ship type, read once here instead of three
+    # nested lookups per ship type whenever a side is converted for combat
+    COMBAT_STATS = {
+        ship_type: (stats['hull'], stats['shield'], stats['weapon'])
+        for ship_type, stats in SHIP_STATS.items()
+    }
+
+    # Battles end after this many rounds even if both sides still have ships
+    MAX_ROUNDS = 6
+
+    # Ship types taking part in combat, in fleet column order
+    SHIP_TYPES = tuple(SHIP_STATS)
+
     # Rapid fire bonuses (attacker:defender ratio)
     RAPID_FIRE = {
         'light_fighter': {'heavy_fighter': 2, 'cruiser': 6, 'battleship': 3},
@@ -61,11 +82,31 @@ class CombatEngine:
         'battleship': {'small_cargo': 3, 'large_cargo': 4}
     }
 
+    # Rapid fire as flat (target_type, extra_shots_per_target) tuples, so the
+    # per-round firepower loop does no nested dict walking or ratio arithmetic
+    RAPID_FIRE_TARGETS = {
+        ship_type: tuple((target_type, ratio - 1) for target_type, ratio in targets.items())
+        for ship_type, targets in RAPID_FIRE.items()
+    }
+
+    # (metal, crystal) cost per ship; 30% of destroyed ship costs become debris
+    # Simplified cost calculation (would be more complex in real implementation)
+    DEBRIS_COSTS = {
+        'small_cargo': (2000, 2000),
+        'large_cargo': (6000, 6000),
+        'light_fighter': (3000, 1000),
+        'heavy_fighter': (6000, 4000),
+        'cruiser': (20000, 7000),
+        'battleship': (45000, 15000),
+        'colony_ship': (10000, 20000)
+    }
+    DEBRIS_RATIO = 0.3
+
     @staticmethod
     def calculate_battle(attacker_fleet, defender_fleet, defender_planet=None):
         """Main battle calculation engine"""
-        print("DEBUG: Starting battle calculation")
-        print(f"DEBUG: Attacker fleet: {attacker_fleet.id}, Defender fleet: {defender_fleet.id}")
+        logger.debug("Starting battle calculation")
+        logger.debug("Attacker fleet: %s, Defender fleet: %s", attacker_fleet.id, defender_fleet.id)
 
         rounds = []
         attacker_ships = CombatEngine._fleet_to_combat_ships(attacker_fleet)
@@ -75,21 +116,28 @@ class CombatEngine:
         if defender_planet:
             defender_ships.update(CombatEngine._planet_defenses_to_ships(defender_planet))
 
-        round_num = 1
-        while CombatEngine._has_ships(attacker_ships) and CombatEngine._has_ships(defender_ships) and round_num <= 6:
-            print(f"DEBUG: Calculating round {round_num}")
+        # Survival is re-checked once per side after each round and reused for
+        # both the loop condition and the winner
+        attacker_alive = CombatEngine._has_ships(attacker_ships)
+        defender_alive = CombatEngine._has_ships(defender_ships)
+
+        for round_num in range(1, CombatEngine.MAX_ROUNDS + 1):
+            if not (attacker_alive and defender_alive):
+                break
+            logger.debug("Calculating round %s", round_num)
             round_result = CombatEngine._calculate_round(attacker_ships, defender_ships)
             rounds.append(round_result)
-            round_num += 1
+            attacker_alive = CombatEngine._has_ships(attacker_ships)
+            defender_alive = CombatEngine._has_ships(defender_ships)
 
         # Determine winner and calculate losses
-        winner = 'attacker' if CombatEngine._has_ships(attacker_ships) else 'defender'
-        print(f"DEBUG: Battle winner: {winner}")
+        winner = 'attacker' if attacker_alive else 'defender'
+        logger.debug("Battle winner: %s", winner)
 
         # Calculate final losses
         attacker_losses = CombatEngine._calculate_losses(attacker_fleet, attacker_ships)
         defender_losses = CombatEngine._calculate_losses(defender_fleet, defender_ships)
-        debris = CombatEngine._calculate_debris(attacker_fleet, defender_fleet)
+        debris = CombatEngine._calculate_debris(attacker_losses, defender_losses)
 
         result = {
             'winner': winner,
@@ -99,40 +147,30 @@ class CombatEngine:
             'debris': debris
         }
 
-        print(f"DEBUG: Battle calculation complete. Winner: {winner}")
+        logger.debug("Battle calculation complete. Winner: %s", winner)
         return result
 
     @staticmethod
     def _fleet_to_combat_ships(fleet):
         """Convert fleet to combat-ready ship dictionary"""
-        ships = {}
-        for ship_type in ['small_cargo', 'large_cargo', 'light_fighter', 'heavy_fighter', 'cruiser', 'battleship', 'colony_ship']:
-            count = getattr(fleet, ship_type, 0)
-            if count > 0:
-                ships[ship_type] = {
-                    'count': count,
-                    'hull': CombatEngine.SHIP_STATS[ship_type]['hull'],
-                    'shield': CombatEngine.SHIP_STATS[ship_type]['shield'],
-                    'weapon': CombatEngine.SHIP_STATS[ship_type]['weapon']
-                }
-        return ships
+        return CombatEngine._units_to_combat_ships(fleet)
 
     @staticmethod
     def _planet_defenses_to_ships(planet):
         """Convert planetary defenses to ship-like combat units"""
         # For now, planetary defenses are represented as ships
         # This could be expanded to include actual defense structures
-        defenses = {}
-        for ship_type in ['small_cargo', 'large_cargo', 'light_fighter', 'heavy_fighter', 'cruiser', 'battleship', 'colony_ship']:
-            count = getattr(planet, ship_type, 0)
+        return CombatEngine._units_to_combat_ships(planet)
+
+    @staticmethod
+    def _units_to_combat_ships(source):
+        """Build the combat ship dictionary for every ship type present on a fleet or planet"""
+        ships = {}
+        for ship_type, (hull, shield, weapon) in CombatEngine.COMBAT_STATS.items():
+            count = getattr(source, ship_type, 0)
             if count > 0:
-                defenses[ship_type] = {
-                    'count': count,
-                    'hull': CombatEngine.SHIP_STATS[ship_type]['hull'],
-                    'shield': CombatEngine.SHIP_STATS[ship_type]['shield'],
-                    'weapon': CombatEngine.SHIP_STATS[ship_type]['weapon']
-                }
-        return defenses
+                ships[ship_type] = {'count': count, 'hull': hull, 'shield': shield, 'weapon': weapon}
+        return ships
 
     @staticmethod
     def _calculate_round(attacker_ships, defender_ships):
@@ -145,9 +183,11 @@ class CombatEngine:
         attacker_damage = CombatEngine._apply_shields(attacker_fire, defender_ships)
         defender_damage = CombatEngine._apply_shields(defender_fire, attacker_ships)
 
-        # Apply hull damage
-        CombatEngine._apply_hull_damage(attacker_damage, defender_ships)
-        CombatEngine._apply_hull_damage(defender_damage, attacker_ships)
+        # Apply hull damage; fully shielded volleys cannot destroy anything
+        if attacker_damage > 0:
+            CombatEngine._apply_hull_damage(attacker_damage, defender_ships)
+        if defender_damage > 0:
+            CombatEngine._apply_hull_damage(defender_damage, attacker_ships)
 
         return {
             'attacker_fire': attacker_fire,
@@ -158,67 +198,72 @@ class CombatEngine:
 
     @staticmethod
     def _calculate_firepower(attacker_ships, defender_ships, side):
-        """Calculate total firepower including rapid fire bonuses"""
+        """Calculate total firepower including rapid fire bonuses
+
+        Each ship type fires ``count`` base shots plus one extra shot per
+        rapid-fire target (capped at ``count``), so the whole side reduces to
+        a single integer sum of ``weapon * shots``.
+        """
         total_fire = 0
 
         for ship_type, ship_data in attacker_ships.items():
-            if ship_data['count'] <= 0:
+            count = ship_data['count']
+            if count <= 0:
                 continue
 
-            base_fire = ship_data['count'] * ship_data['weapon']
-            rapid_fire_bonus = 1.0
+            shots = count
 
             # Apply rapid fire bonuses
-            if ship_type in CombatEngine.RAPID_FIRE:
-                for target_type, ratio in CombatEngine.RAPID_FIRE[ship_type].items():
-                    if target_type in defender_ships and defender_ships[target_type]['count'] > 0:
-                        # Calculate how many extra shots this ship gets
-                        target_count = defender_ships[target_type]['count']
-                        extra_shots = min(target_count * (ratio - 1), ship_data['count'])
-                        rapid_fire_bonus += extra_shots / ship_data['count']
+            for target_type, extra_per_target in CombatEngine.RAPID_FIRE_TARGETS.get(ship_type, ()):
+                target = defender_ships.get(target_type)
+                if target is not None and target['count'] > 0:
+                    shots += min(target['count'] * extra_per_target, count)
 
-            total_fire += base_fire * rapid_fire_bonus
+            total_fire += ship_data['weapon'] * shots
 
         return int(total_fire)
 
     @staticmethod
     def _apply_shields(damage, target_ships):
-        """Apply shield absorption to damage"""
-        remaining_damage = damage
-
-        for ship_type, ship_data in target_ships.items():
-            if ship_data['count'] <= 0 or remaining_damage <= 0:
-                continue
-
-            total_shield = ship_data['count'] * ship_data['shield']
-            absorbed = min(remaining_damage, total_shield)
-            remaining_damage -= absorbed
-
-            if remaining_damage <= 0:
-                break
-
-        return max(0, damage - (damage - remaining_damage))
+        """Apply shield absorption to damage
+
+        Shields of every surviving ship soak up damage before hulls are hit,
+        which is simply the damage minus the side's combined shield strength.
+        """
+        total_shield = sum(
+            ship_data['count'] * ship_data['shield']
+            for ship_data in target_ships.values()
+            if ship_data['count'] > 0
+        )
+        return max(0, damage - total_shield)
 
     @staticmethod
     def _apply_hull_damage(damage, target_ships):
-        """Apply damage to ship hulls"""
-        remaining_damage = damage
-
-        for ship_type, ship_data in target_ships.items():
-            if ship_data['count'] <= 0 or remaining_damage <= 0:
-                continue
+        """Apply damage to ship hulls
+
+        Damage is spread over the surviving ship types in proportion to their
+        share of the side's total hull, instead of being poured into whichever
+        type happens to come first. Only whole ships are destroyed.
+        """
+        if damage <= 0:
+            return
+
+        hull_by_type = {
+            ship_type: ship_data['count'] * ship_data['hull']
+            for ship_type, ship_data in target_ships.items()
+            if ship_data['count'] > 0
+        }
+        total_hull = sum(hull_by_type.values())
+        if total_hull <= 0:
+            return
 
-            total_hull = ship_data['count'] * ship_data['hull']
-            damage_taken = min(remaining_damage, total_hull)
+        for ship_type, type_hull in hull_by_type.items():
+            ship_data = target_ships[ship_type]
+            damage_taken = min(damage, total_hull) * type_hull // total_hull
 
             # Calculate ships destroyed
-            ships_destroyed = damage_taken // ship_data['hull']
-            ship_data['count'] = max(0, ship_data['count'] - ships_destroyed)
-
-            remaining_damage -= damage_taken
-
-            if remaining_damage <= 0:
-                break
+            ships_destroyed = min(ship_data['count'], damage_taken // ship_data['hull'])
+            ship_data['count'] -= ships_destroyed
 
     @staticmethod
     def _has_ships(ships):
@@ -230,7 +275,7 @@ class CombatEngine:
         """Calculate ship losses from original fleet"""
         losses = {}
 
-        for ship_type in ['small_cargo', 'large_cargo', 'light_fighter', 'heavy_fighter', 'cruiser', 'battleship', 'colony_ship']:
+        for ship_type in CombatEngine.SHIP_TYPES:
             original_count = getattr(original_fleet, ship_type, 0)
             remaining_count = remaining_ships.get(ship_type, {}).get('count', 0)
             losses[ship_type] = max(0, original_count - remaining_count)
@@ -238,41 +283,25 @@ class CombatEngine:
         return losses
 
     @staticmethod
-    def _calculate_debris(attacker_fleet, defender_fleet):
-        """Calculate debris from destroyed ships"""
+    def _calculate_debris(attacker_losses, defender_losses):
+        """Calculate debris from destroyed ships, given each side's losses"""
         total_metal = 0
         total_crystal = 0
 
-        # 30% of ship costs become debris
-        # Simplified cost calculation (would be more complex in real implementation)
-        ship_costs = {
-            'small_cargo': {'metal': 2000, 'crystal': 2000},
-            'large_cargo': {'metal': 6000, 'crystal': 6000},
-            'light_fighter': {'metal': 3000, 'crystal': 1000},
-            'heavy_fighter': {'metal': 6000, 'crystal': 4000},
-            'cruiser': {'metal': 20000, 'crystal': 7000},
-            'battleship': {'metal': 45000, 'crystal': 15000},
-            'colony_ship': {'metal': 10000, 'crystal': 20000}
-        }
-
-        for ship_type, count in CombatEngine._calculate_losses(attacker_fleet, CombatEngine._fleet_to_combat_ships(attacker_fleet)).items():
-            if count > 0 and ship_type in ship_costs:
-                cost = ship_costs[ship_type]
-                total_metal += int(count * cost['metal'] * 0.3)
-                total_crystal += int(count * cost['crystal'] * 0.3)
-
-        for ship_type, count in CombatEngine._calculate_losses(defender_fleet, CombatEngine._fleet_to_combat_ships(defender_fleet)).items():
-            if count > 0 and ship_type in ship_costs:
-                cost = ship_costs[ship_type]
-                total_metal += int(count * cost['metal'] * 0.3)
-                total_crystal += int(count * cost['crystal'] * 0.3)
+        for losses in (attacker_losses, defender_losses):
+            for ship_type, count in losses.items():
+                cost = CombatEngine.DEBRIS_COSTS.get(ship_type)
+                if count > 0 and cost is not None:
+                    metal, crystal = cost
+                    total_metal += int(count * metal * CombatEngine.DEBRIS_RATIO)
+                    total_crystal += int(count * crystal * CombatEngine.DEBRIS_RATIO)
 
         return {'metal': total_metal, 'crystal': total_crystal}
 
     @staticmethod
     def process_combat_result(combat_result, attacker_fleet, defender_fleet, planet):
         """Process the results of a combat engagement"""
-        print("DEBUG: Processing combat result")
+        logger.debug("Processing combat result")
 
         # Update fleet combat statistics
         if combat_result['winner'] == 'attacker':
@@ -282,8 +311,9 @@ class CombatEngine:
             attacker_fleet.combat_defeats += 1
             defender_fleet.combat_victories += 1
 
-        attacker_fleet.last_combat_time = datetime.utcnow()
-        defender_fleet.last_combat_time = datetime.utcnow()
+        combat_time = datetime.utcnow()
+        attacker_fleet.last_combat_time = combat_time
+        defender_fleet.last_combat_time = combat_time
 
         # Apply ship losses
         for ship_type, losses in combat_result['attacker_losses'].items():
@@ -296,6 +326,10 @@ class CombatEngine:
                 current_count = getattr(defender_fleet, ship_type, 0)
                 setattr(defender_fleet, ship_type, max(0, current_count - losses))
 
+        # Rows created by this battle, added to the session together so the
+        # flush emits their INSERTs in a single unit of work
+        new_records = []
+
         # Create debris field
         if combat_result['debris']['metal'] > 0 or combat_result['debris']['crystal'] > 0:
             debris_field = DebrisField(
@@ -304,7 +338,7 @@ class CombatEngine:
                 crystal=combat_result['debris']['crystal'],
                 deuterium=0  # Could be expanded to include deuterium debris
             )
-            db.session.add(debris_field)
+            new_records.append(debris_field)
 
         # Generate battle report
         winner_id = attacker_fleet.user_id if combat_result['winner'] == 'attacker' else defender_fleet.user_id
@@ -314,24 +348,31 @@ class CombatEngine:
             defender_id=defender_fleet.user_id,
             planet_id=planet.id,
             winner_id=winner_id,
-            rounds=json.dumps(combat_result['rounds']),
-            attacker_losses=json.dumps(combat_result['attacker_losses']),
-            defender_losses=json.dumps(combat_result['defender_losses']),
+            rounds=_report_encoder.encode(combat_result['rounds']),
+            attacker_losses=_report_encoder.encode(combat_result['attacker_losses']),
+            defender_losses=_report_encoder.encode(combat_result['defender_losses']),
             debris_metal=combat_result['debris']['metal'],
             debris_crystal=combat_result['debris']['crystal']
         )
-        db.session.add(battle_report)
-
-        # Create tick log entry
+        new_records.append(battle_report)
+
+        # Create tick log entry; both owners are already loaded with their
+        # fleets, so the winner's name is picked locally rather than lazy-loaded
+        # through the new report
+        attacker_name = attacker_fleet.owner.username
+        defender_name = defender_fleet.owner.username
+        winner_name = attacker_name if combat_result['winner'] == 'attacker' else defender_name
         tick_log = TickLog(
             planet_id=planet.id,
             event_type='combat',
-            event_description=f'Combat between {attacker_fleet.user.username} and {defender_fleet.user.username}. Winner: {battle_report.winner.username}'
+            event_description=f'Combat between {attacker_name} and {defender_name}. Winner: {winner_name}'
         )
-        db.session.add(tick_log)
+        new_records.append(tick_log)
 
-        db.session.commit()
-        print("DEBUG: Combat result processing complete")
+        db.session.add_all(new_records)
+        # Flush rather than commit: arrival processing commits once per batch
+        db.session.flush()
+        logger.debug("Combat result processing complete")
 
         return battle_report
 
@@ -345,8 +386,8 @@ class CombatEngine:
         return {
             'winner': 'attacker',
             'rounds': [],
-            'attacker_losses': {ship: 0 for ship in ['small_cargo', 'large_cargo', 'light_fighter', 'heavy_fighter', 'cruiser', 'battleship', 'colony_ship']},
-            'defender_losses': {ship: 0 for ship in ['small_cargo', 'large_cargo', 'light_fighter', 'heavy_fighter', 'cruiser', 'battleship', 'colony_ship']},
+            'attacker_losses': {ship: 0 for ship in CombatEngine.SHIP_TYPES},
+            'defender_losses': {ship: 0 for ship in CombatEngine.SHIP_TYPES},
             'debris': {'metal': 0, 'crystal': 0},
             'planet_captured': True
         }
@@ -354,7 +395,7 @@ class CombatEngine:
     @staticmethod
     def process_planet_attack_result(combat_result, fleet, planet):
         """Process the results of a planet attack"""
-        print("DEBUG: Processing planet attack result")
+        logger.debug("Processing planet attack result")
 
         # Update fleet combat statistics
         if combat_result.get('planet_captured', False):
@@ -365,11 +406,11 @@ class CombatEngine:
             tick_log = TickLog(
                 planet_id=planet.id,
                 event_type='planet_capture',
-                event_description=f'Planet {planet.name} captured by {fleet.user.username}'
+                event_description=f'Planet {planet.name} captured by {fleet.owner.username}'
             )
             db.session.add(tick_log)
 
         fleet.last_combat_time = datetime.utcnow()
-        db.session.commit()
+        db.session.flush()
 
-        print("DEBUG: Planet attack result processing complete")
+        logger.debug("Planet attack result processing complete")
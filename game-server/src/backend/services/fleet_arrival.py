@@ -5,12 +5,33 @@ This service handles the processing of fleets that have arrived at their destina
 It manages colonization, resource collection, and other mission completion logic.
 """
 
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.dialects import postgresql, sqlite
 from backend.database import db
-from backend.models import Fleet, Planet, User, TickLog, Research
+from backend.models import Fleet, Planet, User, TickLog, Research, ExploredSystem, DebrisField, IN_FLIGHT_STATUS_KINDS, COORDINATE_STATUS_PREFIXES, pack_coordinates, parse_coordinates
 from backend.services.planet_traits import PlanetTraitService
 from backend.config import calculate_fuel_consumption
-import json
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Fleets claimed per arrival batch; a tick keeps claiming until the backlog is drained
+ARRIVAL_BATCH_SIZE = 100
+
+# Databases whose FOR UPDATE SKIP LOCKED lets several workers drain arrivals at once
+SKIP_LOCKED_DIALECTS = ('postgresql', 'mysql')
+
+# INSERT constructs of the dialects that support ON CONFLICT DO NOTHING
+CONFLICT_IGNORING_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+# Tick logs written while an arrival batch is processed, inserted together when it
+# commits. A ContextVar keeps scheduler threads from sharing one batch's list
+_pending_tick_logs = ContextVar('pending_tick_logs', default=None)
 
 # Enhanced error handling constants
 COLONIZATION_ERRORS = {
@@ -42,128 +63,393 @@ class FleetArrivalService:
     """Service for processing arrived fleets and completing their missions"""
 
     @staticmethod
-    def process_arrived_fleets():
-        """Process all fleets that have arrived at their destinations"""
-        print("DEBUG: Processing arrived fleets")
-        arrived_fleets = Fleet.query.filter(
-            Fleet.arrival_time <= datetime.utcnow(),
-            Fleet.status.in_(['traveling', 'returning'])
-        ).all()
-
-        # Also check for coordinate-based missions that have arrived
-        coordinate_based_fleets = Fleet.query.filter(
-            Fleet.arrival_time <= datetime.utcnow(),
-            Fleet.status.like('exploring:%') |
-            Fleet.status.like('colonizing:%')
-        ).all()
-
-        arrived_fleets.extend(coordinate_based_fleets)
-
-        print(f"DEBUG: Found {len(arrived_fleets)} arrived fleets")
-        for fleet in arrived_fleets:
-            print(f"DEBUG: Processing fleet {fleet.id} with mission {fleet.mission}")
-            if fleet.mission == 'colonize':
-                FleetArrivalService._process_colonization(fleet)
-            elif fleet.mission == 'attack':
-                FleetArrivalService._process_attack(fleet)
-            elif fleet.mission == 'return':
-                FleetArrivalService._process_return(fleet)
-            elif fleet.mission == 'explore':
-                FleetArrivalService._process_exploration(fleet)
-            elif fleet.mission == 'recycle':
-                FleetArrivalService._process_recycle(fleet)
-            # Add other mission types as needed
-
-    @staticmethod
-    def _process_colonization(fleet):
-        """Handle colonization fleet arrival with enhanced simultaneous colonization protection"""
-        print(f"DEBUG: Processing colonization for fleet {fleet.id}")
+    def process_arrived_fleets(now=None):
+        """Process all fleets that have arrived at their destinations.
+
+        now is the tick time; every fleet of the sweep is processed as of it.
+        """
+        logger.debug("Processing arrived fleets")
+        now = now or datetime.utcnow()
+        workers = FleetArrivalService._arrival_worker_count()
+        if workers == 1:
+            FleetArrivalService._drain_arrived_fleets(now)
+            return
+
+        # Each worker gets its own app context, hence its own scoped session,
+        # and claims its own batches; SKIP LOCKED keeps the claims disjoint
+        app = current_app._get_current_object()
+
+        def drain_in_worker():
+            with app.app_context():
+                FleetArrivalService._drain_arrived_fleets(now)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(drain_in_worker) for _ in range(workers)]
+        for future in futures:
+            future.result()
+
+    @staticmethod
+    def _arrival_worker_count():
+        """Number of concurrent arrival workers this tick may use.
+
+        Parallel draining relies on FOR UPDATE SKIP LOCKED, so databases
+        without it (SQLite) always get a single worker.
+        """
+        workers = max(1, int(current_app.config.get('ARRIVAL_WORKERS', 1)))
+        if db.engine.dialect.name not in SKIP_LOCKED_DIALECTS:
+            return 1
+        return workers
+
+    @staticmethod
+    def _drain_arrived_fleets(now):
+        """Claim, process and commit batches of due fleets until none are left"""
+        claimed_ids = set()
+        while True:
+            arrived_fleets = FleetArrivalService._claim_arrived_fleets(now)
+            if not arrived_fleets:
+                # Nothing due (the usual tick): skip grouping, prefetches and the commit
+                break
+
+            # Every fleet of the batch was claimed before and is still due, so the
+            # last pass settled none of them; claiming again would never end
+            batch_ids = {fleet.id for fleet in arrived_fleets}
+            if batch_ids <= claimed_ids:
+                logger.error("Arrived fleets %s were not settled, leaving them to the next tick", sorted(batch_ids))
+                db.session.rollback()
+                break
+            claimed_ids |= batch_ids
+
+            logger.debug("Claimed %s arrived fleets", len(arrived_fleets))
+
+            # Group by mission so each mission's lookups are fetched once for all its fleets
+            fleets_by_mission = defaultdict(list)
+            for fleet in arrived_fleets:
+                fleets_by_mission[fleet.mission].append(fleet)
+
+            tick_logs = []
+            token = _pending_tick_logs.set(tick_logs)
+            try:
+                # The prefetches lock the rows fleets share (target planets, defenders,
+                # debris fields); a fixed mission order keeps workers locking alike
+                for mission, fleets in sorted(fleets_by_mission.items()):
+                    batch_handler = MISSION_BATCH_HANDLERS.get(mission)
+                    if batch_handler:
+                        batch_handler(fleets)
+                        continue
+
+                    prefetched = FleetArrivalService._prefetch_for_mission(mission, fleets)
+                    for fleet in fleets:
+                        FleetArrivalService._process_fleet(fleet, prefetched, now)
+            finally:
+                _pending_tick_logs.reset(token)
+
+            # One commit per batch; each fleet already ran in its own savepoint.
+            # The batch's tick logs go out in the same flush as one multi-row
+            # INSERT, and committing releases the row locks taken by the claim
+            db.session.add_all(tick_logs)
+            db.session.commit()
+
+            if len(arrived_fleets) < ARRIVAL_BATCH_SIZE:
+                break
+
+    @staticmethod
+    def _claim_arrived_fleets(now):
+        """Lock and return the next batch of due fleets no other worker holds.
+
+        FOR UPDATE SKIP LOCKED lets several tick workers share the backlog
+        without processing a fleet twice. It needs PostgreSQL or MySQL 8;
+        SQLite ignores the clause, so there the sweep is the only processor.
+        """
+        return FleetArrivalService._claim_query(now).all()
+
+    @staticmethod
+    def _claim_query(now):
+        """Query behind _claim_arrived_fleets, kept apart so its locking can be inspected"""
+        return FleetArrivalService._eager_fleet_query().filter(
+            Fleet.arrival_time <= now,
+            Fleet.status_kind.in_(IN_FLIGHT_STATUS_KINDS)
+        ).order_by(
+            Fleet.arrival_time
+        ).with_for_update(
+            # Lock only the fleet rows, not the eager-loaded owners and planets
+            skip_locked=True, of=Fleet
+        ).limit(ARRIVAL_BATCH_SIZE)
+
+    @staticmethod
+    def process_fleet_arrival(fleet_id):
+        """Process a single fleet when its scheduled arrival job fires"""
+        now = datetime.utcnow()
+        fleet = FleetArrivalService._scheduled_fleet_query(fleet_id, now).first()
+
+        # The tick sweep may have handled it already, holds it right now (the
+        # skipped lock returns nothing), or it was recalled meanwhile; the
+        # status is checked on the locked row
+        if not fleet or not FleetArrivalService._is_in_flight(fleet):
+            logger.debug("Fleet %s is not due, skipping scheduled arrival", fleet_id)
+            return
+
+        prefetched = FleetArrivalService._prefetch_for_mission(fleet.mission, [fleet])
+        FleetArrivalService._process_fleet(fleet, prefetched, now)
+        db.session.commit()
+
+    @staticmethod
+    def _scheduled_fleet_query(fleet_id, now):
+        """Query behind process_fleet_arrival, locking the fleet like _claim_query does"""
+        return FleetArrivalService._eager_fleet_query().filter(
+            Fleet.id == fleet_id,
+            Fleet.arrival_time <= now
+        ).with_for_update(
+            # A fleet the tick sweep has claimed is skipped rather than processed twice
+            skip_locked=True, of=Fleet
+        )
+
+    @staticmethod
+    def schedule_arrival(fleet):
+        """Queue the fleet's arrival with the game scheduler, if one is running.
+
+        The job runs beside the tick sweep, so it needs the row locks only
+        FOR UPDATE SKIP LOCKED databases honour; elsewhere (SQLite) the
+        sweep stays the only processor and picks the fleet up on time.
+        """
+        if db.engine.dialect.name not in SKIP_LOCKED_DIALECTS:
+            return False
+        scheduler = current_app.extensions.get('game_scheduler')
+        if scheduler is None:
+            return False
+        return scheduler.schedule_fleet_arrival(fleet.id, fleet.arrival_time)
+
+    @staticmethod
+    def _is_in_flight(fleet):
+        """Check whether a fleet is on its way somewhere"""
+        return (fleet.status in ('traveling', 'returning') or
+                fleet.status.startswith(COORDINATE_STATUS_PREFIXES))
+
+    @staticmethod
+    def _process_fleet(fleet, prefetched=None, now=None):
+        """Dispatch an arrived fleet to the handler for its mission.
+
+        prefetched is the batch lookup built by _prefetch_for_mission, if any,
+        and now the time the batch was claimed, shared by all of its fleets.
+        The handler runs inside a SAVEPOINT so a failure only rolls back that
+        fleet's changes; committing is left to the caller.
+        """
+        fleet_id, mission = fleet.id, fleet.mission
+        logger.debug("Processing fleet %s with mission %s", fleet_id, mission)
+        handler = MISSION_HANDLERS.get(mission)
+        if not handler:
+            # Nothing completes this mission; station the fleet so it is not claimed forever
+            logger.warning("No arrival handler for mission %s, stationing fleet %s", mission, fleet_id)
+            FleetArrivalService._return_fleet_to_stationed(fleet)
+            return
+        now = now or datetime.utcnow()
+        pending_tick_logs = _pending_tick_logs.get()
+        tick_log_mark = len(pending_tick_logs) if pending_tick_logs is not None else 0
 
         try:
-            # Parse target coordinates from fleet status or target_coordinates
+            with db.session.begin_nested():
+                handler(fleet, prefetched, now)
+        except Exception as e:
+            logger.error("Failed to process %s for fleet %s: %s", mission, fleet_id, e)
+            # Drop the tick logs of the rolled-back mission along with its savepoint
+            if pending_tick_logs is not None:
+                del pending_tick_logs[tick_log_mark:]
+            # Ensure fleet is returned to stationed even on error
+            FleetArrivalService._return_fleet_to_stationed(fleet)
+
+    @staticmethod
+    def _eager_fleet_query():
+        """Fleet query that eager-loads everything the mission handlers touch"""
+        # Build Fleet.query before the loader options: it configures the mappers,
+        # which is what creates the Fleet.owner backref
+        query = Fleet.query
+        return query.options(
+            db.joinedload(Fleet.owner),
+            db.joinedload(Fleet.target_planet)
+        )
+
+    @staticmethod
+    def _prefetch_for_mission(mission, fleets):
+        """Run the batch lookup for one mission's fleets, if that mission has one"""
+        prefetch = MISSION_PREFETCHERS.get(mission)
+        return prefetch(fleets) if prefetch else None
+
+    @staticmethod
+    def _prefetch_explored_systems(fleets):
+        """Load which exploration targets their owners have already explored, in one query"""
+        targets = set()
+        for fleet in fleets:
             coords_result = FleetArrivalService._parse_target_coordinates(fleet)
-            if not coords_result['success']:
-                print(f"ERROR: {coords_result['error']}")
-                FleetArrivalService._return_fleet_to_stationed(fleet)
-                return
-
-            target_x, target_y, target_z = coords_result['coordinates']
-            print(f"DEBUG: Colonization target coordinates: {target_x}:{target_y}:{target_z}")
-
-            # Enhanced simultaneous colonization protection
-            colonization_result = FleetArrivalService._validate_colonization_target(fleet, target_x, target_y, target_z)
-            if not colonization_result['success']:
-                print(f"WARNING: {colonization_result['error']}")
-                FleetArrivalService._return_fleet_to_stationed(fleet)
-
-                # Create tick log for failed colonization
-                tick_log = TickLog(
-                    event_type='colonization_failed',
-                    event_description=f'Colonization failed for fleet {fleet.id}: {colonization_result["error"]}'
-                )
-                db.session.add(tick_log)
-                db.session.commit()
-                return
-
-            target_planet = colonization_result['planet']
-
-            # Validate colony ship presence
-            if not FleetArrivalService._validate_colony_ship(fleet):
-                print(f"ERROR: Fleet {fleet.id} has no colony ships for colonization")
-                FleetArrivalService._return_fleet_to_stationed(fleet)
-
-                tick_log = TickLog(
-                    event_type='colonization_failed',
-                    event_description=f'Colonization failed for fleet {fleet.id}: No colony ships'
-                )
-                db.session.add(tick_log)
-                db.session.commit()
-                return
-
-            # Successful colonization
-            print(f"SUCCESS: Colonizing planet {target_planet.id} for user {fleet.user_id}")
-            FleetArrivalService._complete_colonization(fleet, target_planet)
+            if coords_result['success']:
+                targets.add((fleet.user_id, *coords_result['coordinates']))
 
-        except Exception as e:
-            print(f"ERROR: Failed to process colonization for fleet {fleet.id}: {str(e)}")
-            db.session.rollback()
+        if not targets:
+            return set()
+
+        explored = db.session.query(
+            ExploredSystem.user_id, ExploredSystem.x, ExploredSystem.y, ExploredSystem.z
+        ).filter(
+            db.tuple_(ExploredSystem.user_id, ExploredSystem.x, ExploredSystem.y, ExploredSystem.z).in_(targets)
+        )
+        return {tuple(row) for row in explored}
+
+    @staticmethod
+    def _prefetch_colonization_targets(fleets):
+        """Load the target planets of all colonizing fleets in one query, keyed by (x, y, z)"""
+        packed_coordinates = set()
+        for fleet in fleets:
+            if fleet.mission != 'colonize':
+                continue
+            if fleet.target_coord_packed is not None:
+                packed_coordinates.add(fleet.target_coord_packed)
+                continue
+            # Fleets dispatched before target_coord_packed existed
+            coords_result = FleetArrivalService._parse_target_coordinates(fleet)
+            if coords_result['success']:
+                packed_coordinates.add(pack_coordinates(*coords_result['coordinates']))
+
+        if not packed_coordinates:
+            return {}
+
+        # Lock the targets and reread their owners: another worker's fleets may
+        # be colonizing the same planets, and only one of them may take it
+        planets = Planet.query.options(db.joinedload(Planet.owner)).filter(
+            Planet.coord_packed.in_(packed_coordinates)
+        ).order_by(Planet.id).with_for_update(of=Planet).populate_existing().all()
+        return {(planet.x, planet.y, planet.z): planet for planet in planets}
+
+    @staticmethod
+    def _prefetch_defending_fleets(fleets):
+        """Load the fleets defending every attacked planet in one query, keyed by (user_id, planet_id)"""
+        # Combat writes the planets and their defenders, which other workers'
+        # attackers may share; lock and reread the planets before their owners are used
+        planet_ids = {fleet.target_planet_id for fleet in fleets if fleet.target_planet_id}
+        if planet_ids:
+            Planet.query.filter(
+                Planet.id.in_(planet_ids)
+            ).order_by(Planet.id).with_for_update().populate_existing().all()
+
+        targets = {
+            (fleet.target_planet.user_id, fleet.target_planet_id)
+            for fleet in fleets
+            if fleet.target_planet and fleet.target_planet.user_id != fleet.user_id
+        }
+        if not targets:
+            return {}
+
+        # Build Fleet.query first so the Fleet.owner backref exists for the option
+        query = Fleet.query
+        defenders = query.options(db.joinedload(Fleet.owner)).filter(
+            db.tuple_(Fleet.user_id, Fleet.start_planet_id).in_(targets),
+            Fleet.status.in_(['stationed', 'defending'])
+        ).order_by(Fleet.id).with_for_update(of=Fleet).populate_existing()
+
+        defenders_by_planet = {}
+        for defender in defenders:
+            defenders_by_planet.setdefault((defender.user_id, defender.start_planet_id), defender)
+        return defenders_by_planet
+
+    @staticmethod
+    def _prefetch_debris_fields(fleets):
+        """Lock and load the debris fields at every recycling target in one query, keyed by planet_id"""
+        planet_ids = {fleet.target_planet_id for fleet in fleets if fleet.target_planet_id}
+        debris_by_planet = defaultdict(list)
+        if not planet_ids:
+            return debris_by_planet
+
+        # Recyclers of other workers may be emptying the same fields
+        debris_fields = DebrisField.query.filter(
+            DebrisField.planet_id.in_(planet_ids)
+        ).order_by(DebrisField.id).with_for_update().populate_existing()
+        for debris_field in debris_fields:
+            debris_by_planet[debris_field.planet_id].append(debris_field)
+        return debris_by_planet
+
+    @staticmethod
+    def _process_colonization(fleet, planets_by_coord=None, now=None):
+        """Handle colonization fleet arrival with enhanced simultaneous colonization protection"""
+        logger.debug("Processing colonization for fleet %s", fleet.id)
+
+        # Parse target coordinates from fleet status or target_coordinates
+        coords_result = FleetArrivalService._parse_target_coordinates(fleet)
+        if not coords_result['success']:
+            logger.error(coords_result['error'])
+            FleetArrivalService._return_fleet_to_stationed(fleet)
+            return
+
+        target_x, target_y, target_z = coords_result['coordinates']
+        logger.debug("Colonization target coordinates: %s:%s:%s", target_x, target_y, target_z)
+
+        # Enhanced simultaneous colonization protection
+        colonization_result = FleetArrivalService._validate_colonization_target(
+            fleet, target_x, target_y, target_z, planets_by_coord
+        )
+        if not colonization_result['success']:
+            logger.warning(colonization_result['error'])
             FleetArrivalService._return_fleet_to_stationed(fleet)
 
+            # Create tick log for failed colonization
+            tick_log = TickLog(
+                event_type='colonization_failed',
+                event_description=f'Colonization failed for fleet {fleet.id}: {colonization_result["error"]}'
+            )
+            FleetArrivalService._add_tick_log(tick_log)
+            return
+
+        target_planet = colonization_result['planet']
+
+        # Validate colony ship presence
+        if not FleetArrivalService._validate_colony_ship(fleet):
+            logger.error("Fleet %s has no colony ships for colonization", fleet.id)
+            FleetArrivalService._return_fleet_to_stationed(fleet)
+
+            tick_log = TickLog(
+                event_type='colonization_failed',
+                event_description=f'Colonization failed for fleet {fleet.id}: No colony ships'
+            )
+            FleetArrivalService._add_tick_log(tick_log)
+            return
+
+        # Successful colonization
+        logger.debug("Colonizing planet %s for user %s", target_planet.id, fleet.user_id)
+        FleetArrivalService._complete_colonization(fleet, target_planet, now)
+
     @staticmethod
     def _parse_target_coordinates(fleet):
         """Parse target coordinates from fleet status or target_coordinates field"""
-        try:
-            if ':' in fleet.status and fleet.status.startswith(('colonizing:', 'exploring:')):
-                # Extract coordinates from status (format: colonizing:x:y:z or exploring:x:y:z)
-                coords_part = fleet.status.split(':')[1:]
-                target_x, target_y, target_z = map(int, coords_part)
-            elif hasattr(fleet, 'target_coordinates') and fleet.target_coordinates:
-                # Extract coordinates from target_coordinates field
-                target_x, target_y, target_z = map(int, fleet.target_coordinates.split(':'))
-            else:
-                return {
-                    'success': False,
-                    'error': f'No coordinates found for fleet {fleet.id}'
-                }
-
+        if fleet.status.startswith(COORDINATE_STATUS_PREFIXES):
+            # Extract coordinates from status (format: colonizing:x:y:z or exploring:x:y:z)
+            raw_coordinates = fleet.status.partition(':')[2]
+        elif getattr(fleet, 'target_coordinates', None):
+            # Extract coordinates from target_coordinates field (format: x:y:z)
+            raw_coordinates = fleet.target_coordinates
+        else:
             return {
-                'success': True,
-                'coordinates': (target_x, target_y, target_z)
+                'success': False,
+                'error': f'No coordinates found for fleet {fleet.id}'
             }
 
-        except ValueError as e:
+        coordinates = parse_coordinates(raw_coordinates)
+        if coordinates is None:
             return {
                 'success': False,
-                'error': f'Invalid coordinates format for fleet {fleet.id}: {str(e)}'
+                'error': f'Invalid coordinates format for fleet {fleet.id}: {raw_coordinates}'
             }
 
+        return {
+            'success': True,
+            'coordinates': coordinates
+        }
+
     @staticmethod
-    def _validate_colonization_target(fleet, target_x, target_y, target_z):
+    def _validate_colonization_target(fleet, target_x, target_y, target_z, planets_by_coord=None):
         """Enhanced validation for colonization target with race condition protection"""
-        # Find the target planet
-        target_planet = Planet.query.filter_by(
-            x=target_x, y=target_y, z=target_z
-        ).first()
+        # Find the target planet, preferring the batch prefetched by process_arrived_fleets
+        if planets_by_coord is not None:
+            target_planet = planets_by_coord.get((target_x, target_y, target_z))
+        else:
+            target_planet = Planet.query.filter_by(
+                x=target_x, y=target_y, z=target_z
+            ).with_for_update().populate_existing().first()
 
         if not target_planet:
             return {
@@ -173,7 +459,7 @@ class FleetArrivalService:
 
         # Check if planet is already owned (race condition protection)
         if target_planet.user_id:
-            owner_username = getattr(target_planet.user, 'username', f'user_{target_planet.user_id}')
+            owner_username = getattr(target_planet.owner, 'username', f'user_{target_planet.user_id}')
             return {
                 'success': False,
                 'error': f'Planet already owned by {owner_username} (colonized during travel)'
@@ -239,12 +525,12 @@ class FleetArrivalService:
         return calculate_fuel_consumption(fleet, distance)
 
     @staticmethod
-    def _complete_colonization(fleet, target_planet):
+    def _complete_colonization(fleet, target_planet, now=None):
         """Complete the colonization process"""
         # Transfer ownership
         target_planet.user_id = fleet.user_id
         target_planet.is_home_planet = False  # Colonies are not home planets
-        target_planet.colonized_at = datetime.utcnow()
+        target_planet.colonized_at = now or datetime.utcnow()
 
         # Initialize colony with starting resources
         target_planet.metal = 1000
@@ -257,226 +543,283 @@ class FleetArrivalService:
         target_planet.solar_plant = 1
 
         # Create tick log entry
-        username = getattr(fleet.user, 'username', f'user_{fleet.user_id}')
+        # Who colonized is kept as user_id; readers resolve the name when displaying
         tick_log = TickLog(
             planet_id=target_planet.id,
+            fleet_id=fleet.id,
+            user_id=fleet.user_id,
             event_type='colonization',
-            event_description=f'Planet {target_planet.name} colonized by {username}'
+            event_data={'planet_name': target_planet.name},
+            event_description=f'Planet {target_planet.name} colonized'
         )
-        db.session.add(tick_log)
+        FleetArrivalService._add_tick_log(tick_log)
 
         # Return fleet to stationed status
         FleetArrivalService._return_fleet_to_stationed(fleet)
 
-        db.session.commit()
-        print(f"SUCCESS: Planet {target_planet.id} successfully colonized")
+        logger.debug("Planet %s successfully colonized", target_planet.id)
 
     @staticmethod
     def _process_return(fleet):
         """Handle returning fleet arrival"""
-        print(f"DEBUG: Processing return for fleet {fleet.id}")
+        logger.debug("Processing return for fleet %s", fleet.id)
         FleetArrivalService._return_fleet_to_stationed(fleet)
 
     @staticmethod
-    def _process_exploration(fleet):
+    def _process_exploration(fleet, explored_systems=None, now=None):
         """Handle exploration fleet arrival"""
-        print(f"DEBUG: Processing exploration for fleet {fleet.id}")
+        logger.debug("Processing exploration for fleet %s", fleet.id)
+        now = now or datetime.utcnow()
 
-        try:
-            # Parse target coordinates
-            if ':' in fleet.status and fleet.status.startswith('exploring:'):
-                # Extract coordinates from status (format: exploring:x:y:z)
-                coords_part = fleet.status.split(':')[1:]
-                try:
-                    target_x, target_y, target_z = map(int, coords_part)
-                except ValueError:
-                    print(f"ERROR: Invalid coordinates in status for exploration fleet {fleet.id}: {fleet.status}")
-                    FleetArrivalService._return_fleet_to_stationed(fleet)
-                    return
-            elif hasattr(fleet, 'target_coordinates') and fleet.target_coordinates:
-                # Extract coordinates from target_coordinates field
-                try:
-                    target_x, target_y, target_z = map(int, fleet.target_coordinates.split(':'))
-                except ValueError:
-                    print(f"ERROR: Invalid target_coordinates for exploration fleet {fleet.id}: {fleet.target_coordinates}")
-                    FleetArrivalService._return_fleet_to_stationed(fleet)
-                    return
-            else:
-                print(f"ERROR: No coordinates found for exploration fleet {fleet.id}")
-                FleetArrivalService._return_fleet_to_stationed(fleet)
-                return
-
-            # Generate planets in the explored system
-            from backend.services.tick import generate_exploration_planets
-            discovered_planets = generate_exploration_planets(target_x, target_y, target_z, fleet.user_id)
-
-            # Mark system as explored for the user
-            user = fleet.user
-            username = getattr(user, 'username', f'user_{fleet.user_id}')
-
-            # Only update explored systems if user has the attribute (not a mock)
-            if hasattr(user, 'explored_systems'):
-                if user.explored_systems:
-                    try:
-                        explored = json.loads(user.explored_systems)
-                    except:
-                        explored = []
-                else:
-                    explored = []
-
-                system_key = f"{target_x}:{target_y}:{target_z}"
-                if system_key not in explored:
-                    explored.append({
-                        'coordinates': system_key,
-                        'explored_at': datetime.utcnow().isoformat(),
-                        'fleet_id': fleet.id,
-                        'planets_discovered': len(discovered_planets)
-                    })
-                    user.explored_systems = json.dumps(explored)
-
-            # Create tick log entry
-            tick_log = TickLog(
-                event_type='exploration',
-                event_description=f'System {target_x}:{target_y}:{target_z} explored by {username}, discovered {len(discovered_planets)} planets'
+        # Parse target coordinates
+        coords_result = FleetArrivalService._parse_target_coordinates(fleet)
+        if not coords_result['success']:
+            logger.error(coords_result['error'])
+            FleetArrivalService._return_fleet_to_stationed(fleet)
+            return
+
+        target_x, target_y, target_z = coords_result['coordinates']
+
+        # Generate planets in the explored system
+        from backend.services.tick import generate_exploration_planets
+        discovered_planets = generate_exploration_planets(target_x, target_y, target_z, fleet.user_id)
+
+        # Mark system as explored for the user, once per system
+        explored_key = (fleet.user_id, target_x, target_y, target_z)
+        if explored_systems is not None:
+            already_explored = explored_key in explored_systems
+            # Later fleets of the same batch see this exploration too
+            explored_systems.add(explored_key)
+        else:
+            already_explored = db.session.query(
+                ExploredSystem.query.filter_by(
+                    user_id=fleet.user_id, x=target_x, y=target_y, z=target_z
+                ).exists()
+            ).scalar()
+        if not already_explored:
+            FleetArrivalService._record_explored_system(
+                user_id=fleet.user_id,
+                x=target_x,
+                y=target_y,
+                z=target_z,
+                fleet_id=fleet.id,
+                planets_discovered=len(discovered_planets),
+                explored_at=now
             )
-            db.session.add(tick_log)
 
-            # Commit all changes to database
-            db.session.commit()
+        # Create tick log entry
+        tick_log = TickLog(
+            fleet_id=fleet.id,
+            user_id=fleet.user_id,
+            event_type='exploration',
+            event_data={
+                'coordinates': f'{target_x}:{target_y}:{target_z}',
+                'planets_discovered': len(discovered_planets)
+            },
+            event_description=f'System {target_x}:{target_y}:{target_z} explored, discovered {len(discovered_planets)} planets'
+        )
+        FleetArrivalService._add_tick_log(tick_log)
 
-            # Set fleet to return to origin
-            fleet.status = 'returning'
-            fleet.mission = 'return'
-            # Calculate return time (same as outbound journey)
-            if fleet.departure_time and fleet.arrival_time:
-                travel_time = fleet.arrival_time - fleet.departure_time
-                fleet.arrival_time = datetime.utcnow() + travel_time
-                fleet.eta = int(travel_time.total_seconds())
-            else:
-                # Fallback: assume 1 hour return time
-                fleet.arrival_time = datetime.utcnow() + timedelta(hours=1)
-                fleet.eta = 3600
+        FleetArrivalService._set_fleet_returning(fleet, now)
+        logger.debug("System %s:%s:%s explored, fleet returning", target_x, target_y, target_z)
 
-            db.session.commit()
-            print(f"SUCCESS: System {target_x}:{target_y}:{target_z} explored, fleet returning")
+    @staticmethod
+    def _set_fleet_returning(fleet, now):
+        """Send a fleet back to its origin, taking as long as the outbound journey"""
+        fleet.status = 'returning'
+        fleet.mission = 'return'
+        # Calculate return time (same as outbound journey)
+        if fleet.departure_time and fleet.arrival_time:
+            travel_time = fleet.arrival_time - fleet.departure_time
+            fleet.arrival_time = now + travel_time
+            fleet.eta = int(travel_time.total_seconds())
+        else:
+            # Fallback: assume 1 hour return time
+            fleet.arrival_time = now + timedelta(hours=1)
+            fleet.eta = 3600
+
+        FleetArrivalService.schedule_arrival(fleet)
 
-        except Exception as e:
-            print(f"ERROR: Failed to process exploration for fleet {fleet.id}: {str(e)}")
-            db.session.rollback()
-            # Ensure fleet is returned to stationed even on error
-            FleetArrivalService._return_fleet_to_stationed(fleet)
+    @staticmethod
+    def _record_explored_system(**values):
+        """Insert an explored system, ignoring it if the user already has it.
+
+        The lookup above cannot see a row another arrival worker inserted but
+        has not committed yet, so the unique constraint settles that race
+        instead of failing the second fleet's mission.
+        """
+        dialect_insert = CONFLICT_IGNORING_INSERTS.get(db.engine.dialect.name)
+        if dialect_insert is None:
+            db.session.add(ExploredSystem(**values))
+            return
+        db.session.execute(
+            dialect_insert(ExploredSystem.__table__).values(**values).on_conflict_do_nothing(
+                index_elements=['user_id', 'x', 'y', 'z']
+            )
+        )
 
     @staticmethod
-    def _process_attack(fleet):
+    def _process_attack(fleet, defenders_by_planet=None, now=None):
         """Handle attack fleet arrival"""
-        print(f"DEBUG: Processing attack for fleet {fleet.id}")
+        logger.debug("Processing attack for fleet %s", fleet.id)
+        now = now or datetime.utcnow()
 
-        try:
-            # Get target planet
-            target_planet = Planet.query.get(fleet.target_planet_id)
-            if not target_planet:
-                print(f"ERROR: Target planet {fleet.target_planet_id} not found")
-                FleetArrivalService._return_fleet_to_stationed(fleet)
-                return
-
-            # Check if planet is still owned by enemy (might have been captured)
-            if target_planet.user_id == fleet.user_id:
-                print(f"WARNING: Target planet {target_planet.id} now owned by attacker")
-                FleetArrivalService._return_fleet_to_stationed(fleet)
-                return
-
-            # Find defending fleet
-            defending_fleet = Fleet.query.filter_by(
-                user_id=target_planet.user_id,
-                start_planet_id=fleet.target_planet_id,
-                status__in=['stationed', 'defending']
-            ).first()
-
-            if defending_fleet:
-                # Fleet vs Fleet combat
-                print(f"DEBUG: Fleet vs Fleet combat: {fleet.id} vs {defending_fleet.id}")
-                from backend.services.combat_engine import CombatEngine
-                combat_result = CombatEngine.calculate_battle(fleet, defending_fleet, target_planet)
-                CombatEngine.process_combat_result(combat_result, fleet, defending_fleet, target_planet)
-            else:
-                # Attack on undefended planet
-                print(f"DEBUG: Attacking undefended planet {target_planet.id}")
-                from backend.services.combat_engine import CombatEngine
-                combat_result = CombatEngine.calculate_planet_attack(fleet, target_planet)
-                CombatEngine.process_planet_attack_result(combat_result, fleet, target_planet)
-
-            print(f"SUCCESS: Attack mission completed for fleet {fleet.id}")
+        # Get target planet (eager-loaded with the fleet)
+        target_planet = fleet.target_planet
+        if not target_planet:
+            logger.error("Target planet %s not found", fleet.target_planet_id)
+            FleetArrivalService._return_fleet_to_stationed(fleet)
+            return
 
-        except Exception as e:
-            print(f"ERROR: Failed to process attack for fleet {fleet.id}: {str(e)}")
-            db.session.rollback()
+        # Check if planet is still owned by enemy (might have been captured)
+        if target_planet.user_id == fleet.user_id:
+            logger.warning("Target planet %s now owned by attacker", target_planet.id)
+            FleetArrivalService._return_fleet_to_stationed(fleet)
+            return
+
+        # Find defending fleet, preferring the batch prefetched by process_arrived_fleets
+        if defenders_by_planet is not None:
+            defending_fleet = defenders_by_planet.get((target_planet.user_id, fleet.target_planet_id))
+        else:
+            # Served by the ix_fleet_user_planet_status index
+            defending_fleet = Fleet.query.filter(
+                Fleet.user_id == target_planet.user_id,
+                Fleet.start_planet_id == fleet.target_planet_id,
+                Fleet.status.in_(['stationed', 'defending'])
+            ).with_for_update().populate_existing().first()
+
+        from backend.services.combat_engine import CombatEngine
+        if defending_fleet:
+            # Fleet vs Fleet combat
+            logger.debug("Fleet vs Fleet combat: %s vs %s", fleet.id, defending_fleet.id)
+            combat_result = CombatEngine.calculate_battle(fleet, defending_fleet, target_planet)
+            CombatEngine.process_combat_result(combat_result, fleet, defending_fleet, target_planet)
+        else:
+            # Attack on undefended planet
+            logger.debug("Attacking undefended planet %s", target_planet.id)
+            combat_result = CombatEngine.calculate_planet_attack(fleet, target_planet)
+            CombatEngine.process_planet_attack_result(combat_result, fleet, target_planet)
+
+        # Surviving ships head home; a fleet that lost every ship is stationed
+        if any(getattr(fleet, ship_type, 0) for ship_type in CombatEngine.SHIP_TYPES):
+            FleetArrivalService._set_fleet_returning(fleet, now)
+        else:
             FleetArrivalService._return_fleet_to_stationed(fleet)
 
+        logger.debug("Attack mission completed for fleet %s", fleet.id)
+
     @staticmethod
-    def _process_recycle(fleet):
+    def _process_recycle(fleet, debris_by_planet=None):
         """Handle recycle fleet arrival"""
-        print(f"DEBUG: Processing recycle for fleet {fleet.id}")
+        logger.debug("Processing recycle for fleet %s", fleet.id)
 
-        try:
-            # Get target planet
-            target_planet = Planet.query.get(fleet.target_planet_id)
-            if not target_planet:
-                print(f"ERROR: Target planet {fleet.target_planet_id} not found")
-                FleetArrivalService._return_fleet_to_stationed(fleet)
-                return
-
-            # Find debris field at planet
-            debris_field = target_planet.debris_fields.first()
-            if not debris_field:
-                print(f"WARNING: No debris field found at planet {target_planet.id}")
-                FleetArrivalService._return_fleet_to_stationed(fleet)
-                return
-
-            # Calculate recycler capacity
-            recycler_capacity = fleet.recycler * 1000  # Assume 1000 cargo capacity per recycler
-
-            # Collect resources
-            collected_metal = min(debris_field.metal, recycler_capacity // 2)
-            collected_crystal = min(debris_field.crystal, recycler_capacity // 2)
-            collected_deuterium = min(debris_field.deuterium, recycler_capacity // 2)
-
-            # Update debris field
-            debris_field.metal -= collected_metal
-            debris_field.crystal -= collected_crystal
-            debris_field.deuterium -= collected_deuterium
-
-            # Add resources to fleet (simplified - would need cargo tracking)
-            # For now, just log the collection
-            print(f"SUCCESS: Collected {collected_metal} metal, {collected_crystal} crystal, {collected_deuterium} deuterium")
-
-            # Create tick log entry
-            tick_log = TickLog(
-                planet_id=target_planet.id,
-                fleet_id=fleet.id,
-                event_type='recycle',
-                event_description=f'Fleet {fleet.id} collected {collected_metal}M {collected_crystal}C {collected_deuterium}D from debris field'
-            )
-            db.session.add(tick_log)
+        # Get target planet (eager-loaded with the fleet)
+        target_planet = fleet.target_planet
+        if not target_planet:
+            logger.error("Target planet %s not found", fleet.target_planet_id)
+            FleetArrivalService._return_fleet_to_stationed(fleet)
+            return
+
+        # Find debris field at planet, preferring the batch locked by _prefetch_debris_fields
+        if debris_by_planet is None:
+            debris_by_planet = FleetArrivalService._prefetch_debris_fields([fleet])
+        debris_fields = debris_by_planet[target_planet.id]
+        debris_field = debris_fields[0] if debris_fields else None
+        if not debris_field:
+            logger.warning("No debris field found at planet %s", target_planet.id)
+            FleetArrivalService._return_fleet_to_stationed(fleet)
+            return
 
-            # Clean up empty debris field
-            if debris_field.metal <= 0 and debris_field.crystal <= 0 and debris_field.deuterium <= 0:
-                db.session.delete(debris_field)
+        # Calculate recycler capacity
+        recycler_capacity = fleet.recycler * 1000  # Assume 1000 cargo capacity per recycler
 
-            FleetArrivalService._return_fleet_to_stationed(fleet)
-            db.session.commit()
+        # Collect resources, up to half the capacity of each
+        per_resource_capacity = recycler_capacity // 2
+        metal, crystal, deuterium = debris_field.metal, debris_field.crystal, debris_field.deuterium
+        collected_metal = min(metal, per_resource_capacity)
+        collected_crystal = min(crystal, per_resource_capacity)
+        collected_deuterium = min(deuterium, per_resource_capacity)
 
-            print(f"SUCCESS: Recycle mission completed for fleet {fleet.id}")
+        # Update debris field
+        debris_field.metal = metal = metal - collected_metal
+        debris_field.crystal = crystal = crystal - collected_crystal
+        debris_field.deuterium = deuterium = deuterium - collected_deuterium
 
-        except Exception as e:
-            print(f"ERROR: Failed to process recycle for fleet {fleet.id}: {str(e)}")
-            db.session.rollback()
-            FleetArrivalService._return_fleet_to_stationed(fleet)
+        # Add resources to fleet (simplified - would need cargo tracking)
+        # For now, just log the collection
+        logger.debug("Collected %s metal, %s crystal, %s deuterium", collected_metal, collected_crystal, collected_deuterium)
+
+        # Create tick log entry
+        tick_log = TickLog(
+            planet_id=target_planet.id,
+            fleet_id=fleet.id,
+            event_type='recycle',
+            event_description=f'Fleet {fleet.id} collected {collected_metal}M {collected_crystal}C {collected_deuterium}D from debris field'
+        )
+        FleetArrivalService._add_tick_log(tick_log)
+
+        # Clean up empty debris field
+        if metal <= 0 and crystal <= 0 and deuterium <= 0:
+            # Drop it from the batch's list too, so later recyclers in the batch don't see it
+            debris_fields.remove(debris_field)
+            db.session.delete(debris_field)
+
+        FleetArrivalService._return_fleet_to_stationed(fleet)
+
+        logger.debug("Recycle mission completed for fleet %s", fleet.id)
+
+    @staticmethod
+    def _add_tick_log(tick_log):
+        """Queue a tick log with the current arrival batch, or add it to the session directly"""
+        pending_tick_logs = _pending_tick_logs.get()
+        if pending_tick_logs is None:
+            db.session.add(tick_log)
+        else:
+            pending_tick_logs.append(tick_log)
 
     @staticmethod
     def _return_fleet_to_stationed(fleet):
         """Return a fleet to stationed status"""
-        print(f"DEBUG: Returning fleet {fleet.id} to stationed status")
+        logger.debug("Returning fleet %s to stationed status", fleet.id)
         fleet.status = 'stationed'
         fleet.mission = 'stationed'
         fleet.arrival_time = None
         fleet.eta = 0
+
+    @staticmethod
+    def _return_fleets_to_stationed(fleets):
+        """Station a batch of fleets with one UPDATE instead of per-fleet unit-of-work writes"""
+        fleet_ids = [fleet.id for fleet in fleets]
+        logger.debug("Returning fleets %s to stationed status", fleet_ids)
+        # The default synchronize_session also refreshes the loaded fleet objects
+        db.session.execute(
+            db.update(Fleet)
+            .where(Fleet.id.in_(fleet_ids))
+            .values(status='stationed', mission='stationed', arrival_time=None, eta=0)
+        )
+
+
+# Arrival handler per mission, called as handler(fleet, prefetched, now) where
+# prefetched is that mission's batch lookup (or None) and now the batch's clock
+# reading. Add other mission types here as needed
+MISSION_HANDLERS = {
+    'colonize': lambda fleet, prefetched, now: FleetArrivalService._process_colonization(fleet, prefetched, now),
+    'attack': lambda fleet, prefetched, now: FleetArrivalService._process_attack(fleet, prefetched, now),
+    'return': lambda fleet, prefetched, now: FleetArrivalService._process_return(fleet),
+    'explore': lambda fleet, prefetched, now: FleetArrivalService._process_exploration(fleet, prefetched, now),
+    'recycle': lambda fleet, prefetched, now: FleetArrivalService._process_recycle(fleet, prefetched)
+}
+
+# Batch lookups run once per mission group before its fleets are processed
+MISSION_PREFETCHERS = {
+    'colonize': lambda fleets: FleetArrivalService._prefetch_colonization_targets(fleets),
+    'attack': lambda fleets: FleetArrivalService._prefetch_defending_fleets(fleets),
+    'explore': lambda fleets: FleetArrivalService._prefetch_explored_systems(fleets),
+    'recycle': lambda fleets: FleetArrivalService._prefetch_debris_fields(fleets)
+}
+
+# Missions whose arrival touches nothing but the fleet row itself; their whole
+# group is handled in one statement instead of fleet by fleet
+MISSION_BATCH_HANDLERS = {
+    'return': lambda fleets: FleetArrivalService._return_fleets_to_stationed(fleets)
+}
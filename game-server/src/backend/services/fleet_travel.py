@@ -11,104 +11,137 @@ This service provides comprehensive travel information for fleets including:
 Used by both backend API responses and frontend displays.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
+import logging
 import math
-from backend.models import Planet, Fleet
+from backend.models import Planet, Fleet, Coordinates, COORDINATE_STATUS_KINDS, parse_fleet_status
 from backend.config import get_ship_speed, calculate_fleet_speed
 
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Unit of the integer progress fractions; timedelta // MICROSECOND is exact
+MICROSECOND = timedelta(microseconds=1)
+
+# Dividing a timedelta by HOUR gives float hours without a total_seconds() detour
+HOUR = timedelta(hours=1)
+
+# Statuses with no journey to report; most of a user's fleets sit in one of these
+TERMINAL_STATUSES = frozenset({'stationed', None, ''})
+
+# Plain in-flight statuses; coordinate-based missions are recognised by their kind
+TRAVEL_STATUSES = frozenset({'traveling', 'returning'})
+
+
+def _format_position(x, y, z):
+    """Format a position as "x:y:z" integers"""
+    if isinstance(x, (int, float)):
+        return f"{int(x)}:{int(y)}:{int(z)}"
+    # Fallback for cases where coordinates might not be numeric (e.g., test mocks)
+    return f"{x}:{y}:{z}"
+
+
+# Only trip endpoints go through the cache: fleets of a batch share few planets,
+# while interpolated current positions are almost never repeated
+_format_coordinates = lru_cache(maxsize=4096)(_format_position)
+
 
 class FleetTravelService:
     """Service for calculating fleet travel information"""
 
     @staticmethod
-    def calculate_travel_info(fleet):
+    def batch_calculate_travel_info(fleets, planets_by_id=None):
+        """
+        Calculate travel information for a list of fleets
+
+        Loads every start and target planet in one query and reads the clock
+        once, instead of two planet lookups and a clock read per fleet.
+
+        Args:
+            fleets: List of Fleet model instances
+            planets_by_id: Optional dict of planets the caller already loaded;
+                only the missing ones are queried
+
+        Returns:
+            list: calculate_travel_info() result for each fleet, in order
+        """
+        planets_by_id = FleetTravelService._prefetch_planets(fleets, planets_by_id)
+        now = datetime.utcnow()
+        return [FleetTravelService.calculate_travel_info(fleet, planets_by_id, now) for fleet in fleets]
+
+    @staticmethod
+    def calculate_travel_info(fleet, planets_by_id=None, now=None):
         """
         Calculate comprehensive travel information for a fleet
 
         Args:
             fleet: Fleet model instance
+            planets_by_id: Optional dict of preloaded planets keyed by id
+            now: Optional current time, shared by a batch of fleets
 
         Returns:
             dict: Travel information including distance, duration, progress, position
         """
+        # Stationed fleets are the common case; skip them before parsing the status
+        if not fleet or fleet.status in TERMINAL_STATUSES:
+            return None
+
         # Allow traveling, returning, and coordinate-based missions (colonizing, exploring)
-        valid_statuses = ['traveling', 'returning']
-        is_coordinate_based = fleet.status and (fleet.status.startswith('colonizing:') or fleet.status.startswith('exploring:'))
+        status = parse_fleet_status(fleet.status)
+        is_coordinate_based = status.kind in COORDINATE_STATUS_KINDS
 
-        if not fleet or (fleet.status not in valid_statuses and not is_coordinate_based):
+        if fleet.status not in TRAVEL_STATUSES and not is_coordinate_based:
             return None
 
         # For exploration fleets, ensure they have arrival times set
-        if is_coordinate_based and fleet.status.startswith('exploring:') and not fleet.arrival_time:
-            print(f"WARNING: Exploration fleet {fleet.id} has no arrival time set")
+        if is_coordinate_based and status.kind == 'exploring' and not fleet.arrival_time:
+            logger.warning("Exploration fleet %s has no arrival time set", fleet.id)
             return None
 
         # Get start and target planets
-        start_planet = Planet.query.get(fleet.start_planet_id)
+        start_planet = FleetTravelService._get_planet(fleet.start_planet_id, planets_by_id)
         if not start_planet:
             return None
 
-        # For coordinate-based missions (colonization, exploration), create target planet
-        if fleet.status and (fleet.status.startswith('colonizing:') or fleet.status.startswith('exploring:')):
-            # Extract coordinates from status
-            coords_part = fleet.status.split(':')[1:]
-            if len(coords_part) == 3:
-                try:
-                    target_x, target_y, target_z = map(int, coords_part)
-                    target_planet = Planet(
-                        name='Target Location',
-                        x=target_x,
-                        y=target_y,
-                        z=target_z
-                    )
-                except ValueError:
-                    return None
-            else:
+        # For coordinate-based missions (colonization, exploration), use the bare target point
+        if is_coordinate_based:
+            # Coordinates from the status; only .x/.y/.z are read below
+            target_planet = status.coordinates
+            if target_planet is None:
                 return None
         else:
             # Use target planet from database
-            target_planet = Planet.query.get(fleet.target_planet_id)
+            target_planet = FleetTravelService._get_planet(fleet.target_planet_id, planets_by_id)
             if not target_planet:
                 return None
 
+        # Read each planet's coordinates once instead of through the ORM attributes every time
+        start = Coordinates(start_planet.x, start_planet.y, start_planet.z)
+        target = Coordinates(target_planet.x, target_planet.y, target_planet.z)
+
         # Calculate distance
-        distance = FleetTravelService.calculate_distance(start_planet, target_planet)
+        distance = FleetTravelService.calculate_distance_xyz(*start, *target)
 
         # Calculate fleet speed (based on slowest ship)
         fleet_speed = FleetTravelService.calculate_fleet_speed(fleet)
 
-        # Calculate theoretical duration (for display purposes)
-        theoretical_duration_hours = distance / fleet_speed if fleet_speed > 0 else 0
-
         # Use actual fleet travel time (which includes minimum travel time)
-        if fleet.departure_time and fleet.arrival_time:
-            total_duration = (fleet.arrival_time - fleet.departure_time).total_seconds() / 3600
-            elapsed_time = (datetime.utcnow() - fleet.departure_time).total_seconds() / 3600
-            progress_percentage = min(100, max(0, (elapsed_time / total_duration) * 100)) if total_duration > 0 else 0
-
-            # Calculate current position (linear interpolation)
-            if progress_percentage < 100:
-                current_x = start_planet.x + (target_planet.x - start_planet.x) * (progress_percentage / 100)
-                current_y = start_planet.y + (target_planet.y - start_planet.y) * (progress_percentage / 100)
-                current_z = start_planet.z + (target_planet.z - start_planet.z) * (progress_percentage / 100)
-            else:
-                current_x, current_y, current_z = target_planet.x, target_planet.y, target_planet.z
+        progress = FleetTravelService._progress_fraction(fleet, now)
+        if progress is not None:
+            total_duration = (fleet.arrival_time - fleet.departure_time) / HOUR
+            progress_percentage = progress[0] * 100 / progress[1]
+            current = FleetTravelService._interpolate_position(start, target, progress)
         else:
             # Fallback to theoretical calculation if times not set
-            total_duration = theoretical_duration_hours
+            total_duration = distance / fleet_speed if fleet_speed > 0 else 0
             progress_percentage = 0
-            current_x, current_y, current_z = start_planet.x, start_planet.y, start_planet.z
+            current = start
 
         # Format coordinates as integers (no decimals)
-        try:
-            current_pos = f"{int(float(current_x))}:{int(float(current_y))}:{int(float(current_z))}"
-            start_coords = f"{int(float(start_planet.x))}:{int(float(start_planet.y))}:{int(float(start_planet.z))}"
-            target_coords = f"{int(float(target_planet.x))}:{int(float(target_planet.y))}:{int(float(target_planet.z))}"
-        except (TypeError, ValueError):
-            # Fallback for cases where coordinates might not be numeric (e.g., test mocks)
-            current_pos = f"{current_x}:{current_y}:{current_z}"
-            start_coords = f"{start_planet.x}:{start_planet.y}:{start_planet.z}"
-            target_coords = f"{target_planet.x}:{target_planet.y}:{target_planet.z}"
+        current_pos = _format_position(*current)
+        start_coords = _format_coordinates(*start)
+        target_coords = _format_coordinates(*target)
 
         return {
             'distance': round(distance, 2),
@@ -121,6 +154,64 @@ class FleetTravelService:
             'is_coordinate_based': ':' in str(fleet.status)
         }
 
+    @staticmethod
+    def _progress_fraction(fleet, now=None):
+        """
+        Trip progress as an exact (elapsed, total) pair of microseconds
+
+        elapsed is clamped to [0, total]; a zero-length trip is (0, 1).
+        Returns None if the fleet's times are not set.
+        """
+        if not fleet.departure_time or not fleet.arrival_time:
+            return None
+
+        total = (fleet.arrival_time - fleet.departure_time) // MICROSECOND
+        if total <= 0:
+            return 0, 1
+        elapsed = ((now or datetime.utcnow()) - fleet.departure_time) // MICROSECOND
+        return min(total, max(0, elapsed)), total
+
+    @staticmethod
+    def _interpolate_position(start, target, progress):
+        """
+        Linearly interpolate an (x, y, z) position between start and target
+
+        progress is an (elapsed, total) pair from _progress_fraction; integer
+        coordinates stay integers, so the reported position is exact.
+        """
+        elapsed, total = progress
+        if elapsed >= total:
+            return target.x, target.y, target.z
+        return (
+            start.x + (target.x - start.x) * elapsed // total,
+            start.y + (target.y - start.y) * elapsed // total,
+            start.z + (target.z - start.z) * elapsed // total
+        )
+
+    @staticmethod
+    def _prefetch_planets(fleets, planets_by_id=None):
+        """Load the start and target planets of all fleets in one query, keyed by id"""
+        planets_by_id = dict(planets_by_id or {})
+        missing_ids = set()
+        for fleet in fleets:
+            missing_ids.add(fleet.start_planet_id)
+            missing_ids.add(fleet.target_planet_id)
+        missing_ids.discard(None)
+        missing_ids.difference_update(planets_by_id)
+
+        if missing_ids:
+            planets_by_id.update(
+                (planet.id, planet) for planet in Planet.query.filter(Planet.id.in_(missing_ids))
+            )
+        return planets_by_id
+
+    @staticmethod
+    def _get_planet(planet_id, planets_by_id=None):
+        """Get a planet from the preloaded batch if there is one, else from the database"""
+        if planets_by_id is not None:
+            return planets_by_id.get(planet_id)
+        return Planet.query.get(planet_id)
+
     @staticmethod
     def calculate_distance(planet1, planet2):
         """
@@ -135,15 +226,48 @@ class FleetTravelService:
         if not planet1 or not planet2:
             return 0
 
+        return FleetTravelService.calculate_distance_xyz(
+            planet1.x, planet1.y, planet1.z, planet2.x, planet2.y, planet2.z
+        )
+
+    @staticmethod
+    def calculate_distance_xyz(ax, ay, az, bx, by, bz):
+        """
+        Calculate distance between two points given as plain coordinates
+
+        Args:
+            ax, ay, az: First point
+            bx, by, bz: Second point
+
+        Returns:
+            float: Distance in coordinate units
+        """
+        # Euclidean distance in 3D space, with a minimum of 1 to avoid
+        # division by zero; the square root is only taken when it matters
+        dx = ax - bx
+        dy = ay - by
+        dz = az - bz
+        distance_sq = dx * dx + dy * dy + dz * dz
+        return math.sqrt(distance_sq) if distance_sq > 1 else 1
+
+    @staticmethod
+    def calculate_distance_sq(planet1, planet2):
+        """
+        Calculate squared distance between two planets
+
+        Cheaper than calculate_distance for comparisons: check it against the
+        squared threshold instead of taking a square root.
+
+        Args:
+            planet1, planet2: Planet model instances (or anything with x, y, z)
+
+        Returns:
+            int: Squared distance in coordinate units
+        """
         dx = planet1.x - planet2.x
         dy = planet1.y - planet2.y
         dz = planet1.z - planet2.z
-
-        # Euclidean distance in 3D space
-        distance = math.sqrt(dx**2 + dy**2 + dz**2)
-
-        # Minimum distance of 1 to avoid division by zero
-        return max(distance, 1)
+        return dx * dx + dy * dy + dz * dz
 
     @staticmethod
     def calculate_fleet_speed(fleet):
@@ -173,9 +297,8 @@ class FleetTravelService:
         if seconds <= 0:
             return 'Arrived'
 
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
+        hours, remainder = divmod(int(seconds), 3600)
+        minutes, secs = divmod(remainder, 60)
 
         if hours > 0:
             return f"{hours:02d}:{minutes:02d}:{secs:02d}"
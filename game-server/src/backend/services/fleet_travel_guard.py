@@ -15,7 +15,7 @@ Key Features:
 
 from datetime import datetime, timedelta
 from backend.database import db
-from backend.models import Fleet, Planet, User, TickLog
+from backend.models import Fleet, Planet, User, TickLog, IN_FLIGHT_STATUS_KINDS, COORDINATE_STATUS_KINDS, pack_coordinates, parse_fleet_status
 import logging
 
 # Set up logger
@@ -27,7 +27,7 @@ class FleetTravelGuard:
     @staticmethod
     def validate_and_correct_fleet_states():
         """Main validation function called every tick"""
-        logger.info("Running fleet travel guard validation")
+        logger.debug("Running fleet travel guard validation")
 
         corrections_made = 0
         current_time = datetime.utcnow()
@@ -36,31 +36,56 @@ class FleetTravelGuard:
         problematic_fleets = Fleet.query.filter(
             # Fleets that have arrived but wrong status
             ((Fleet.arrival_time <= current_time) &
-             (Fleet.status.in_(['traveling', 'returning']) |
-              Fleet.status.like('exploring:%') |
-              Fleet.status.like('colonizing:%'))) |
+             Fleet.status_kind.in_(IN_FLIGHT_STATUS_KINDS)) |
             # Fleets with invalid status combinations
             ((Fleet.status == 'stationed') & (Fleet.arrival_time.isnot(None))) |
             # Fleets with negative ETA
             (Fleet.eta < 0)
         ).all()
 
-        logger.info(f"Found {len(problematic_fleets)} fleets requiring validation")
+        logger.debug("Found %s fleets requiring validation", len(problematic_fleets))
 
+        occupied_coordinates = FleetTravelGuard._prefetch_occupied_coordinates(problematic_fleets, current_time)
         for fleet in problematic_fleets:
-            if FleetTravelGuard._correct_fleet_state(fleet, current_time):
+            if FleetTravelGuard._correct_fleet_state(fleet, current_time, occupied_coordinates):
                 corrections_made += 1
 
         if corrections_made > 0:
             db.session.commit()
-            logger.info(f"Fleet travel guard corrected {corrections_made} fleets")
+            logger.info("Fleet travel guard corrected %s fleets", corrections_made)
 
         return corrections_made
 
     @staticmethod
-    def _correct_fleet_state(fleet, current_time):
-        """Correct a single fleet's state based on current conditions"""
+    def _prefetch_occupied_coordinates(fleets, current_time):
+        """Load which arrived colonizers' targets are owned already, in one query"""
+        packed_coordinates = set()
+        for fleet in fleets:
+            if not fleet.arrival_time or fleet.arrival_time > current_time:
+                continue
+            status = parse_fleet_status(fleet.status)
+            if status.kind == 'colonizing' and status.coordinates is not None:
+                packed_coordinates.add(pack_coordinates(*status.coordinates))
+
+        if not packed_coordinates:
+            return set()
+
+        # Served by the coord_packed index, like the arrival service's colonization prefetch
+        occupied = db.session.query(Planet.x, Planet.y, Planet.z).filter(
+            Planet.coord_packed.in_(packed_coordinates),
+            Planet.user_id.isnot(None)
+        )
+        return {tuple(row) for row in occupied}
+
+    @staticmethod
+    def _correct_fleet_state(fleet, current_time, occupied_coordinates=None):
+        """Correct a single fleet's state based on current conditions.
+
+        occupied_coordinates is the set built by _prefetch_occupied_coordinates;
+        without it, colonization targets are looked up one by one.
+        """
         corrected = False
+        status = parse_fleet_status(fleet.status)
 
         # Case 1: Fleet has arrived but still shows traveling
         if (fleet.arrival_time and fleet.arrival_time <= current_time and
@@ -73,7 +98,7 @@ class FleetTravelGuard:
                 fleet.target_planet_id = fleet.start_planet_id
                 fleet.arrival_time = None
                 fleet.eta = 0
-                logger.info(f"Corrected returning fleet {fleet.id} to stationed at planet {fleet.start_planet_id}")
+                logger.info("Corrected returning fleet %s to stationed at planet %s", fleet.id, fleet.start_planet_id)
 
             elif fleet.status == 'traveling':
                 # Traveling fleet has arrived at destination
@@ -81,13 +106,13 @@ class FleetTravelGuard:
                 fleet.start_planet_id = fleet.target_planet_id  # Update home base
                 fleet.arrival_time = None
                 fleet.eta = 0
-                logger.info(f"Corrected traveling fleet {fleet.id} to stationed at planet {fleet.target_planet_id}")
+                logger.info("Corrected traveling fleet %s to stationed at planet %s", fleet.id, fleet.target_planet_id)
 
             corrected = True
 
         # Case 2: Exploration fleet has arrived at target
         elif (fleet.arrival_time and fleet.arrival_time <= current_time and
-              fleet.status.startswith('exploring:')):
+              status.kind == 'exploring'):
 
             # Set fleet to return to origin
             fleet.status = 'returning'
@@ -98,72 +123,69 @@ class FleetTravelGuard:
                 travel_time = fleet.arrival_time - fleet.departure_time
                 fleet.arrival_time = current_time + travel_time
                 fleet.eta = int(travel_time.total_seconds())
-                logger.info(f"Exploration fleet {fleet.id} returning home, ETA: {fleet.eta} seconds")
+                logger.info("Exploration fleet %s returning home, ETA: %s seconds", fleet.id, fleet.eta)
             else:
                 # Fallback: 1 hour return
                 fleet.arrival_time = current_time + timedelta(hours=1)
                 fleet.eta = 3600
-                logger.warning(f"Exploration fleet {fleet.id} using fallback return time (1 hour)")
+                logger.warning("Exploration fleet %s using fallback return time (1 hour)", fleet.id)
 
             corrected = True
 
         # Case 3: Colonization fleet has arrived
         elif (fleet.arrival_time and fleet.arrival_time <= current_time and
-              fleet.status.startswith('colonizing:')):
+              status.kind == 'colonizing'):
 
-            # Check if target coordinates are still available
-            coords = fleet.status.split(':')[1:]
-            if len(coords) >= 3:
-                try:
-                    target_x, target_y, target_z = map(int, coords)
+            if status.coordinates is None:
+                logger.error("Invalid coordinates in fleet %s status: %s", fleet.id, fleet.status)
+                # Return fleet to stationed to prevent infinite loops
+                FleetTravelGuard._return_fleet_to_stationed(fleet)
+            else:
+                # Check if target coordinates are still available
+                target_x, target_y, target_z = status.coordinates
+                if occupied_coordinates is not None:
+                    occupied = status.coordinates in occupied_coordinates
+                else:
                     existing_planet = Planet.query.filter_by(
                         x=target_x, y=target_y, z=target_z
                     ).first()
+                    occupied = bool(existing_planet and existing_planet.user_id)
+
+                if occupied:
+                    # Coordinates occupied, return fleet
+                    fleet.status = 'returning'
+                    fleet.mission = 'return'
+                    if fleet.departure_time and fleet.arrival_time:
+                        travel_time = fleet.arrival_time - fleet.departure_time
+                        fleet.arrival_time = current_time + travel_time
+                        fleet.eta = int(travel_time.total_seconds())
+                    logger.warning("Colonization failed for fleet %s, coordinates %s:%s:%s occupied", fleet.id, target_x, target_y, target_z)
+                else:
+                    # Coordinates available, set to stationed for processing
+                    fleet.status = 'stationed'
+                    fleet.mission = 'stationed'
+                    fleet.arrival_time = None
+                    fleet.eta = 0
+                    logger.info("Colonization fleet %s ready for processing at %s:%s:%s", fleet.id, target_x, target_y, target_z)
 
-                    if existing_planet and existing_planet.user_id:
-                        # Coordinates occupied, return fleet
-                        fleet.status = 'returning'
-                        fleet.mission = 'return'
-                        if fleet.departure_time and fleet.arrival_time:
-                            travel_time = fleet.arrival_time - fleet.departure_time
-                            fleet.arrival_time = current_time + travel_time
-                            fleet.eta = int(travel_time.total_seconds())
-                        logger.warning(f"Colonization failed for fleet {fleet.id}, coordinates {target_x}:{target_y}:{target_z} occupied")
-                    else:
-                        # Coordinates available, set to stationed for processing
-                        fleet.status = 'stationed'
-                        fleet.mission = 'stationed'
-                        fleet.arrival_time = None
-                        fleet.eta = 0
-                        logger.info(f"Colonization fleet {fleet.id} ready for processing at {target_x}:{target_y}:{target_z}")
-
-                    corrected = True
-
-                except ValueError as e:
-                    logger.error(f"Invalid coordinates in fleet {fleet.id} status: {fleet.status} - {e}")
-                    # Return fleet to stationed to prevent infinite loops
-                    FleetTravelGuard._return_fleet_to_stationed(fleet)
-                    corrected = True
+            corrected = True
 
         # Case 4: Stationed fleet with arrival time (shouldn't happen)
         elif fleet.status == 'stationed' and fleet.arrival_time:
             fleet.arrival_time = None
             fleet.eta = 0
-            logger.warning(f"Cleared arrival time for stationed fleet {fleet.id}")
+            logger.warning("Cleared arrival time for stationed fleet %s", fleet.id)
             corrected = True
 
         # Case 5: Negative ETA (shouldn't happen)
         elif fleet.eta < 0:
             fleet.eta = 0
-            logger.warning(f"Corrected negative ETA for fleet {fleet.id}")
+            logger.warning("Corrected negative ETA for fleet %s", fleet.id)
             corrected = True
 
         # Case 6: Fleet with invalid status format
-        elif ':' in fleet.status and not (
-            fleet.status.startswith(('exploring:', 'colonizing:')) or
-            fleet.status in ['stationed', 'traveling', 'returning']
-        ):
-            logger.error(f"Fleet {fleet.id} has invalid status: {fleet.status}")
+        elif ':' in fleet.status and status.kind not in COORDINATE_STATUS_KINDS:
+            logger.error("Fleet %s has invalid status: %s", fleet.id, fleet.status)
             FleetTravelGuard._return_fleet_to_stationed(fleet)
             corrected = True
 
@@ -172,7 +194,7 @@ class FleetTravelGuard:
     @staticmethod
     def _return_fleet_to_stationed(fleet):
         """Safely return a fleet to stationed status"""
-        logger.info(f"Returning fleet {fleet.id} to stationed status")
+        logger.info("Returning fleet %s to stationed status", fleet.id)
         fleet.status = 'stationed'
         fleet.mission = 'stationed'
         fleet.arrival_time = None
@@ -183,55 +205,48 @@ class FleetTravelGuard:
         """Administrative function to force cleanup stuck fleets"""
         logger.info("Running forced cleanup of stuck fleets")
 
-        query = Fleet.query
+        # Only clean fleets that have been stuck for more than max_age_hours
+        cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
+        conditions = [Fleet.arrival_time <= cutoff_time, Fleet.status.notin_(['stationed'])]
 
         # Filter by user if specified
         if user_id:
-            query = query.filter_by(user_id=user_id)
-
-        # Only clean fleets that have been stuck for more than max_age_hours
-        cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
-        stuck_fleets = query.filter(
-            Fleet.arrival_time <= cutoff_time,
-            Fleet.status.notin_(['stationed'])
-        ).all()
+            conditions.append(Fleet.user_id == user_id)
 
-        cleaned_count = 0
-        for fleet in stuck_fleets:
-            logger.warning(f"Force cleaning stuck fleet {fleet.id} (status: {fleet.status}, ETA: {fleet.eta})")
-            FleetTravelGuard._return_fleet_to_stationed(fleet)
-            cleaned_count += 1
+        # Station every stuck fleet in one UPDATE rather than loading them all
+        result = db.session.execute(
+            db.update(Fleet)
+            .where(*conditions)
+            .values(status='stationed', mission='stationed', arrival_time=None, eta=0)
+        )
+        cleaned_count = result.rowcount
 
         if cleaned_count > 0:
             db.session.commit()
-            logger.info(f"Force cleaned {cleaned_count} stuck fleets")
+            logger.info("Force cleaned %s stuck fleets", cleaned_count)
 
         return cleaned_count
 
     @staticmethod
     def get_fleet_health_report():
         """Generate comprehensive fleet health report"""
-        total_fleets = Fleet.query.count()
-
-        # Count various problematic states
-        stuck_fleets = Fleet.query.filter(
-            Fleet.arrival_time <= datetime.utcnow(),
-            Fleet.status.notin_(['stationed'])
-        ).count()
-
-        invalid_states = Fleet.query.filter(
-            (Fleet.status == 'stationed') & (Fleet.arrival_time.isnot(None)) |
-            (Fleet.eta < 0)
-        ).count()
-
-        traveling_fleets = Fleet.query.filter(
-            Fleet.status.in_(['traveling', 'returning'])
-        ).count()
-
-        exploration_fleets = Fleet.query.filter(
-            Fleet.status.like('exploring:%') |
-            Fleet.status.like('colonizing:%')
-        ).count()
+        now = datetime.utcnow()
+
+        def count_where(condition):
+            # COUNT skips the NULLs the CASE yields for non-matching rows
+            return db.func.count(db.case((condition, 1)))
+
+        # All counts in one pass over the fleets table instead of a query each
+        counts = db.session.query(
+            db.func.count(Fleet.id),
+            # Fleets past their arrival time that were never settled
+            count_where((Fleet.arrival_time <= now) & Fleet.status.notin_(['stationed'])),
+            # Stationed fleets with an arrival time, or a negative ETA
+            count_where(((Fleet.status == 'stationed') & Fleet.arrival_time.isnot(None)) | (Fleet.eta < 0)),
+            count_where(Fleet.status.in_(['traveling', 'returning'])),
+            count_where(Fleet.status_kind.in_(COORDINATE_STATUS_KINDS))
+        ).one()
+        total_fleets, stuck_fleets, invalid_states, traveling_fleets, exploration_fleets = counts
 
         # Calculate health percentage
         healthy_fleets = total_fleets - stuck_fleets - invalid_states
@@ -245,7 +260,7 @@ class FleetTravelGuard:
             'traveling_fleets': traveling_fleets,
             'exploration_fleets': exploration_fleets,
             'health_percentage': round(health_percentage, 2),
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': now.isoformat()
         }
 
     @staticmethod
@@ -257,28 +272,17 @@ class FleetTravelGuard:
 
         # Check exploration fleets have valid coordinates
         exploration_fleets = Fleet.query.filter(
-            Fleet.status.like('exploring:%') |
-            Fleet.status.like('colonizing:%')
+            Fleet.status_kind.in_(COORDINATE_STATUS_KINDS)
         ).all()
 
         for fleet in exploration_fleets:
-            coords = fleet.status.split(':')[1:]
-            if len(coords) < 3:
-                logger.error(f"Fleet {fleet.id} has malformed coordinates in status: {fleet.status}")
-                FleetTravelGuard._return_fleet_to_stationed(fleet)
-                issues_found += 1
-                continue
-
-            try:
-                x, y, z = map(int, coords)
-                # Additional validation could be added here
-            except ValueError:
-                logger.error(f"Fleet {fleet.id} has invalid coordinates: {coords}")
+            if parse_fleet_status(fleet.status).coordinates is None:
+                logger.error("Fleet %s has malformed coordinates in status: %s", fleet.id, fleet.status)
                 FleetTravelGuard._return_fleet_to_stationed(fleet)
                 issues_found += 1
 
         if issues_found > 0:
             db.session.commit()
-            logger.info(f"Fixed {issues_found} fleets with coordinate issues")
+            logger.info("Fixed %s fleets with coordinate issues", issues_found)
 
         return issues_found
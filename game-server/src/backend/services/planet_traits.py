@@ -107,13 +107,14 @@ class PlanetTraitService:
         traits = []
         for trait_key in selected_trait_keys:
             trait_data = PlanetTraitService.TRAIT_TYPES[trait_key]
+            first_effect, first_value = TRAIT_FIRST_EFFECT[trait_key]
 
             # Create trait record
             trait = PlanetTrait(
                 planet_id=planet.id,
-                trait_type=list(trait_data['effects'].keys())[0],
+                trait_type=first_effect,
                 trait_name=trait_data['name'],
-                bonus_value=list(trait_data['effects'].values())[0],
+                bonus_value=first_value,
                 description=trait_data['description']
             )
             traits.append(trait)
@@ -123,57 +124,54 @@ class PlanetTraitService:
 
         return traits
 
+    @staticmethod
+    def generate_for_planets(planets):
+        """
+        Generate random traits for many planets with a single INSERT
+
+        Args:
+            planets: Flushed Planet model instances
+
+        Returns:
+            List of inserted trait row dictionaries
+        """
+        rows = []
+        for planet in planets:
+            for trait_key in PlanetTraitService._select_traits(PlanetTraitService._determine_trait_count()):
+                trait_data = PlanetTraitService.TRAIT_TYPES[trait_key]
+                first_effect, first_value = TRAIT_FIRST_EFFECT[trait_key]
+                rows.append({
+                    'planet_id': planet.id,
+                    'trait_type': first_effect,
+                    'trait_name': trait_data['name'],
+                    'bonus_value': first_value,
+                    'description': trait_data['description']
+                })
+
+                # Apply trait effects to planet
+                PlanetTraitService.apply_trait_effects(planet, trait_data['effects'])
+
+        if rows:
+            db.session.execute(PlanetTrait.__table__.insert(), rows)
+
+        return rows
+
     @staticmethod
     def _determine_trait_count():
         """Determine how many traits a planet should have"""
         # 40% chance for 1 trait, 45% for 2 traits, 15% for 3 traits
-        rand = random.random()
-        if rand < 0.40:
-            return 1
-        elif rand < 0.85:
-            return 2
-        else:
-            return 3
+        return random.choices(TRAIT_COUNTS, cum_weights=TRAIT_COUNT_CUMULATIVE_WEIGHTS)[0]
 
     @staticmethod
     def _select_traits(num_traits):
         """Select traits based on rarity weights"""
-        # Rarity weights
-        rarity_weights = {
-            'common': 0.5,
-            'uncommon': 0.3,
-            'rare': 0.2
-        }
-
-        # Group traits by rarity
-        traits_by_rarity = {}
-        for trait_key, trait_data in PlanetTraitService.TRAIT_TYPES.items():
-            rarity = trait_data['rarity']
-            if rarity not in traits_by_rarity:
-                traits_by_rarity[rarity] = []
-            traits_by_rarity[rarity].append(trait_key)
-
         selected_traits = []
-        available_traits = list(PlanetTraitService.TRAIT_TYPES.keys())
-
-        for _ in range(num_traits):
-            if not available_traits:
-                break
-
-            # Select based on rarity weights
-            rand = random.random()
-            cumulative_weight = 0
-
-            for rarity, weight in rarity_weights.items():
-                cumulative_weight += weight
-                if rand <= cumulative_weight:
-                    rarity_traits = [t for t in available_traits
-                                   if PlanetTraitService.TRAIT_TYPES[t]['rarity'] == rarity]
-                    if rarity_traits:
-                        selected_trait = random.choice(rarity_traits)
-                        selected_traits.append(selected_trait)
-                        available_traits.remove(selected_trait)
-                    break
+
+        # Draw every trait's rarity in one call, then pick a distinct trait of that rarity
+        for rarity in random.choices(RARITIES, cum_weights=RARITY_CUMULATIVE_WEIGHTS, k=num_traits):
+            rarity_traits = [t for t in TRAITS_BY_RARITY[rarity] if t not in selected_traits]
+            if rarity_traits:
+                selected_traits.append(random.choice(rarity_traits))
 
         return selected_traits
 
@@ -293,3 +291,21 @@ class PlanetTraitService:
                     'rarity': trait_data['rarity']
                 }
         return None
+
+
+# Sampling and lookup tables for trait generation, built once at import time
+TRAIT_COUNTS = (1, 2, 3)
+TRAIT_COUNT_CUMULATIVE_WEIGHTS = (0.40, 0.85, 1.0)
+
+RARITIES = ('common', 'uncommon', 'rare')
+RARITY_CUMULATIVE_WEIGHTS = (0.5, 0.8, 1.0)
+
+TRAITS_BY_RARITY = {
+    rarity: tuple(key for key, data in PlanetTraitService.TRAIT_TYPES.items() if data['rarity'] == rarity)
+    for rarity in RARITIES
+}
+
+TRAIT_FIRST_EFFECT = {
+    key: next(iter(data['effects'].items()))
+    for key, data in PlanetTraitService.TRAIT_TYPES.items()
+}
@@ -1,4 +1,5 @@
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 import atexit
 
@@ -10,6 +11,8 @@ class GameScheduler:
 
     def init_app(self, app):
         """Initialize scheduler with Flask app context"""
+        self.app = app
+
         # Wrapper function to provide application context
         def run_tick_with_context():
             with app.app_context():
@@ -28,6 +31,9 @@ class GameScheduler:
         # Register shutdown handler
         atexit.register(self.shutdown)
 
+        # Expose the scheduler so fleet dispatch can queue arrival jobs
+        app.extensions['game_scheduler'] = self
+
         app.logger.info("Tick scheduler initialized - ticks will run every 5 seconds")
 
     def start(self):
@@ -59,6 +65,31 @@ class GameScheduler:
         """Remove a specific job"""
         self.scheduler.remove_job(job_id)
 
+    def schedule_fleet_arrival(self, fleet_id, arrival_time):
+        """Queue a one-off job that processes a fleet at its arrival time"""
+        if not self.scheduler.running:
+            # Nothing would fire the job; the tick's arrival sweep picks the fleet up
+            return False
+
+        app = self.app
+
+        def process_arrival_with_context():
+            with app.app_context():
+                from .fleet_arrival import FleetArrivalService
+                FleetArrivalService.process_fleet_arrival(fleet_id)
+
+        # One job per fleet: a recall or a new leg simply moves the run date.
+        # Arrival times are naive UTC, and a late job still has to run
+        self.scheduler.add_job(
+            func=process_arrival_with_context,
+            trigger=DateTrigger(run_date=arrival_time, timezone='UTC'),
+            id=f'fleet_arrival_{fleet_id}',
+            name=f'Fleet {fleet_id} Arrival',
+            replace_existing=True,
+            misfire_grace_time=None
+        )
+        return True
+
     def add_custom_job(self, func, trigger, job_id, name=None, **kwargs):
         """Add a custom job to the scheduler"""
         self.scheduler.add_job(
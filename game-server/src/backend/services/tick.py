@@ -1,9 +1,28 @@
 from datetime import datetime
 from backend.database import db
-from backend.models import Planet, Fleet, TickLog
+from backend.models import Planet, Fleet, TickLog, parse_fleet_status
 from flask import current_app
+import logging
 import math
 
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Fleet.status_kind values settled by process_fleet_movements; exploring
+# fleets are left to FleetArrivalService, so they are not loaded here
+MOVEMENT_STATUS_KINDS = ('traveling', 'returning', 'colonizing')
+
+# Adds one tick of production to a planet; parameters are process_resource_generation() change rows
+RESOURCE_GENERATION_UPDATE = (
+    Planet.__table__.update()
+    .where(Planet.__table__.c.id == db.bindparam('planet_id'))
+    .values(
+        metal=Planet.__table__.c.metal + db.bindparam('metal_change'),
+        crystal=Planet.__table__.c.crystal + db.bindparam('crystal_change'),
+        deuterium=Planet.__table__.c.deuterium + db.bindparam('deuterium_change')
+    )
+)
+
 def run_tick():
     """Main tick function that runs every 5 seconds"""
     tick_number = get_next_tick_number()
@@ -19,13 +38,13 @@ def run_tick():
 
     # Process arrived fleets using the FleetArrivalService
     from .fleet_arrival import FleetArrivalService
-    FleetArrivalService.process_arrived_fleets()
+    FleetArrivalService.process_arrived_fleets(tick_start_time)
 
     # Log tick completion with guard statistics
     tick_end_time = datetime.utcnow()
     log_tick(tick_number, tick_start_time, resource_changes, fleet_updates, guard_corrections)
 
-    print(f"Tick {tick_number} completed at {tick_end_time} (Guard: {guard_corrections} corrections)")
+    logger.info("Tick %s completed at %s (Guard: %s corrections)", tick_number, tick_end_time, guard_corrections)
 
     return resource_changes  # Return changes for manual tick endpoint
 
@@ -60,11 +79,6 @@ def process_resource_generation():
         tick_crystal = max(1, int(crystal_rate * energy_ratio / 72)) if planet.crystal_mine > 0 else 0
         tick_deuterium = max(1, int(deuterium_rate * energy_ratio / 72)) if planet.deuterium_synthesizer > 0 else 0
 
-        # Update planet resources
-        planet.metal += tick_metal
-        planet.crystal += tick_crystal
-        planet.deuterium += tick_deuterium
-
         changes.append({
             'planet_id': planet.id,
             'metal_change': tick_metal,
@@ -72,6 +86,12 @@ def process_resource_generation():
             'deuterium_change': tick_deuterium
         })
 
+    # Update planet resources with one executemany UPDATE instead of an ORM
+    # flush per planet; adding the deltas in SQL keeps concurrent changes
+    producing = [c for c in changes if c['metal_change'] or c['crystal_change'] or c['deuterium_change']]
+    if producing:
+        db.session.execute(RESOURCE_GENERATION_UPDATE, producing)
+
     db.session.commit()
     return changes
 
@@ -108,16 +128,18 @@ def process_fleet_movements(current_time):
     # Find fleets that have arrived
     arrived_fleets = Fleet.query.filter(
         Fleet.arrival_time <= current_time,
-        Fleet.status.in_(['traveling', 'returning']) |
-        Fleet.status.like('colonizing:%') |
-        Fleet.status.like('exploring:%')
+        Fleet.status_kind.in_(MOVEMENT_STATUS_KINDS)
     ).all()
 
     for fleet in arrived_fleets:
-        if fleet.status.startswith('colonizing:'):
+        status = parse_fleet_status(fleet.status)
+        if status.kind == 'colonizing':
             # Handle enhanced colonization with trait bonuses
-            coords = fleet.status.split(':')[1:]  # Extract coordinates
-            x, y, z = map(int, coords)
+            if status.coordinates is None:
+                # Malformed target; the travel guard returns such fleets to stationed
+                logger.warning("Colonizing fleet %s has invalid status %s", fleet.id, fleet.status)
+                continue
+            x, y, z = status.coordinates
 
             # Double-check coordinates are still empty
             existing_planet = Planet.query.filter_by(x=x, y=y, z=z).first()
@@ -199,12 +221,6 @@ def process_fleet_movements(current_time):
                 'event_type': 'arrival',
                 'description': f'Fleet arrived at planet {fleet.target_planet_id}'
             })
-        elif fleet.status.startswith('exploring:'):
-            # Handle exploration - delegate to FleetArrivalService for consistency
-            print(f"DEBUG: Exploration fleet {fleet.id} arrived, delegating to FleetArrivalService")
-            # Don't process here - let FleetArrivalService handle it
-            continue
-
         elif fleet.status == 'returning':
             # Fleet has returned to origin
             fleet.status = 'stationed'
@@ -311,16 +327,15 @@ def generate_exploration_planets(x, y, z, user_id):
         )
 
         db.session.add(planet)
-        db.session.flush()  # Get planet ID for trait generation
+        discovered_planets.append(planet)
 
-        # Generate planet traits
-        from backend.services.planet_traits import PlanetTraitService
-        traits = PlanetTraitService.generate_planet_traits(planet)
-        db.session.add_all(traits)
+    db.session.flush()  # Get planet IDs for trait generation
 
-        discovered_planets.append(planet)
+    # Generate traits for every discovered planet in one INSERT
+    from backend.services.planet_traits import PlanetTraitService
+    PlanetTraitService.generate_for_planets(discovered_planets)
 
-    db.session.commit()
+    # The exploring fleet's arrival transaction commits these with the rest of the batch
     return discovered_planets
 
 def get_user_research_level(user_id):
@@ -194,6 +194,16 @@ class TestShipyardEndpoints:
         assert 'crystal' in data['colony_ship']
         assert 'deuterium' in data['colony_ship']
 
+    def test_get_ship_costs_not_modified(self, client):
+        """Test that ship costs are served with an ETag and honour If-None-Match"""
+        response = client.get('/api/shipyard/costs')
+        etag = response.headers['ETag']
+
+        cached = client.get('/api/shipyard/costs', headers={'If-None-Match': etag})
+
+        assert cached.status_code == 304
+        assert cached.get_data() == b''
+
     def test_build_ship_unauthorized(self, client):
         """Test building ship without JWT token"""
         build_data = {
@@ -313,6 +323,21 @@ class TestShipyardIntegration:
         assert data['fleet']['id'] == sample_fleet.id
         assert data['fleet']['colony_ship'] == 3  # 2 + 1
 
+    def test_repeated_builds_share_one_stationed_fleet(self, client, sample_user, sample_planet, db_session):
+        """Test that the fleet created by a first build receives later builds"""
+        headers = make_auth_headers(sample_user.id)
+        sample_planet.metal = 20000
+        sample_planet.crystal = 20000
+        db_session.commit()
+
+        build_data = {'planet_id': sample_planet.id, 'ship_type': 'small_cargo', 'quantity': 1}
+        first = client.post('/api/shipyard/build', json=build_data, headers=headers).get_json()
+        second = client.post('/api/shipyard/build', json=build_data, headers=headers).get_json()
+
+        assert second['fleet']['id'] == first['fleet']['id']
+        assert second['fleet']['small_cargo'] == 2
+        assert Fleet.query.filter_by(start_planet_id=sample_planet.id, status='stationed').count() == 1
+
 class TestShipyardEdgeCases:
     """Test shipyard endpoint edge cases"""
 
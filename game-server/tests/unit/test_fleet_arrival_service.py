@@ -11,8 +11,24 @@ import pytest
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock
 from freezegun import freeze_time
-from backend.services.fleet_arrival import FleetArrivalService
-from backend.models import Fleet, Planet, User
+from backend.database import db
+from backend.services.fleet_arrival import FleetArrivalService, ARRIVAL_BATCH_SIZE
+from backend.models import Fleet, Planet, User, TickLog, DebrisField, ExploredSystem, CombatReport, pack_coordinates
+
+
+def _due_fleet(db_session, user, planet, now=None, **overrides):
+    """Add a fleet that left planet an hour ago and arrived back a second ago; the caller commits"""
+    now = now or datetime.utcnow()
+    fleet = Fleet(**{
+        'user_id': user.id,
+        'start_planet_id': planet.id,
+        'target_planet_id': planet.id,
+        'departure_time': now - timedelta(hours=1),
+        'arrival_time': now - timedelta(seconds=1),
+        **overrides
+    })
+    db_session.add(fleet)
+    return fleet
 
 
 class TestFleetArrivalService:
@@ -49,6 +65,34 @@ class TestFleetArrivalService:
             # This should not raise any errors
             FleetArrivalService.process_arrived_fleets()
 
+    def test_process_arrived_fleets_skips_work_when_nothing_arrived(self, app):
+        """Test that an empty claim skips the prefetches and the commit"""
+        with app.app_context():
+            with patch.object(FleetArrivalService, '_prefetch_for_mission') as mock_prefetch, \
+                    patch('backend.services.fleet_arrival.db.session.commit') as mock_commit:
+                FleetArrivalService.process_arrived_fleets()
+
+            mock_prefetch.assert_not_called()
+            mock_commit.assert_not_called()
+
+    def test_process_arrived_fleets_idle_tick_runs_one_query(self, app, db_session):
+        """Test that a tick with nothing due costs a single indexed claim query"""
+        from sqlalchemy import event
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_session.get_bind(), 'before_cursor_execute', record)
+        try:
+            FleetArrivalService.process_arrived_fleets()
+        finally:
+            event.remove(db_session.get_bind(), 'before_cursor_execute', record)
+
+        assert len(statements) == 1
+        assert 'status_kind' in statements[0]
+
     @freeze_time("2025-01-01 12:00:00")
     def test_coordinate_parsing_from_status(self, app):
         """Test coordinate parsing from fleet status"""
@@ -124,7 +168,7 @@ class TestFleetArrivalService:
             mock_fleet.status = 'colonizing:100:200:300'
 
             with patch.object(Planet, 'query') as mock_query:
-                mock_query.filter_by.return_value.first.return_value = Mock()
+                mock_query.filter_by.return_value.with_for_update.return_value.populate_existing.return_value.first.return_value = Mock()
 
                 with patch('backend.services.fleet_arrival.db'):
                     FleetArrivalService._process_colonization(mock_fleet)
@@ -146,9 +190,9 @@ class TestFleetArrivalService:
                 mock_planet = Mock()
                 mock_planet.user_id = 2  # Owned by different user
 
-                mock_filter_by = Mock()
-                mock_filter_by.first.return_value = mock_planet
-                mock_query.filter_by.return_value = mock_filter_by
+                # The target is locked and reread before its owner is checked
+                mock_locked = mock_query.filter_by.return_value.with_for_update.return_value
+                mock_locked.populate_existing.return_value.first.return_value = mock_planet
 
                 with patch('backend.services.fleet_arrival.db'):
                     FleetArrivalService._process_colonization(mock_fleet)
@@ -173,9 +217,9 @@ class TestFleetArrivalService:
                 mock_planet.user_id = None
                 mock_planet.name = 'Test Planet'
 
-                mock_filter_by = Mock()
-                mock_filter_by.first.return_value = mock_planet
-                mock_query.filter_by.return_value = mock_filter_by
+                # The target is locked and reread before its owner is checked
+                mock_locked = mock_query.filter_by.return_value.with_for_update.return_value
+                mock_locked.populate_existing.return_value.first.return_value = mock_planet
 
                 with patch('backend.services.fleet_arrival.db') as mock_db:
                     with patch('backend.services.fleet_arrival.datetime') as mock_datetime:
@@ -195,8 +239,8 @@ class TestFleetArrivalService:
                         assert mock_fleet.status == 'stationed'
                         assert mock_fleet.mission == 'stationed'
 
-                        # Verify database commit
-                        mock_db.session.commit.assert_called()
+                        # Committing is left to the batch in process_arrived_fleets
+                        mock_db.session.commit.assert_not_called()
 
     @freeze_time("2025-01-01 12:00:00")
     def test_exploration_successful(self, app):
@@ -204,31 +248,33 @@ class TestFleetArrivalService:
         with app.app_context():
             # Use Mock(spec=Fleet) for type safety
             mock_fleet = Mock(spec=Fleet)
+            mock_fleet.id = 123
             mock_fleet.status = 'exploring:100:200:300'
             mock_fleet.user_id = 1
-            mock_fleet.user = Mock()
-            mock_fleet.user.username = 'TestUser'
-            mock_fleet.explored_systems = None  # Explicit attribute instead of hasattr patch
-
-            # Mock no existing planet
-            with patch.object(Planet, 'query') as mock_query:
-                mock_filter_by = Mock()
-                mock_filter_by.first.return_value = None
-                mock_query.filter_by.return_value = mock_filter_by
+            mock_fleet.departure_time = datetime(2025, 1, 1, 10, 0, 0)
+            mock_fleet.arrival_time = datetime(2025, 1, 1, 12, 0, 0)
 
+            # Two planets discovered in a system nobody has explored yet
+            with patch('backend.services.tick.generate_exploration_planets',
+                       return_value=[Mock(spec=Planet), Mock(spec=Planet)]):
                 with patch('backend.services.fleet_arrival.db') as mock_db:
-                    with patch('backend.services.fleet_arrival.json') as mock_json:
-                        # Mock JSON dumps to avoid Mock serialization issues
-                        mock_json.dumps.return_value = '{"coordinates": "100:200:300", "explored_at": "2025-01-01T12:00:00", "fleet_id": 123}'
+                    mock_db.session.query.return_value.scalar.return_value = False
 
+                    with patch.object(FleetArrivalService, '_record_explored_system') as mock_record:
                         FleetArrivalService._process_exploration(mock_fleet)
 
-                        # Verify fleet was returned to stationed
-                        assert mock_fleet.status == 'stationed'
-                        assert mock_fleet.mission == 'stationed'
+                        # Verify the system was recorded once
+                        mock_record.assert_called_once()
+                        assert mock_record.call_args.kwargs['planets_discovered'] == 2
+
+                        # Verify fleet heads home, taking as long as the outbound trip
+                        assert mock_fleet.status == 'returning'
+                        assert mock_fleet.mission == 'return'
+                        assert mock_fleet.arrival_time == datetime(2025, 1, 1, 14, 0, 0)
+                        assert mock_fleet.eta == 7200
 
-                        # Verify database commit
-                        mock_db.session.commit.assert_called()
+                        # Committing is left to the batch in process_arrived_fleets
+                        mock_db.session.commit.assert_not_called()
 
     def test_return_mission_processing(self):
         """Test return mission processing"""
@@ -284,6 +330,607 @@ class TestFleetArrivalService:
                     assert mock_fleet.status == 'stationed'
                     assert mock_fleet.mission == 'stationed'
 
+    def test_prefetch_colonization_targets(self, app, db_session):
+        """Test that colonization targets are batch-loaded and keyed by coordinates"""
+        target_planet = Planet(name='Colony Target', x=10, y=20, z=30, user_id=None)
+        other_planet = Planet(name='Elsewhere', x=40, y=50, z=60, user_id=None)
+        db_session.add_all([target_planet, other_planet])
+        db_session.commit()
+
+        colonize_fleet = Mock()
+        colonize_fleet.mission = 'colonize'
+        colonize_fleet.target_coord_packed = pack_coordinates(10, 20, 30)
+
+        # Legacy fleet without packed coordinates falls back to its status string
+        legacy_fleet = Mock()
+        legacy_fleet.mission = 'colonize'
+        legacy_fleet.target_coord_packed = None
+        legacy_fleet.status = 'colonizing:40:50:60'
+
+        empty_fleet = Mock()
+        empty_fleet.mission = 'colonize'
+        empty_fleet.target_coord_packed = pack_coordinates(1, 2, 3)
+
+        # Non-colonization fleets never contribute coordinates
+        explore_fleet = Mock()
+        explore_fleet.mission = 'explore'
+        explore_fleet.status = 'exploring:40:50:60'
+
+        planets_by_coord = FleetArrivalService._prefetch_colonization_targets(
+            [colonize_fleet, empty_fleet, explore_fleet]
+        )
+        assert planets_by_coord == {(10, 20, 30): target_planet}
+
+        planets_by_coord = FleetArrivalService._prefetch_colonization_targets([legacy_fleet])
+        assert planets_by_coord == {(40, 50, 60): other_planet}
+        assert FleetArrivalService._prefetch_colonization_targets([explore_fleet]) == {}
+
+    def test_arrival_batch_does_not_lazy_load_owners(self, app, db_session, sample_user, sample_planet):
+        """Test that owner usernames come from the batch's eager loads, not a query per fleet"""
+        from sqlalchemy import event
+
+        rival = User(username='rival', email='rival@example.com', password_hash='hash')
+        db_session.add(rival)
+        db_session.flush()
+        db_session.add(Planet(name='Taken', x=10, y=20, z=30, user_id=rival.id))
+        _due_fleet(
+            db_session, sample_user, sample_planet,
+            mission='colonize',
+            status='colonizing:10:20:30',
+            colony_ship=1
+        )
+        db_session.commit()
+        db_session.expire_all()
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_session.get_bind(), 'before_cursor_execute', record)
+        try:
+            FleetArrivalService.process_arrived_fleets()
+        finally:
+            event.remove(db_session.get_bind(), 'before_cursor_execute', record)
+
+        assert not any('FROM users \nWHERE' in statement for statement in statements)
+        tick_log = TickLog.query.filter_by(event_type='colonization_failed').one()
+        assert 'owned by rival' in tick_log.event_description
+
+    def test_process_fleet_arrival_handles_due_fleet(self, app, db_session, sample_user, sample_planet):
+        """Test that a scheduled arrival processes the fleet once it is due"""
+        fleet = _due_fleet(db_session, sample_user, sample_planet, mission='return', status='returning')
+        db_session.commit()
+
+        FleetArrivalService.process_fleet_arrival(fleet.id)
+
+        assert fleet.status == 'stationed'
+        assert fleet.mission == 'stationed'
+
+    def test_process_fleet_arrival_commits_exploration_once(self, app, db_session, sample_user, sample_planet):
+        """Test that an exploration's planets, log and return trip share one commit"""
+        fleet = _due_fleet(db_session, sample_user, sample_planet, mission='explore', status='exploring:500:600:700')
+        db_session.commit()
+
+        with patch('backend.services.fleet_arrival.db.session.commit', wraps=db_session.commit) as mock_commit:
+            FleetArrivalService.process_fleet_arrival(fleet.id)
+
+        assert mock_commit.call_count == 1
+        assert fleet.status == 'returning'
+        assert ExploredSystem.query.filter_by(user_id=sample_user.id).count() == 1
+        assert TickLog.query.filter_by(fleet_id=fleet.id, event_type='exploration').count() == 1
+
+    def test_record_explored_system_ignores_duplicates(self, app, db_session, sample_user):
+        """Test that recording an already explored system keeps the first row"""
+        first_seen = datetime(2025, 1, 1)
+        FleetArrivalService._record_explored_system(
+            user_id=sample_user.id, x=1, y=2, z=3, planets_discovered=2, explored_at=first_seen
+        )
+        FleetArrivalService._record_explored_system(
+            user_id=sample_user.id, x=1, y=2, z=3, planets_discovered=5, explored_at=datetime.utcnow()
+        )
+        db_session.commit()
+
+        explored = ExploredSystem.query.filter_by(user_id=sample_user.id).one()
+        assert explored.planets_discovered == 2
+        assert explored.explored_at == first_seen
+
+    def test_process_fleet_arrival_skips_fleet_not_due(self, app, db_session, sample_user, sample_planet):
+        """Test that a stale arrival job leaves a fleet that is still travelling alone"""
+        now = datetime.utcnow()
+        fleet = Fleet(
+            user_id=sample_user.id,
+            mission='return',
+            status='returning',
+            start_planet_id=sample_planet.id,
+            target_planet_id=sample_planet.id,
+            departure_time=now,
+            arrival_time=now + timedelta(hours=1)
+        )
+        db_session.add(fleet)
+        db_session.commit()
+
+        FleetArrivalService.process_fleet_arrival(fleet.id)
+
+        assert fleet.status == 'returning'
+        assert fleet.mission == 'return'
+
+    def test_schedule_arrival_queues_job_on_running_scheduler(self, app):
+        """Test that dispatching a fleet queues one arrival job per fleet"""
+        scheduler = app.extensions['game_scheduler']
+        mock_fleet = Mock()
+        mock_fleet.id = 42
+        mock_fleet.arrival_time = datetime.utcnow() + timedelta(hours=1)
+
+        # The scheduler is not started under testing, so the tick sweep is relied on
+        assert FleetArrivalService.schedule_arrival(mock_fleet) is False
+
+        scheduler.scheduler.start(paused=True)
+        try:
+            with patch.object(db.engine.dialect, 'name', 'postgresql'):
+                assert FleetArrivalService.schedule_arrival(mock_fleet) is True
+                # Rescheduling (e.g. after a recall) replaces the existing job
+                mock_fleet.arrival_time += timedelta(minutes=30)
+                assert FleetArrivalService.schedule_arrival(mock_fleet) is True
+
+            arrival_jobs = [job for job in scheduler.get_jobs() if job.id == 'fleet_arrival_42']
+            assert len(arrival_jobs) == 1
+        finally:
+            scheduler.scheduler.shutdown(wait=False)
+
+    def test_schedule_arrival_leaves_sqlite_to_the_tick_sweep(self, app):
+        """Test that no arrival job races the sweep on a database without SKIP LOCKED"""
+        scheduler = app.extensions['game_scheduler']
+        mock_fleet = Mock()
+        mock_fleet.id = 42
+        mock_fleet.arrival_time = datetime.utcnow() + timedelta(hours=1)
+
+        scheduler.scheduler.start(paused=True)
+        try:
+            assert FleetArrivalService.schedule_arrival(mock_fleet) is False
+            assert not [job for job in scheduler.get_jobs() if job.id == 'fleet_arrival_42']
+        finally:
+            scheduler.scheduler.shutdown(wait=False)
+
+    def test_process_fleet_dispatches_by_mission(self, app):
+        """Test that arrived fleets are routed to the handler for their mission"""
+        mock_fleet = Mock()
+        mock_fleet.mission = 'colonize'
+        planets_by_coord = {(1, 2, 3): Mock()}
+        now = datetime.utcnow()
+
+        with patch.object(FleetArrivalService, '_process_colonization') as mock_colonize, \
+                patch.object(FleetArrivalService, '_process_attack') as mock_attack:
+            FleetArrivalService._process_fleet(mock_fleet, planets_by_coord, now)
+
+            mock_colonize.assert_called_once_with(mock_fleet, planets_by_coord, now)
+            mock_attack.assert_not_called()
+
+            # Missions without a handler are stationed rather than left in flight
+            mock_fleet.mission = 'transport'
+            FleetArrivalService._process_fleet(mock_fleet)
+            assert mock_colonize.call_count == 1
+            mock_attack.assert_not_called()
+            assert mock_fleet.status == 'stationed'
+
+    def test_attack_engages_stationed_defender(self, app, db_session, sample_user, sample_planet):
+        """Test that an attack fights the fleet stationed at the target planet"""
+        attacker = User(username='attacker', email='attacker@example.com', password_hash='x')
+        db_session.add(attacker)
+        db_session.commit()
+
+        now = datetime.utcnow()
+        defending_fleet = Fleet(
+            user_id=sample_user.id,
+            mission='stationed',
+            status='stationed',
+            start_planet_id=sample_planet.id,
+            target_planet_id=sample_planet.id,
+            departure_time=now,
+            light_fighter=5
+        )
+        attacking_fleet = _due_fleet(
+            db_session, attacker, sample_planet,
+            mission='attack',
+            status='traveling',
+            light_fighter=10
+        )
+        db_session.add(defending_fleet)
+        db_session.commit()
+
+        with patch('backend.services.combat_engine.CombatEngine.calculate_battle') as mock_battle, \
+                patch('backend.services.combat_engine.CombatEngine.process_combat_result'), \
+                patch('backend.services.combat_engine.CombatEngine.calculate_planet_attack') as mock_planet_attack:
+            FleetArrivalService._process_attack(attacking_fleet)
+
+        mock_battle.assert_called_once_with(attacking_fleet, defending_fleet, sample_planet)
+        mock_planet_attack.assert_not_called()
+
+        # The batch path resolves the same defender from one prefetch query
+        defenders_by_planet = FleetArrivalService._prefetch_defending_fleets([attacking_fleet])
+        assert defenders_by_planet == {(sample_user.id, sample_planet.id): defending_fleet}
+
+    def test_attacker_returns_home_after_combat(self, app, db_session, sample_user, sample_planet):
+        """Test that a battle is fought once and the surviving attacker heads home"""
+        attacker = User(username='attacker', email='attacker@example.com', password_hash='x')
+        db_session.add(attacker)
+        db_session.commit()
+        home = Planet(name='Attacker Home', x=10, y=20, z=30, user_id=attacker.id)
+        db_session.add(home)
+        db_session.commit()
+
+        now = datetime.utcnow()
+        db_session.add(Fleet(
+            user_id=sample_user.id,
+            mission='stationed',
+            status='stationed',
+            start_planet_id=sample_planet.id,
+            target_planet_id=sample_planet.id,
+            departure_time=now,
+            small_cargo=1
+        ))
+        attacking_fleet = _due_fleet(
+            db_session, attacker, home, now=now,
+            mission='attack',
+            status='traveling',
+            battleship=50,
+            target_planet_id=sample_planet.id
+        )
+        db_session.commit()
+
+        from backend.services.combat_engine import CombatEngine
+        no_losses = {ship_type: 0 for ship_type in CombatEngine.SHIP_TYPES}
+        attacker_wins = {
+            'winner': 'attacker',
+            'rounds': [],
+            'attacker_losses': no_losses,
+            'defender_losses': no_losses,
+            'debris': {'metal': 0, 'crystal': 0}
+        }
+
+        # Two consecutive ticks
+        with patch.object(CombatEngine, 'calculate_battle', return_value=attacker_wins):
+            FleetArrivalService.process_arrived_fleets(now)
+            FleetArrivalService.process_arrived_fleets(now + timedelta(seconds=5))
+
+        assert CombatReport.query.count() == 1
+        db_session.expire_all()
+        assert attacking_fleet.status == 'returning'
+        assert attacking_fleet.arrival_time == now + timedelta(hours=1, seconds=-1)
+
+    def test_process_arrived_fleets_isolates_failing_fleet(self, app, db_session, sample_user, sample_planet):
+        """Test that one failing mission does not undo the rest of the batch"""
+        fleets = []
+        for mission, status in (('return', 'returning'), ('attack', 'traveling')):
+            fleet = _due_fleet(db_session, sample_user, sample_planet, mission=mission, status=status)
+            fleets.append(fleet)
+        db_session.commit()
+        returning_fleet, attacking_fleet = fleets
+
+        def failing_attack(fleet, defenders_by_planet=None, now=None):
+            fleet.light_fighter = 999
+            raise RuntimeError('combat exploded')
+
+        with patch.object(FleetArrivalService, '_process_attack', side_effect=failing_attack):
+            FleetArrivalService.process_arrived_fleets()
+
+        db_session.expire_all()
+        assert returning_fleet.status == 'stationed'
+        # The failed mission's own changes were rolled back with its savepoint
+        assert attacking_fleet.light_fighter == 0
+        assert attacking_fleet.status == 'stationed'
+
+    def test_process_arrived_fleets_commits_once_per_batch(self, app, db_session, sample_user, sample_planet):
+        """Test that a batch of mixed missions is written with a single commit"""
+        for mission, status in (('return', 'returning'), ('explore', 'exploring:500:600:700'), ('recycle', 'traveling')):
+            _due_fleet(db_session, sample_user, sample_planet, mission=mission, status=status)
+        db_session.commit()
+
+        with patch('backend.services.fleet_arrival.db.session.commit', wraps=db_session.commit) as mock_commit:
+            FleetArrivalService.process_arrived_fleets()
+
+        assert mock_commit.call_count == 1
+        assert Fleet.query.filter_by(status='stationed').count() == 2
+
+    def test_process_arrived_fleets_drops_tick_logs_of_failed_fleet(self, app, db_session, sample_user, sample_planet):
+        """Test that batched tick logs are written only for fleets whose mission succeeded"""
+        for mission, status in (('explore', 'exploring:500:600:700'), ('recycle', 'traveling')):
+            _due_fleet(db_session, sample_user, sample_planet, mission=mission, status=status)
+        db_session.commit()
+
+        def failing_recycle(fleet):
+            FleetArrivalService._add_tick_log(TickLog(fleet_id=fleet.id, event_type='recycle'))
+            raise RuntimeError('recycler jammed')
+
+        with patch.object(FleetArrivalService, '_process_recycle', side_effect=failing_recycle):
+            FleetArrivalService.process_arrived_fleets()
+
+        assert TickLog.query.filter_by(event_type='exploration').count() == 1
+        assert TickLog.query.filter_by(event_type='recycle').count() == 0
+
+    def test_process_arrived_fleets_uses_tick_time(self, app, db_session, sample_user, sample_planet):
+        """Test that fleets are processed as of the tick time passed in"""
+        tick_time = datetime.utcnow()
+        fleet = Fleet(
+            user_id=sample_user.id,
+            mission='explore',
+            status='exploring:500:600:700',
+            start_planet_id=sample_planet.id,
+            target_planet_id=sample_planet.id,
+            departure_time=tick_time - timedelta(hours=2),
+            arrival_time=tick_time - timedelta(hours=1)
+        )
+        db_session.add(fleet)
+        db_session.commit()
+
+        FleetArrivalService.process_arrived_fleets(tick_time)
+
+        assert fleet.arrival_time == tick_time + timedelta(hours=1)
+        explored = ExploredSystem.query.filter_by(user_id=sample_user.id).one()
+        assert explored.explored_at == tick_time
+
+    def test_process_arrived_fleets_drains_backlog_in_batches(self, app, db_session, sample_user, sample_planet):
+        """Test that a backlog larger than one claim is processed in full"""
+        fleets = []
+        for _ in range(3):
+            fleet = _due_fleet(db_session, sample_user, sample_planet, mission='return', status='returning')
+            fleets.append(fleet)
+        db_session.commit()
+
+        with patch('backend.services.fleet_arrival.ARRIVAL_BATCH_SIZE', 2):
+            FleetArrivalService.process_arrived_fleets()
+
+        db_session.expire_all()
+        assert all(fleet.status == 'stationed' for fleet in fleets)
+
+    def test_process_arrived_fleets_stations_fleets_without_handler(self, app, db_session, sample_user, sample_planet):
+        """Test that a full batch of missions without a handler does not stall the tick"""
+        for _ in range(ARRIVAL_BATCH_SIZE + 5):
+            _due_fleet(db_session, sample_user, sample_planet, mission='transport', status='traveling')
+        db_session.commit()
+
+        FleetArrivalService.process_arrived_fleets()
+
+        db_session.expire_all()
+        assert Fleet.query.filter(Fleet.status != 'stationed').count() == 0
+
+    def test_drain_stops_when_a_batch_settles_nothing(self, app, db_session, sample_user, sample_planet):
+        """Test that draining ends when the same due fleets are claimed again"""
+        for _ in range(3):
+            _due_fleet(db_session, sample_user, sample_planet, mission='transport', status='traveling')
+        db_session.commit()
+
+        # A handler that leaves every fleet in flight
+        with patch('backend.services.fleet_arrival.ARRIVAL_BATCH_SIZE', 3), \
+             patch.object(FleetArrivalService, '_process_fleet') as mock_process:
+            FleetArrivalService.process_arrived_fleets()
+
+        assert mock_process.call_count == 3
+
+    def test_claim_locks_fleet_rows_with_skip_locked(self, app, db_session):
+        """Test that concurrent workers claim disjoint batches on PostgreSQL"""
+        from sqlalchemy.dialects import postgresql
+
+        query = FleetArrivalService._claim_query(datetime.utcnow())
+        sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+        assert 'FOR UPDATE OF fleets SKIP LOCKED' in sql
+        assert 'LIMIT' in sql
+
+    def test_scheduled_arrival_locks_fleet_row_with_skip_locked(self, app, db_session):
+        """Test that a scheduled arrival skips a fleet the tick sweep has claimed"""
+        from sqlalchemy.dialects import postgresql
+
+        query = FleetArrivalService._scheduled_fleet_query(1, datetime.utcnow())
+        sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+        assert 'FOR UPDATE OF fleets SKIP LOCKED' in sql
+
+    def test_arrival_workers_fall_back_to_one_without_skip_locked(self, app, db_session):
+        """Test that SQLite never gets concurrent arrival workers"""
+        app.config['ARRIVAL_WORKERS'] = 4
+        try:
+            assert FleetArrivalService._arrival_worker_count() == 1
+        finally:
+            app.config.pop('ARRIVAL_WORKERS')
+
+    def test_process_arrived_fleets_runs_one_drain_per_worker(self, app, db_session):
+        """Test that each arrival worker drains the backlog with the tick's timestamp"""
+        with patch.object(FleetArrivalService, '_arrival_worker_count', return_value=3), \
+             patch.object(FleetArrivalService, '_drain_arrived_fleets') as mock_drain:
+            FleetArrivalService.process_arrived_fleets()
+
+        assert mock_drain.call_count == 3
+        assert len({call.args[0] for call in mock_drain.call_args_list}) == 1
+
+    def test_arrival_workers_terminate_on_fleets_without_handler(self, app, db_session, sample_user, sample_planet):
+        """Test that several workers all finish when the backlog has no handler"""
+        for _ in range(ARRIVAL_BATCH_SIZE + 5):
+            _due_fleet(db_session, sample_user, sample_planet, mission='transport', status='traveling')
+        db_session.commit()
+
+        with patch.object(FleetArrivalService, '_arrival_worker_count', return_value=3):
+            FleetArrivalService.process_arrived_fleets()
+
+        db_session.expire_all()
+        assert Fleet.query.filter(Fleet.status != 'stationed').count() == 0
+
+    def test_colonizers_of_one_planet_in_two_batches_colonize_once(self, app, db_session, sample_user, sample_planet):
+        """Test that a worker holding a stale target sees another worker's colonization"""
+        rival = User(username='rival', email='rival@example.com', password_hash='hash')
+        target = Planet(name='Contested', x=10, y=20, z=30, user_id=None)
+        db_session.add_all([rival, target])
+        db_session.flush()
+        fleets = []
+        for user in (rival, sample_user):
+            fleet = _due_fleet(
+                db_session, user, sample_planet,
+                mission='colonize',
+                status='colonizing:10:20:30',
+                colony_ship=1
+            )
+            fleets.append(fleet)
+        db_session.commit()
+        rival_fleet, own_fleet = fleets
+
+        # This worker loaded the planet while it was still free
+        assert db_session.get(Planet, target.id).user_id is None
+
+        # Another worker, with its own session, claims the rival's batch first
+        with app.app_context():
+            FleetArrivalService.process_fleet_arrival(rival_fleet.id)
+
+        FleetArrivalService.process_fleet_arrival(own_fleet.id)
+
+        assert target.user_id == rival.id
+        assert TickLog.query.filter_by(event_type='colonization').count() == 1
+        assert TickLog.query.filter_by(event_type='colonization_failed').count() == 1
+
+    def test_recyclers_of_one_field_in_two_batches_collect_it_once(self, app, db_session, sample_user, sample_planet):
+        """Test that a worker holding a stale debris field sees another worker's collection"""
+        debris = DebrisField(planet_id=sample_planet.id, metal=1000, crystal=0, deuterium=0)
+        db_session.add(debris)
+        fleets = []
+        for recyclers in (1, 10):
+            fleet = _due_fleet(
+                db_session, sample_user, sample_planet,
+                mission='recycle',
+                status='traveling',
+                recycler=recyclers
+            )
+            fleets.append(fleet)
+        db_session.commit()
+
+        # This worker loaded the field before the other one collected from it
+        assert db_session.get(DebrisField, debris.id).metal == 1000
+
+        with app.app_context():
+            FleetArrivalService.process_fleet_arrival(fleets[0].id)
+
+        FleetArrivalService.process_fleet_arrival(fleets[1].id)
+
+        assert DebrisField.query.filter_by(planet_id=sample_planet.id).count() == 0
+        descriptions = sorted(log.event_description for log in TickLog.query.filter_by(event_type='recycle'))
+        assert [d.split(' collected ')[1] for d in descriptions] == ['500M 0C 0D from debris field'] * 2
+
+    def test_returning_fleets_are_stationed_in_bulk(self, app, db_session, sample_user, sample_planet):
+        """Test that returning fleets skip the per-fleet handler and are all stationed"""
+        fleets = []
+        for _ in range(2):
+            fleet = _due_fleet(db_session, sample_user, sample_planet, mission='return', status='returning', eta=3600)
+            fleets.append(fleet)
+        db_session.commit()
+
+        with patch.object(FleetArrivalService, '_process_return') as mock_return:
+            FleetArrivalService.process_arrived_fleets()
+
+        mock_return.assert_not_called()
+        for fleet in fleets:
+            assert fleet.status == 'stationed'
+            assert fleet.mission == 'stationed'
+            assert fleet.arrival_time is None
+            assert fleet.eta == 0
+
+    def test_recycle_batch_shares_loaded_debris_fields(self, app, db_session, sample_user, sample_planet):
+        """Test that recyclers in one batch see a debris field emptied by an earlier one"""
+        debris = DebrisField(planet_id=sample_planet.id, metal=500, crystal=500, deuterium=0)
+        db_session.add(debris)
+        fleets = []
+        for _ in range(2):
+            fleet = _due_fleet(
+                db_session, sample_user, sample_planet,
+                mission='recycle',
+                status='traveling',
+                recycler=10
+            )
+            fleets.append(fleet)
+        db_session.commit()
+
+        FleetArrivalService.process_arrived_fleets()
+
+        assert DebrisField.query.filter_by(planet_id=sample_planet.id).count() == 0
+        assert TickLog.query.filter_by(event_type='recycle').count() == 1
+        assert all(fleet.status == 'stationed' for fleet in fleets)
+
+    def test_recycle_collects_up_to_half_capacity_per_resource(self, app, db_session, sample_user, sample_planet):
+        """Test that a recycler takes at most half its capacity of each resource"""
+        debris = DebrisField(planet_id=sample_planet.id, metal=3000, crystal=200, deuterium=0)
+        db_session.add(debris)
+        _due_fleet(db_session, sample_user, sample_planet, mission='recycle', status='traveling', recycler=2)
+        db_session.commit()
+
+        FleetArrivalService.process_arrived_fleets()
+
+        db_session.expire_all()
+        assert (debris.metal, debris.crystal, debris.deuterium) == (2000, 0, 0)
+        tick_log = TickLog.query.filter_by(event_type='recycle').one()
+        assert 'collected 1000M 200C 0D' in tick_log.event_description
+
+    def test_exploration_records_explored_system_once(self, app, db_session, sample_user, sample_planet):
+        """Test that exploring a system records it once per user"""
+        for _ in range(2):
+            fleet = _due_fleet(
+                db_session, sample_user, sample_planet,
+                mission='explore',
+                status='exploring:500:600:700'
+            )
+            db_session.commit()
+
+            FleetArrivalService.process_arrived_fleets()
+            assert fleet.status == 'returning'
+
+        explored = ExploredSystem.query.filter_by(user_id=sample_user.id).all()
+        assert len(explored) == 1
+        assert (explored[0].x, explored[0].y, explored[0].z) == (500, 600, 700)
+        assert explored[0].planets_discovered >= 1
+
+        # Tick log events carry structured data instead of a looked-up username
+        tick_log = TickLog.query.filter_by(event_type='exploration', user_id=sample_user.id).first()
+        assert tick_log.event_data['coordinates'] == '500:600:700'
+        assert tick_log.event_data['planets_discovered'] == explored[0].planets_discovered
+
+    @pytest.mark.parametrize('status, target_coordinates, expected', [
+        ('colonizing:100:200:300', None, (100, 200, 300)),
+        ('exploring:-4:0:12', None, (-4, 0, 12)),
+        ('traveling', '400:500:600', (400, 500, 600)),
+        ('colonizing:1:2', '400:500:600', None),
+        ('exploring:a:b:c', None, None),
+        ('traveling', None, None),
+    ])
+    def test_parse_target_coordinates(self, status, target_coordinates, expected):
+        """Test coordinate parsing from status or target_coordinates"""
+        mock_fleet = Mock()
+        mock_fleet.status = status
+        mock_fleet.target_coordinates = target_coordinates
+
+        result = FleetArrivalService._parse_target_coordinates(mock_fleet)
+
+        if expected is None:
+            assert result['success'] is False
+        else:
+            assert result == {'success': True, 'coordinates': expected}
+
+    def test_exploration_batch_records_shared_system_once(self, app, db_session, sample_user, sample_planet):
+        """Test that two fleets exploring the same system in one batch record it once"""
+        fleets = []
+        for _ in range(2):
+            fleet = _due_fleet(
+                db_session, sample_user, sample_planet,
+                mission='explore',
+                status='exploring:800:800:800'
+            )
+            fleets.append(fleet)
+        db_session.commit()
+
+        with patch.object(FleetArrivalService, '_prefetch_explored_systems',
+                          wraps=FleetArrivalService._prefetch_explored_systems) as mock_prefetch:
+            FleetArrivalService.process_arrived_fleets()
+
+        # One batch lookup for the whole exploration group
+        mock_prefetch.assert_called_once()
+        assert all(fleet.status == 'returning' for fleet in fleets)
+        assert ExploredSystem.query.filter_by(user_id=sample_user.id, x=800, y=800, z=800).count() == 1
+
 
 class TestFleetArrivalServiceIntegration:
     """Integration-style tests that verify service behavior"""
@@ -74,3 +74,113 @@ class TestFleetTravelGuard:
         # This test ensures the datetime mocking works correctly
         current = FleetTravelGuard._correct_fleet_state.__globals__['datetime'].utcnow()
         assert current == self.current_time
+
+    @pytest.mark.parametrize('status', ['colonizing:1:2', 'colonizing:a:b:c'])
+    def test_malformed_colonization_status_is_stationed(self, status):
+        """Test that an arrived colonizer with a malformed target is returned to stationed"""
+        self.fleet.status = status
+        self.fleet.mission = 'colonize'
+        self.fleet.arrival_time = self.current_time - timedelta(minutes=1)
+
+        assert FleetTravelGuard._correct_fleet_state(self.fleet, self.current_time)
+        assert self.fleet.status == 'stationed'
+        assert self.fleet.arrival_time is None
+
+    def test_unknown_coordinate_status_is_stationed(self):
+        """Test that a status with coordinates but an unknown kind is cleaned up"""
+        self.fleet.status = 'sieging:1:2:3'
+
+        assert FleetTravelGuard._correct_fleet_state(self.fleet, self.current_time)
+        assert self.fleet.status == 'stationed'
+
+
+class TestFleetTravelGuardColonization:
+    """Test the guard's batched colonization target lookup"""
+
+    def test_arrived_colonizers_share_one_target_lookup(self, db_session, sample_user, sample_planet):
+        """Test that colonizers are checked against occupied targets without a query per fleet"""
+        from backend.models import Fleet, Planet
+
+        now = datetime.utcnow()
+        fleets = {}
+        for target in ('100:200:300', '7:8:9'):
+            fleet = Fleet(
+                user_id=sample_user.id,
+                mission='colonize',
+                status=f'colonizing:{target}',
+                start_planet_id=sample_planet.id,
+                target_planet_id=sample_planet.id,
+                departure_time=now - timedelta(hours=1),
+                arrival_time=now - timedelta(seconds=1)
+            )
+            db_session.add(fleet)
+            fleets[target] = fleet
+        db_session.commit()
+
+        with patch.object(Planet, 'query') as mock_query:
+            assert FleetTravelGuard.validate_and_correct_fleet_states() == 2
+            mock_query.filter_by.assert_not_called()
+
+        assert fleets['100:200:300'].status == 'returning'
+        assert fleets['7:8:9'].status == 'stationed'
+
+
+class TestFleetHealthReport:
+    """Test the aggregated fleet health report"""
+
+    def test_health_report_counts_each_state(self, db_session, sample_user, sample_planet):
+        """Test that the single aggregate query counts every fleet state"""
+        from backend.models import Fleet
+
+        now = datetime.utcnow()
+        states = [
+            ('stationed', None, 0),                               # healthy
+            ('stationed', now + timedelta(hours=1), 0),           # invalid: stationed with arrival time
+            ('traveling', now - timedelta(hours=1), 100),         # stuck and traveling
+            ('returning', now + timedelta(hours=1), 100),         # traveling
+            ('exploring:1:2:3', now + timedelta(hours=1), -5),    # exploration with negative ETA
+        ]
+        for status, arrival_time, eta in states:
+            db_session.add(Fleet(
+                user_id=sample_user.id,
+                mission='attack',
+                status=status,
+                start_planet_id=sample_planet.id,
+                target_planet_id=sample_planet.id,
+                departure_time=now - timedelta(hours=2),
+                arrival_time=arrival_time,
+                eta=eta
+            ))
+        db_session.commit()
+
+        report = FleetTravelGuard.get_fleet_health_report()
+
+        assert report['total_fleets'] == 5
+        assert report['stuck_fleets'] == 1
+        assert report['invalid_states'] == 2
+        assert report['traveling_fleets'] == 2
+        assert report['exploration_fleets'] == 1
+        assert report['healthy_fleets'] == 2
+
+
+class TestForceCleanupStuckFleets:
+    """Test the administrative stuck fleet cleanup"""
+
+    def test_force_cleanup_stations_only_old_stuck_fleets(self, db_session, sample_user, sample_planet):
+        """Test that one bulk update stations fleets stuck past the cutoff"""
+        from backend.models import Fleet
+
+        now = datetime.utcnow()
+        stuck = Fleet(user_id=sample_user.id, mission='attack', status='traveling',
+                      start_planet_id=sample_planet.id, target_planet_id=sample_planet.id,
+                      departure_time=now - timedelta(hours=50), arrival_time=now - timedelta(hours=30), eta=100)
+        recent = Fleet(user_id=sample_user.id, mission='attack', status='traveling',
+                       start_planet_id=sample_planet.id, target_planet_id=sample_planet.id,
+                       departure_time=now - timedelta(hours=2), arrival_time=now - timedelta(hours=1), eta=100)
+        db_session.add_all([stuck, recent])
+        db_session.commit()
+
+        assert FleetTravelGuard.force_cleanup_stuck_fleets(user_id=sample_user.id) == 1
+
+        assert (stuck.status, stuck.mission, stuck.arrival_time, stuck.eta) == ('stationed', 'stationed', None, 0)
+        assert recent.status == 'traveling'
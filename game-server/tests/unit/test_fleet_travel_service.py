@@ -13,7 +13,7 @@ import pytest
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 from freezegun import freeze_time
-from backend.services.fleet_travel import FleetTravelService
+from backend.services.fleet_travel import FleetTravelService, _format_coordinates
 from backend.models import Planet, Fleet
 
 
@@ -44,6 +44,21 @@ class TestFleetTravelService:
         distance = FleetTravelService.calculate_distance(planet1, planet2)
         assert distance == 1  # Minimum distance
 
+    def test_calculate_distance_sq(self):
+        """Test squared distance calculation without the square root"""
+        planet1 = Mock()
+        planet1.x, planet1.y, planet1.z = 0, 0, 0
+
+        planet2 = Mock()
+        planet2.x, planet2.y, planet2.z = 3, -4, 5
+
+        assert FleetTravelService.calculate_distance_sq(planet1, planet2) == 50
+
+    def test_calculate_distance_xyz(self):
+        """Test distance calculation from plain coordinates"""
+        assert FleetTravelService.calculate_distance_xyz(0, 0, 0, 3, 4, 12) == 13
+        assert FleetTravelService.calculate_distance_xyz(5, 5, 5, 5, 5, 5) == 1  # Minimum distance
+
     def test_calculate_distance_none_planets(self):
         """Test distance calculation with None planets"""
         distance = FleetTravelService.calculate_distance(None, None)
@@ -463,6 +478,14 @@ class TestFleetTravelService:
                 current_pos = info['current_position']
                 assert f"{expected_x}:" in current_pos or abs(float(current_pos.split(':')[0]) - expected_x) < 1
 
+    def test_interpolate_position(self):
+        """Test linear interpolation between two points"""
+        start = Planet(name='Start', x=0, y=10, z=-20)
+        target = Planet(name='Target', x=100, y=10, z=20)
+        assert FleetTravelService._interpolate_position(start, target, (1, 4)) == (25, 10, -10)
+        assert FleetTravelService._interpolate_position(start, target, (1, 3)) == (33, 10, -7)
+        assert FleetTravelService._interpolate_position(start, target, (4, 4)) == (100, 10, 20)
+
     @freeze_time("2025-01-01 12:00:00")
     def test_minimum_travel_time_enforced(self, app):
         """Test that minimum travel time (30 seconds) is enforced to prevent instant arrivals"""
@@ -567,3 +590,82 @@ class TestFleetTravelServiceIntegration:
                 assert 0 <= info['progress_percentage'] <= 100
                 assert ':' in info['current_position']
                 assert info['fleet_speed'] == 105000  # Large cargo speed (slowest in fleet: large_cargo=3500 * 30, cruiser=3500 * 30)
+
+    @freeze_time("2025-01-01 12:00:00")
+    def test_batch_calculate_travel_info_matches_single_fleet(self, db_session, sample_user, sample_planet):
+        """Test that the batch calculation agrees with the per-fleet one"""
+        target = Planet(name='Target', x=400, y=500, z=600)
+        db_session.add(target)
+        db_session.commit()
+
+        fleets = []
+        for status in ('traveling', 'colonizing:50:60:70', 'stationed'):
+            fleet = Fleet(
+                user_id=sample_user.id,
+                mission='attack',
+                status=status,
+                start_planet_id=sample_planet.id,
+                target_planet_id=target.id,
+                departure_time=datetime(2025, 1, 1, 11, 30, 0),
+                arrival_time=datetime(2025, 1, 1, 12, 30, 0),
+                small_cargo=1
+            )
+            db_session.add(fleet)
+            fleets.append(fleet)
+        db_session.commit()
+
+        batch = FleetTravelService.batch_calculate_travel_info(fleets)
+
+        assert batch == [FleetTravelService.calculate_travel_info(fleet) for fleet in fleets]
+        assert batch[0]['target_coordinates'] == '400:500:600'
+        assert batch[1]['target_coordinates'] == '50:60:70'
+        assert batch[2] is None
+
+    def test_prefetch_planets_queries_only_missing_ones(self, db_session, sample_user, sample_planet):
+        """Test that planets the caller already loaded are not queried again"""
+        target = Planet(name='Target', x=400, y=500, z=600)
+        db_session.add(target)
+        db_session.commit()
+
+        fleet = Fleet(
+            user_id=sample_user.id,
+            mission='attack',
+            status='traveling',
+            start_planet_id=sample_planet.id,
+            target_planet_id=target.id
+        )
+
+        with patch.object(Planet, 'query', wraps=Planet.query) as mock_query:
+            planets_by_id = FleetTravelService._prefetch_planets([fleet], {sample_planet.id: sample_planet})
+            assert mock_query.filter.call_count == 1
+
+            assert planets_by_id == {sample_planet.id: sample_planet, target.id: target}
+
+            FleetTravelService._prefetch_planets([fleet], planets_by_id)
+            assert mock_query.filter.call_count == 1
+
+    @freeze_time("2025-01-01 12:00:00")
+    def test_current_position_is_not_cached(self, db_session, sample_user, sample_planet):
+        """Test that only trip endpoints enter the coordinate format cache"""
+        target = Planet(name='Target', x=400, y=500, z=600)
+        db_session.add(target)
+        db_session.commit()
+
+        fleet = Fleet(
+            user_id=sample_user.id,
+            mission='attack',
+            status='traveling',
+            start_planet_id=sample_planet.id,
+            target_planet_id=target.id,
+            departure_time=datetime(2025, 1, 1, 11, 30, 0),
+            arrival_time=datetime(2025, 1, 1, 12, 30, 0),
+            small_cargo=1
+        )
+        db_session.add(fleet)
+        db_session.commit()
+
+        _format_coordinates.cache_clear()
+        info = FleetTravelService.calculate_travel_info(fleet)
+
+        assert info['current_position'] == '250:350:450'
+        assert _format_coordinates.cache_info().currsize == 2
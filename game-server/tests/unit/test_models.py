@@ -3,7 +3,7 @@ import os
 import sys
 from datetime import datetime, timedelta
 
-from backend.models import User, Planet, Fleet, Alliance, TickLog
+from backend.models import User, Planet, Fleet, Alliance, TickLog, pack_coordinates, parse_coordinates, parse_fleet_status, sector_of, sectors_within
 
 class TestUserModel:
     """Test User model CRUD operations and relationships"""
@@ -123,6 +123,58 @@ class TestPlanetModel:
             # If an exception is raised, foreign key constraint is working
             assert True  # Test passes - constraint is enforced
 
+    def test_planet_coord_packed(self, db_session):
+        """Test that the database maintains the packed coordinate key"""
+        planet = Planet(name='Packed Planet', x=12, y=-3, z=456)
+        db_session.add(planet)
+        db_session.commit()
+
+        assert planet.coord_packed == pack_coordinates(12, -3, 456)
+        assert pack_coordinates(12, -3, 456) != pack_coordinates(456, -3, 12)
+        assert Planet.query.filter_by(coord_packed=pack_coordinates(12, -3, 456)).one() is planet
+
+    @pytest.mark.parametrize('raw, expected', [
+        ('100:200:300', (100, 200, 300)),
+        ('-4:0:12', (-4, 0, 12)),
+        ('1:2', None),
+        ('a:b:c', None),
+        ('1:2:3:4', None),
+    ])
+    def test_parse_coordinates(self, raw, expected):
+        """Test parsing of "x:y:z" mission coordinates"""
+        assert parse_coordinates(raw) == expected
+
+    def test_parse_coordinates_reads_like_a_planet(self):
+        """Test that parsed coordinates expose x/y/z like a Planet"""
+        coordinates = parse_coordinates('7:-8:9')
+        assert (coordinates.x, coordinates.y, coordinates.z) == (7, -8, 9)
+
+    @pytest.mark.parametrize('status, kind, coordinates', [
+        ('exploring:1:-2:3', 'exploring', (1, -2, 3)),
+        ('colonizing:4:5:6', 'colonizing', (4, 5, 6)),
+        ('colonizing:4:5', 'colonizing', None),
+        ('traveling', 'traveling', None),
+    ])
+    def test_parse_fleet_status(self, status, kind, coordinates):
+        """Test splitting a fleet status into its kind and target coordinates"""
+        parsed = parse_fleet_status(status)
+        assert parsed.kind == kind
+        assert parsed.coordinates == coordinates
+
+    def test_planet_sector_id(self, db_session):
+        """Test that the database computes the same sector key as sector_of"""
+        near = Planet(name='Near', x=105, y=-3, z=456)
+        far = Planet(name='Far', x=950, y=950, z=950)
+        db_session.add_all([near, far])
+        db_session.commit()
+
+        assert near.sector_id == sector_of(105, -3, 456)
+        assert sector_of(105, -3, 456) == sector_of(127, -128, 384)
+        assert sector_of(105, -3, 456) != sector_of(128, -3, 456)
+
+        nearby = Planet.query.filter(Planet.sector_id.in_(sectors_within(120, 0, 450, 10))).all()
+        assert nearby == [near]
+
 class TestFleetModel:
     """Test Fleet model operations"""
 
@@ -194,6 +246,27 @@ class TestFleetModel:
         # Should still work, but mission is just a string
         assert fleet.mission == 'invalid_mission'
 
+    @pytest.mark.parametrize('status,expected_kind', [
+        ('colonizing:1:2:3', 'colonizing'),
+        ('exploring:-4:5:6', 'exploring'),
+        ('traveling', 'traveling'),
+        ('stationed', 'stationed'),
+    ])
+    def test_fleet_status_kind(self, db_session, sample_user, sample_planet, status, expected_kind):
+        """Test that the database strips target coordinates from status_kind"""
+        fleet = Fleet(
+            user_id=sample_user.id,
+            mission='explore',
+            status=status,
+            start_planet_id=sample_planet.id,
+            target_planet_id=sample_planet.id,
+            departure_time=datetime.utcnow()
+        )
+        db_session.add(fleet)
+        db_session.commit()
+
+        assert fleet.status_kind == expected_kind
+
 class TestAllianceModel:
     """Test Alliance model operations"""
 
@@ -6,6 +6,7 @@ Follows the existing database-first testing pattern like test_models.py.
 """
 
 import pytest
+from sqlalchemy import event
 from backend.services.planet_traits import PlanetTraitService
 from backend.models import Planet, PlanetTrait
 
@@ -38,6 +39,27 @@ class TestPlanetTraitService:
             assert trait.trait_name is not None
             assert trait.bonus_value is not None
 
+    def test_generate_for_planets_inserts_all_traits_at_once(self, db_session):
+        """Test that bulk trait generation issues a single INSERT for every planet"""
+        planets = [Planet(name=f'Bulk {i}', x=i, y=i, z=i) for i in range(3)]
+        db_session.add_all(planets)
+        db_session.commit()
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('INSERT INTO planet_traits'):
+                statements.append(statement)
+
+        event.listen(db_session.get_bind(), 'before_cursor_execute', record)
+        try:
+            rows = PlanetTraitService.generate_for_planets(planets)
+        finally:
+            event.remove(db_session.get_bind(), 'before_cursor_execute', record)
+
+        assert len(statements) == 1
+        assert PlanetTrait.query.count() == len(rows)
+        assert {row['planet_id'] for row in rows} == {planet.id for planet in planets}
+
     def test_determine_trait_count_distribution(self):
         """Test trait count determination follows expected distribution"""
         # Test multiple times to see distribution
@@ -71,6 +93,13 @@ class TestPlanetTraitService:
         trait_names = [t for t in selected_traits if t in PlanetTraitService.TRAIT_TYPES]
         assert len(trait_names) > 0
 
+    def test_select_traits_never_repeats_a_trait(self):
+        """Test that every trait in one selection is distinct"""
+        for _ in range(100):
+            traits = PlanetTraitService._select_traits(3)
+            assert len(traits) == 3
+            assert len(set(traits)) == 3
+
     def test_apply_trait_effects_modifies_planet_correctly(self, db_session, sample_user):
         """Test that trait effects are applied correctly to planet bonuses"""
         # Create a real planet
@@ -74,6 +74,21 @@ class TestTickService:
         assert planet_change['crystal_change'] > 0
         assert planet_change['deuterium_change'] > 0
 
+    def test_process_resource_generation_updates_planet_resources(self, db_session, sample_planet):
+        """Test that generated resources are written back to the planet"""
+        sample_planet.metal_mine = 5
+        sample_planet.crystal_mine = 0
+        sample_planet.deuterium_synthesizer = 0
+        sample_planet.solar_plant = 10
+        db_session.commit()
+        metal, crystal = sample_planet.metal, sample_planet.crystal
+
+        changes = process_resource_generation()
+
+        planet_change = next(c for c in changes if c['planet_id'] == sample_planet.id)
+        assert sample_planet.metal == metal + planet_change['metal_change']
+        assert sample_planet.crystal == crystal
+
     def test_process_resource_generation_energy_shortage(self, db_session, sample_planet):
         """Test resource generation with energy shortage"""
         # Set up planet with high consumption, low production
@@ -142,6 +157,18 @@ class TestTickService:
 
         assert len(updates) == 0
 
+    def test_process_fleet_movements_leaves_exploration_to_arrival_service(self, db_session, sample_fleet):
+        """Test that exploring fleets are not picked up by the movement sweep"""
+        sample_fleet.status = 'exploring:500:600:700'
+        sample_fleet.arrival_time = datetime.utcnow() - timedelta(hours=1)
+        db_session.commit()
+
+        updates = process_fleet_movements(datetime.utcnow())
+
+        assert updates == []
+        db_session.refresh(sample_fleet)
+        assert sample_fleet.status == 'exploring:500:600:700'
+
     def test_log_tick(self, db_session, sample_planet):
         """Test tick logging"""
         tick_number = 100
@@ -11,6 +11,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
 from backend.config import (
     SPEED_MULTIPLIER,
+    SHIP_SPEEDS,
+    SHIP_TYPES_BY_SPEED,
     get_ship_speed,
     get_ship_fuel_rate,
     get_all_ship_speeds,
@@ -136,6 +138,18 @@ class TestSpeedConfig:
 
         assert fuel == 0
 
+    def test_calculate_fleet_speed_uses_slowest_present_ship(self):
+        """Test that fleet speed comes from the slowest ship type with ships in it"""
+        class MockFleet:
+            def __init__(self):
+                self.small_cargo = 4
+                self.recycler = 1
+                self.deathstar = 0
+
+        speeds = [SHIP_SPEEDS[ship_type] for ship_type in SHIP_TYPES_BY_SPEED]
+        assert speeds == sorted(speeds)
+        assert calculate_fleet_speed(MockFleet()) == get_ship_speed('recycler')
+
     def test_config_validation(self):
         """Test configuration validation"""
         # Should not raise exception
@@ -2,11 +2,97 @@
 """
 Database Schema Update Script
 
-This script updates the database schema to add new fields for colonization support.
+This script updates the database schema to add new fields for colonization support,
+the computed coordinate and status columns, and the indexes the models declare.
 """
 
 from src.backend.models import db
 from flask import Flask
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+
+# Columns added to existing tables since they were first created; create_all
+# only creates missing tables, so these are added with ALTER TABLE
+ADDED_COLUMNS = {
+    'planets': ['coord_packed', 'sector_id'],
+    'fleets': ['status_kind', 'target_coord_packed'],
+    'tick_logs': ['user_id', 'event_data'],
+}
+
+# Columns that used to be NOT NULL
+RELAXED_NOT_NULL_COLUMNS = {
+    'fleets': ['arrival_time'],
+}
+
+def add_missing_columns(table_name, column_names):
+    """Add model columns an existing table lacks, computed ones included"""
+    table = db.metadata.tables[table_name]
+    existing = {col['name'] for col in inspect(db.engine).get_columns(table_name)}
+    dialect = db.engine.dialect
+    for name in column_names:
+        if name in existing:
+            continue
+        column = table.c[name]
+        spec = str(CreateColumn(column).compile(dialect=dialect))
+        if dialect.name == 'sqlite':
+            # SQLite can only add virtual generated columns to an existing table
+            spec = spec.replace(' STORED', ' VIRTUAL')
+        for foreign_key in column.foreign_keys:
+            spec += f' REFERENCES {foreign_key.column.table.name} ({foreign_key.column.name})'
+        db.session.execute(text(f'ALTER TABLE {table_name} ADD COLUMN {spec}'))
+        print(f"➕ Added column {table_name}.{name}")
+    db.session.commit()
+
+def relax_not_null_columns(table_name, column_names):
+    """Drop NOT NULL from columns the models now allow to be empty"""
+    columns = {col['name']: col for col in inspect(db.engine).get_columns(table_name)}
+    strict = [name for name in column_names if name in columns and not columns[name]['nullable']]
+    if not strict:
+        return
+    if db.engine.dialect.name == 'sqlite':
+        # SQLite cannot alter a column's constraints, so the table is rebuilt
+        rebuild_sqlite_table(table_name)
+    else:
+        for name in strict:
+            db.session.execute(text(f'ALTER TABLE {table_name} ALTER COLUMN {name} DROP NOT NULL'))
+        db.session.commit()
+    print(f"🔓 Allowed NULL in {table_name}: {strict}")
+
+def rebuild_sqlite_table(table_name):
+    """Recreate a SQLite table from its model, keeping its rows"""
+    table = db.metadata.tables[table_name]
+    inspector = inspect(db.engine)
+    old_columns = {col['name'] for col in inspector.get_columns(table_name)}
+    # Computed columns are filled in by the new table itself
+    copied = [col.name for col in table.columns if col.name in old_columns and col.computed is None]
+    column_list = ', '.join(copied)
+    old_indexes = [index['name'] for index in inspector.get_indexes(table_name)]
+    old_name = f'{table_name}_old'
+
+    with db.engine.begin() as connection:
+        connection.execute(text('PRAGMA foreign_keys=OFF'))
+        # Keep other tables' foreign keys pointing at table_name, not the renamed copy
+        connection.execute(text('PRAGMA legacy_alter_table=ON'))
+        connection.execute(text(f'ALTER TABLE {table_name} RENAME TO {old_name}'))
+        # Index names are database-wide; free them for the new table
+        for index_name in old_indexes:
+            connection.execute(text(f'DROP INDEX IF EXISTS {index_name}'))
+        table.create(connection)
+        connection.execute(text(f'INSERT INTO {table_name} ({column_list}) SELECT {column_list} FROM {old_name}'))
+        connection.execute(text(f'DROP TABLE {old_name}'))
+        connection.execute(text('PRAGMA legacy_alter_table=OFF'))
+        connection.execute(text('PRAGMA foreign_keys=ON'))
+    print(f"🔁 Rebuilt table {table_name}")
+
+def create_missing_indexes():
+    """Create model indexes that existing tables lack"""
+    inspector = inspect(db.engine)
+    for table in db.metadata.tables.values():
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(db.engine)
+                print(f"📇 Created index {index.name}")
 
 def update_schema():
     """Update database schema with new fields"""
@@ -25,27 +111,34 @@ def update_schema():
     db.init_app(app)
 
     with app.app_context():
-        # Create all tables (this will add new columns if they don't exist)
+        # Create all missing tables (existing tables are not altered by this)
         db.create_all()
+
+        # Bring existing tables up to date with the models
+        for table_name, column_names in RELAXED_NOT_NULL_COLUMNS.items():
+            relax_not_null_columns(table_name, column_names)
+        for table_name, column_names in ADDED_COLUMNS.items():
+            add_missing_columns(table_name, column_names)
+        create_missing_indexes()
         print("✅ Database schema updated successfully!")
 
         # Verify the new columns exist
-        from sqlalchemy import inspect
         inspector = inspect(db.engine)
 
         # Check Planet table
         planet_columns = [col['name'] for col in inspector.get_columns('planets')]
-        required_planet_cols = ['is_home_planet', 'colonized_at']
+        required_planet_cols = ['is_home_planet', 'colonized_at', 'coord_packed', 'sector_id']
         missing_planet_cols = [col for col in required_planet_cols if col not in planet_columns]
 
         # Check Fleet table
         fleet_columns = [col['name'] for col in inspector.get_columns('fleets')]
-        required_fleet_cols = ['target_coordinates', 'combat_experience', 'last_combat_time', 'combat_victories', 'combat_defeats']
+        required_fleet_cols = ['target_coordinates', 'combat_experience', 'last_combat_time', 'combat_victories', 'combat_defeats',
+                               'status_kind', 'target_coord_packed']
         missing_fleet_cols = [col for col in required_fleet_cols if col not in fleet_columns]
 
         # Check for new tables
         existing_tables = inspector.get_table_names()
-        required_tables = ['combat_reports', 'debris_fields']
+        required_tables = ['combat_reports', 'debris_fields', 'explored_systems']
         missing_tables = [table for table in required_tables if table not in existing_tables]
 
         if missing_planet_cols or missing_fleet_cols or missing_tables: